@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Per-request overhead of the api_client fixture's transports
+
+Compares the old CI path (Flask test client wrapped in a hand-rolled
+response object that re-parses JSON on every ``.json()``), a
+requests.Session with the WSGI adapter mounted, and a requests.Session
+over real sockets to an in-process werkzeug server. Each request reads
+``.json()`` ``--json-reads`` times, as tests often do.
+"""
+import argparse
+import json as _json
+import os
+import sys
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('LOG_MODE', 'off')
+
+from utils.live_server import LiveServer  # noqa: E402
+from utils.wsgi_adapter import wsgi_session  # noqa: E402
+
+
+class ResponseWrapper:
+    """The previous fixture's requests-like view of a test client response"""
+
+    def __init__(self, status_code, headers, body):
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers)
+        self.content = body
+
+    def json(self):
+        return _json.loads(self.text)
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8')
+
+
+def test_client_transport(app):
+    client = app.test_client()
+
+    def request(method, endpoint, **kwargs):
+        response = getattr(client, method.lower())(endpoint, json=kwargs.get('json'),
+                                                   headers=kwargs.get('headers', {}))
+        return ResponseWrapper(response.status_code, response.headers, response.data)
+
+    return request, lambda: None
+
+
+def adapter_transport(app):
+    session = wsgi_session(app, 'http://testserver')
+
+    def request(method, endpoint, **kwargs):
+        return session.request(method, f'http://testserver{endpoint}', **kwargs)
+
+    return request, session.close
+
+
+def socket_transport(app):
+    server = LiveServer(app).start()
+    session = requests.Session()
+
+    def request(method, endpoint, **kwargs):
+        return session.request(method, f'{server.url}{endpoint}', **kwargs)
+
+    def close():
+        session.close()
+        server.stop()
+
+    return request, close
+
+
+def measure(request, endpoint, requests_count, json_reads):
+    start = time.perf_counter()
+    for _ in range(requests_count):
+        response = request('GET', endpoint)
+        for _ in range(json_reads):
+            response.json()
+    return (time.perf_counter() - start) / requests_count * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="api_client transport overhead benchmark")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per measurement")
+    parser.add_argument("--users", type=int, default=50, help="Users listed by /users")
+    parser.add_argument("--json-reads", type=int, default=3, help=".json() calls per response")
+    args = parser.parse_args()
+
+    from src.api.app import app
+
+    client = app.test_client()
+    client.post('/reset')
+    for i in range(args.users):
+        client.post('/users', json={"name": f"Bench User {i}", "email": f"bench{i}@example.com"})
+
+    endpoints = ['/health', '/users/1', f'/users?limit={args.users}']
+    transports = [
+        ('test client + wrapper', test_client_transport),
+        ('WSGI adapter', adapter_transport),
+        ('sockets (LiveServer)', socket_transport),
+    ]
+    print(f"{'transport':>22} " + " ".join(f"{e:>18}" for e in endpoints) + "   (us/request)")
+    for label, transport in transports:
+        request, close = transport(app)
+        try:
+            measure(request, endpoints[0], 50, args.json_reads)
+            timings = [measure(request, e, args.requests, args.json_reads) for e in endpoints]
+        finally:
+            close()
+        print(f"{label:>22} " + " ".join(f"{t:>18.1f}" for t in timings))
+
+
+if __name__ == "__main__":
+    main()
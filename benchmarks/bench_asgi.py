@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Compare the WSGI and ASGI variants under many concurrent client connections
+
+The ASGI run needs an ASGI server; uvicorn is used if installed
+(``pip install uvicorn``). Each client is a raw asyncio stream that sends
+GET /users/<id> requests back to back over one HTTP/1.1 keep-alive
+connection, reconnecting whenever the server closes it (werkzeug's dev
+server does after every response).
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(variant, port):
+    env = os.environ.copy()
+    env.update(LOG_MODE='off', PYTHONPATH=ROOT, FLASK_PORT=str(port))
+    if variant == 'wsgi':
+        cmd = [sys.executable, 'src/api/app.py']
+    else:
+        cmd = [sys.executable, '-m', 'uvicorn', 'src.api.asgi:app', '--host', '127.0.0.1',
+               '--port', str(port), '--log-level', 'warning', '--backlog', '4096']
+    server = subprocess.Popen(cmd, cwd=ROOT, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 15
+    while time.time() < deadline:
+        try:
+            requests.get(f'http://127.0.0.1:{port}/health', timeout=1)
+            return server
+        except requests.RequestException:
+            time.sleep(0.05)
+    server.terminate()
+    raise RuntimeError(f"{variant} server did not start")
+
+
+async def read_response(reader):
+    """Read one response; return True if the server asked to close the connection"""
+    head = await reader.readuntil(b"\r\n\r\n")
+    length = 0
+    close = False
+    for line in head.lower().split(b"\r\n"):
+        if line.startswith(b"content-length:"):
+            length = int(line.split(b":")[1])
+        elif line.startswith(b"connection:") and b"close" in line:
+            close = True
+    await reader.readexactly(length)
+    return close
+
+
+async def connection(port, users, deadline, stats, timeout):
+    """Issue requests back to back until ``deadline``
+
+    Connects and responses slower than ``timeout`` seconds count as errors.
+    """
+    writer = None
+    i = 0
+    while time.perf_counter() < deadline:
+        try:
+            start = time.perf_counter()
+            if writer is None:
+                reader, writer = await asyncio.wait_for(
+                    asyncio.open_connection('127.0.0.1', port), timeout)
+                stats['connects'] += 1
+            request = f"GET /users/{i % users + 1} HTTP/1.1\r\nHost: localhost\r\n\r\n"
+            writer.write(request.encode())
+            close = await asyncio.wait_for(read_response(reader), timeout)
+            stats['latencies'].append(time.perf_counter() - start)
+            i += 1
+        except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+            stats['errors'] += 1
+            close = True
+        if close and writer is not None:
+            writer.close()
+            writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def load(port, connections, users, duration, timeout=5.0):
+    stats = {'latencies': [], 'errors': 0, 'connects': 0}
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(*(connection(port, users, deadline, stats, timeout)
+                           for _ in range(connections)))
+    return stats
+
+
+def run(variant, connections, users, duration):
+    port = free_port()
+    server = start_server(variant, port)
+    try:
+        records = [{"name": f"User {i}", "email": f"user{i}@example.com"} for i in range(users)]
+        requests.post(f'http://127.0.0.1:{port}/users/batch', json=records, timeout=30)
+        stats = asyncio.run(load(port, connections, users, duration))
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+    latencies = sorted(stats['latencies'])
+
+    def percentile(q):
+        if not latencies:
+            return float('nan')
+        return latencies[min(len(latencies) - 1, int(len(latencies) * q))] * 1000
+
+    return (len(latencies) / duration, percentile(0.5), percentile(0.99),
+            stats['connects'], stats['errors'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="WSGI vs ASGI concurrent connection benchmark")
+    parser.add_argument("--connections", type=int, default=1000, help="Concurrent connections")
+    parser.add_argument("--users", type=int, default=1000, help="Users to seed")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per variant")
+    args = parser.parse_args()
+
+    variants = ['wsgi']
+    try:
+        import uvicorn  # noqa: F401
+        variants.append('asgi')
+    except ImportError:
+        print("uvicorn is not installed; skipping the ASGI variant")
+
+    print(f"{'variant':>8} {'req/s':>10} {'p50 (ms)':>10} {'p99 (ms)':>10} "
+          f"{'connects':>9} {'errors':>8}")
+    for variant in variants:
+        rate, p50, p99, connects, errors = run(variant, args.connections, args.users, args.duration)
+        print(f"{variant:>8} {rate:>10,.0f} {p50:>10.1f} {p99:>10.1f} {connects:>9} {errors:>8}")
+
+
+if __name__ == "__main__":
+    main()
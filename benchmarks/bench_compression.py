@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+CPU cost versus bytes saved by response compression, per endpoint
+
+Runs in-process through the Flask test client, so timings are server CPU
+only (no network). brotli is measured too if installed.
+"""
+import argparse
+import itertools
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('LOG_MODE', 'off')
+
+from src.api.app import app  # noqa: E402
+from src.api.compression import available_encodings  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Response compression benchmark")
+    parser.add_argument("--users", type=int, default=10000, help="Users to seed")
+    parser.add_argument("--requests", type=int, default=50, help="Requests per endpoint and coding")
+    args = parser.parse_args()
+
+    client = app.test_client()
+    client.post('/reset')
+    client.post(f'/admin/seed?count={args.users}')
+    batch_ids = itertools.count()
+
+    def batch_body():
+        base = next(batch_ids) * 1000
+        return [{"name": f"Batch User {i}", "email": f"batch{i}@example.com"}
+                for i in range(base, base + 1000)]
+
+    endpoints = [
+        ('GET /health', lambda h: client.get('/health', headers=h)),
+        ('GET /users/<id>', lambda h: client.get('/users/1', headers=h)),
+        ('GET /users?limit=1000', lambda h: client.get('/users?limit=1000', headers=h)),
+        ('GET /users?stream', lambda h: client.get('/users?stream=true', headers=h)),
+        ('POST /users/batch', lambda h: client.post('/users/batch', json=batch_body(), headers=h)),
+        ('GET /metrics', lambda h: client.get('/metrics', headers=h)),
+    ]
+
+    print(f"{'endpoint':>22} {'coding':>8} {'bytes':>10} {'saved':>7} {'cpu ms/req':>11} {'+cpu ms':>8}")
+    for label, request in endpoints:
+        baseline = None
+        for coding in ('identity',) + tuple(reversed(available_encodings())):
+            headers = {'Accept-Encoding': coding}
+            size = 0
+            start = time.process_time()
+            for _ in range(args.requests):
+                size = len(request(headers).get_data())
+            cpu_ms = (time.process_time() - start) / args.requests * 1000
+            if baseline is None:
+                baseline = (size, cpu_ms)
+            saved = 1 - size / baseline[0] if baseline[0] else 0.0
+            print(f"{label:>22} {coding:>8} {size:>10,} {saved:>7.1%} {cpu_ms:>11.2f} "
+                  f"{cpu_ms - baseline[1]:>+8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Benchmark POST /users latency as the number of existing users grows
+"""
+import argparse
+import logging
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import src.api as api  # noqa: E402
+
+
+def seed_users(count):
+    """Populate the store directly, bypassing HTTP"""
+    api.store.reset()
+    for user_id in range(1, count + 1):
+        api.store.create(f"Seed User {user_id}", f"seed{user_id}@example.com")
+
+
+def measure(client, existing, requests_count):
+    """Return per-request latencies (seconds) for new-user POSTs"""
+    seed_users(existing)
+    latencies = []
+    for i in range(requests_count):
+        payload = {"name": f"Bench {i}", "email": f"bench{i}@example.com"}
+        start = time.perf_counter()
+        response = client.post('/users', json=payload)
+        latencies.append(time.perf_counter() - start)
+        assert response.status_code == 201, response.data
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="POST /users latency benchmark")
+    parser.add_argument("--sizes", default="1000,10000,100000,1000000",
+                        help="Comma-separated numbers of pre-existing users")
+    parser.add_argument("--requests", type=int, default=500,
+                        help="POST requests to time at each size")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    print(f"{'existing':>10} {'mean (us)':>10} {'p50 (us)':>10} {'p99 (us)':>10}")
+    with api.app.test_client() as client:
+        for size in (int(s) for s in args.sizes.split(',')):
+            latencies = sorted(measure(client, size, args.requests))
+            p99 = latencies[int(len(latencies) * 0.99) - 1]
+            print(f"{size:>10} {statistics.mean(latencies) * 1e6:>10.1f} "
+                  f"{statistics.median(latencies) * 1e6:>10.1f} {p99 * 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Client timeout and retry policies against injected tail latency and failures
+
+Starts the pre-forked server with FAULT_RULES (lognormal latency plus
+errors and connection resets on GET /users/<id>), then measures end-to-end
+latency and success rate for a few requests.Session configurations.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_session(retries, backoff, pool_size):
+    session = requests.Session()
+    retry = Retry(total=retries, connect=retries, read=retries, status=retries,
+                  backoff_factor=backoff, status_forcelist=(500, 502, 503, 504),
+                  allowed_methods=None, raise_on_status=False)
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    return session
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def run_policy(base_url, users, requests_count, concurrency, retries, backoff, timeout):
+    session = make_session(retries, backoff, concurrency)
+
+    def one(i):
+        start = time.perf_counter()
+        try:
+            ok = session.get(f"{base_url}/users/{i % users + 1}", timeout=timeout).status_code == 200
+        except requests.exceptions.RequestException:
+            ok = False
+        return ok, time.perf_counter() - start
+
+    with ThreadPoolExecutor(concurrency) as pool:
+        results = list(pool.map(one, range(requests_count)))
+    latencies = sorted(seconds for _, seconds in results)
+    success = sum(ok for ok, _ in results) / len(results)
+    return success, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Client behaviour under injected faults")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per policy")
+    parser.add_argument("--concurrency", type=int, default=8, help="Client threads")
+    parser.add_argument("--users", type=int, default=1000, help="Users to seed")
+    parser.add_argument("--median-ms", type=float, default=5, help="Median injected latency")
+    parser.add_argument("--sigma", type=float, default=1.0, help="Lognormal spread")
+    parser.add_argument("--error-rate", type=float, default=0.02, help="Injected 503 rate")
+    parser.add_argument("--reset-rate", type=float, default=0.005, help="Injected reset rate")
+    args = parser.parse_args()
+
+    rules = [{"route": "GET /users/<id>", "error_rate": args.error_rate,
+              "reset_rate": args.reset_rate,
+              "latency": {"distribution": "lognormal", "median_ms": args.median_ms,
+                          "sigma": args.sigma}}]
+    policies = [
+        ('no retries', 0, 0, 5.0),
+        ('3 retries', 3, 0.01, 5.0),
+        ('3 retries, 50ms timeout', 3, 0.01, 0.05),
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = os.environ.copy()
+        env.update(USER_STORE='shared', SHARED_STORE_PATH=os.path.join(tmp, 'users.shm'),
+                   LOG_MODE='off', PYTHONPATH=ROOT, FAULT_INJECTION='true', FAULT_SEED='1',
+                   FAULT_RULES=json.dumps(rules))
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'src.api.serve', '--host', '127.0.0.1', '--port', '0',
+             '--workers', '1'],
+            cwd=ROOT, env=env, stdout=subprocess.PIPE, text=True)
+        try:
+            port = int(server.stdout.readline().split('127.0.0.1:')[1].split()[0])
+            base_url = f"http://127.0.0.1:{port}"
+            requests.post(f"{base_url}/admin/seed?count={args.users}", timeout=30)
+
+            print(f"{'policy':>26} {'success':>8} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+            for label, retries, backoff, timeout in policies:
+                success, latencies = run_policy(base_url, args.users, args.requests,
+                                                args.concurrency, retries, backoff, timeout)
+                print(f"{label:>26} {success:>8.2%} {percentile(latencies, 0.5) * 1000:>8.1f} "
+                      f"{percentile(latencies, 0.99) * 1000:>8.1f} {latencies[-1] * 1000:>8.1f}")
+        finally:
+            server.terminate()
+            server.wait(timeout=10)
+
+
+if __name__ == "__main__":
+    main()
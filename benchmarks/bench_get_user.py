@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Compare GET /users/<id> requests/sec with and without the response cache
+"""
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import src.api as api  # noqa: E402
+from src.api.response_cache import ResponseCache  # noqa: E402
+
+
+def run(client, ids, headers_for=None):
+    """Return requests/sec for GETs of ``ids``"""
+    start = time.perf_counter()
+    for user_id in ids:
+        headers = headers_for(user_id) if headers_for else None
+        response = client.get(f'/users/{user_id}', headers=headers)
+        assert response.status_code in (200, 304)
+    return len(ids) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GET /users/<id> cache benchmark")
+    parser.add_argument("--users", type=int, default=10000, help="Users to seed")
+    parser.add_argument("--requests", type=int, default=20000, help="GETs per mode")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    api.store.reset()
+    for i in range(args.users):
+        api.store.create(f"Bench User {i}", f"bench{i}@example.com")
+    ids = [random.randint(1, args.users) for _ in range(args.requests)]
+
+    with api.app.test_client() as client:
+        api.user_response_cache = ResponseCache(0)
+        uncached = run(client, ids)
+
+        api.user_response_cache = ResponseCache(args.users)
+        run(client, ids)  # warm the cache
+        cached = run(client, ids)
+
+        etags = {}
+        for user_id in set(ids):
+            etags[user_id] = client.get(f'/users/{user_id}').headers['ETag']
+        not_modified = run(client, ids, lambda user_id: {'If-None-Match': etags[user_id]})
+
+    print(f"{'mode':>22} {'req/s':>10}")
+    print(f"{'no cache':>22} {uncached:>10,.0f}")
+    print(f"{'cached body':>22} {cached:>10,.0f}")
+    print(f"{'cached + 304':>22} {not_modified:>10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Per-request cost of the /health and /ready probes
+
+Runs in-process through the Flask test client and compares the endpoints
+with building and serializing the probe payload on every call, as /health
+used to.
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('LOG_MODE', 'off')
+
+from src.api.app import app  # noqa: E402
+from src.api import health_payload, serialize_json  # noqa: E402
+
+
+def per_call():
+    return serialize_json({"status": "healthy", "timestamp": datetime.utcnow().isoformat(),
+                           "version": "1.0.0"})
+
+
+def timed(label, fn, n):
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:>28} {elapsed / n * 1e6:>9.2f} us/op {n / elapsed:>12,.0f} ops/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Health/readiness probe benchmark")
+    parser.add_argument("--requests", type=int, default=20000, help="Calls per measurement")
+    args = parser.parse_args()
+
+    client = app.test_client()
+    timed('payload built per call', per_call, args.requests)
+    timed('cached payload', health_payload.body, args.requests)
+    timed('GET /health', lambda: client.get('/health'), args.requests)
+    timed('GET /ready', lambda: client.get('/ready'), args.requests)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Compare request latency with synchronous, queued and disabled logging
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import src.api as api  # noqa: E402
+from src.api.logging_setup import configure_logging, stop_logging  # noqa: E402
+
+
+def latencies(client, count):
+    """Return sorted per-request latencies (seconds) for GET /users/1"""
+    samples = []
+    for _ in range(count):
+        start = time.perf_counter()
+        client.get('/users/1')
+        samples.append(time.perf_counter() - start)
+    return sorted(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Logging overhead benchmark")
+    parser.add_argument("--requests", type=int, default=20000, help="Requests per mode")
+    args = parser.parse_args()
+
+    api.store.reset()
+    api.store.create("Bench User", "bench@example.com")
+
+    results = []
+    real_stderr = sys.stderr
+    with tempfile.TemporaryFile('w') as sink, api.app.test_client() as client:
+        # Log records go to a real file so write cost is included
+        sys.stderr = sink
+        try:
+            for mode in ('off', 'sync', 'queue'):
+                configure_logging('INFO', mode)
+                latencies(client, 1000)  # warm up
+                samples = latencies(client, args.requests)
+                stop_logging()
+                results.append((mode, samples))
+        finally:
+            sys.stderr = real_stderr
+            configure_logging('INFO', 'off')
+
+    print(f"{'mode':>8} {'p50 (us)':>10} {'p99 (us)':>10}")
+    for mode, samples in results:
+        p50 = samples[len(samples) // 2]
+        p99 = samples[int(len(samples) * 0.99) - 1]
+        print(f"{mode:>8} {p50 * 1e6:>10.1f} {p99 * 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Report memory per user for the dict-based and compact user stores
+"""
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.api.compact_store import CompactUserStore  # noqa: E402
+from src.api.store import InMemoryUserStore  # noqa: E402
+
+
+def bytes_per_user(store_class, count):
+    """Return traced bytes allocated per stored user"""
+    gc.collect()
+    tracemalloc.start()
+    store = store_class()
+    for i in range(count):
+        store.create(f"Test User {i}", f"test.user{i}@example.com")
+    gc.collect()
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del store
+    return used / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="User store memory benchmark")
+    parser.add_argument("--count", type=int, default=200000, help="Users to store")
+    args = parser.parse_args()
+
+    print(f"{'engine':>8} {'bytes/user':>12}")
+    for label, store_class in (('memory', InMemoryUserStore), ('compact', CompactUserStore)):
+        print(f"{label:>8} {bytes_per_user(store_class, args.count):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
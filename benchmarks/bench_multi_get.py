@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Compare verifying users with one GET /users/<id> each against GET /users?ids=
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('LOG_MODE', 'off')
+
+from src.api.app import app  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-get benchmark (in-process test client)")
+    parser.add_argument("--users", type=int, default=1000, help="Users to verify per round")
+    parser.add_argument("--rounds", type=int, default=5, help="Rounds; the best is reported")
+    args = parser.parse_args()
+
+    client = app.test_client()
+    client.post('/reset')
+    records = [{"name": f"User {i}", "email": f"user{i}@example.com"} for i in range(args.users)]
+    client.post('/users/batch', json=records).get_data()
+    ids = list(range(1, args.users + 1))
+
+    def per_id():
+        for user_id in ids:
+            assert client.get(f'/users/{user_id}').status_code == 200
+
+    def multi_get():
+        for start in range(0, len(ids), 1000):
+            chunk = ','.join(map(str, ids[start:start + 1000]))
+            assert client.get(f'/users?ids={chunk}').status_code == 200
+
+    print(f"{'method':>10} {'ms/round':>10}")
+    for label, run in (('per-id GET', per_id), ('multi-get', multi_get)):
+        best = float('inf')
+        for _ in range(args.rounds):
+            start = time.perf_counter()
+            run()
+            best = min(best, time.perf_counter() - start)
+        print(f"{label:>10} {best * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Compare indexed email / name-prefix lookups against a full scan as the store grows
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.api.compact_store import CompactUserStore  # noqa: E402
+from src.api.sqlite_store import SQLiteUserStore  # noqa: E402
+from src.api.store import InMemoryUserStore  # noqa: E402
+
+FIRST_NAMES = ["Ada", "Alan", "Barbara", "Claude", "Donald", "Edsger", "Grace", "John",
+               "Ken", "Leslie", "Margaret", "Niklaus", "Radia", "Tony", "Whitfield"]
+
+
+def seed(store, count, rng):
+    records = [(f"{rng.choice(FIRST_NAMES)} {i:07d}", f"user{i}@example.com")
+               for i in range(count)]
+    for start in range(0, count, 10000):
+        store.create_many(records[start:start + 10000])
+
+
+def per_call_us(fn, args_list):
+    start = time.perf_counter()
+    for args in args_list:
+        fn(*args)
+    return (time.perf_counter() - start) / len(args_list) * 1e6
+
+
+def bench(store, count, lookups, rng):
+    """Return microseconds per email lookup, prefix search and scan"""
+    emails = [(f"USER{rng.randrange(count)}@example.com",) for _ in range(lookups)]
+    prefixes = [(f"{rng.choice(FIRST_NAMES)} {rng.randrange(count):07d}"[:-2], 20)
+                for _ in range(lookups)]
+
+    def scan(prefix, limit):
+        prefix = prefix.casefold()
+        return [u for u in store.iter_users() if u['name'].casefold().startswith(prefix)][:limit]
+
+    return (per_call_us(store.find_by_email, emails),
+            per_call_us(store.search_names, prefixes),
+            per_call_us(scan, prefixes[:3]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="User search latency benchmark")
+    parser.add_argument("--sizes", default="10000,100000,1000000",
+                        help="Comma-separated store sizes to seed")
+    parser.add_argument("--lookups", type=int, default=2000, help="Lookups per measurement")
+    args = parser.parse_args()
+    rng = random.Random(0)
+
+    print(f"{'engine':>8} {'users':>9} {'email (us)':>11} {'prefix (us)':>12} {'scan (us)':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in (int(s) for s in args.sizes.split(',')):
+            engines = [('memory', InMemoryUserStore()), ('compact', CompactUserStore()),
+                       ('sqlite', SQLiteUserStore(os.path.join(tmp, f'users{size}.db')))]
+            for engine, store in engines:
+                seed(store, size, rng)
+                email, prefix, scan = bench(store, size, args.lookups, rng)
+                print(f"{engine:>8} {size:>9,} {email:>11.1f} {prefix:>12.1f} {scan:>12,.0f}")
+                if hasattr(store, 'close'):
+                    store.close()
+                del store
+            del engines
+
+
+if __name__ == "__main__":
+    main()
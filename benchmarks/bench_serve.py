@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Measure GET /users/<id> throughput of the pre-forked server by worker count
+
+Client load comes from separate processes so the benchmark itself is not
+limited by one interpreter's GIL.
+"""
+import argparse
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def client(base_url, users, duration, results):
+    session = requests.Session()
+    done = 0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        session.get(f"{base_url}/users/{done % users + 1}", timeout=5)
+        done += 1
+    results.put(done)
+
+
+def run(workers, clients, users, duration):
+    """Return requests/sec against a server with ``workers`` processes"""
+    with tempfile.TemporaryDirectory() as tmp:
+        env = os.environ.copy()
+        env.update(USER_STORE='shared', SHARED_STORE_PATH=os.path.join(tmp, 'users.shm'),
+                   LOG_MODE='off', PYTHONPATH=ROOT)
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'src.api.serve', '--host', '127.0.0.1', '--port', '0',
+             '--workers', str(workers)],
+            cwd=ROOT, env=env, stdout=subprocess.PIPE, text=True)
+        try:
+            port = int(server.stdout.readline().split('127.0.0.1:')[1].split()[0])
+            base_url = f"http://127.0.0.1:{port}"
+            records = [{"name": f"User {i}", "email": f"user{i}@example.com"} for i in range(users)]
+            requests.post(f"{base_url}/users/batch", json=records, timeout=30)
+
+            results = multiprocessing.Queue()
+            procs = [multiprocessing.Process(target=client, args=(base_url, users, duration, results))
+                     for _ in range(clients)]
+            for proc in procs:
+                proc.start()
+            total = sum(results.get() for _ in procs)
+            for proc in procs:
+                proc.join()
+            return total / duration
+        finally:
+            server.terminate()
+            server.wait(timeout=10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-worker throughput benchmark")
+    parser.add_argument("--workers", default="1,2,4", help="Comma-separated worker counts")
+    parser.add_argument("--clients", type=int, default=8, help="Client processes")
+    parser.add_argument("--users", type=int, default=1000, help="Users to seed")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per run")
+    args = parser.parse_args()
+
+    print(f"{'workers':>8} {'req/s':>10}")
+    for workers in (int(w) for w in args.workers.split(',')):
+        rate = run(workers, args.clients, args.users, args.duration)
+        print(f"{workers:>8} {rate:>10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Time from "start the API" to "first /health answered" for each startup method
+
+Compares the old fixture (subprocess, fixed 3s sleep, then /health polling),
+a subprocess detected with a socket probe, and werkzeug's make_server on a
+background thread in-process. The in-process import of the app is timed
+separately, since a test session pays it once either way.
+"""
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('LOG_MODE', 'off')
+
+from utils.live_server import LiveServer, wait_for_port  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def spawn(port):
+    env = dict(os.environ, FLASK_PORT=str(port), PYTHONPATH=ROOT)
+    return subprocess.Popen([sys.executable, 'src/api/app.py'], cwd=ROOT, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def subprocess_fixed_sleep():
+    start = time.perf_counter()
+    port = free_port()
+    server = spawn(port)
+    try:
+        time.sleep(3)
+        for _ in range(10):
+            try:
+                if requests.get(f"http://127.0.0.1:{port}/health", timeout=2).status_code == 200:
+                    return time.perf_counter() - start
+            except requests.exceptions.RequestException:
+                pass
+            time.sleep(1)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def subprocess_probe():
+    start = time.perf_counter()
+    port = free_port()
+    server = spawn(port)
+    try:
+        wait_for_port('127.0.0.1', port)
+        requests.get(f"http://127.0.0.1:{port}/health", timeout=2)
+        return time.perf_counter() - start
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def inprocess(app):
+    start = time.perf_counter()
+    with LiveServer(app) as server:
+        requests.get(f"{server.url}/health", timeout=2)
+        return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Test server startup benchmark")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per method")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    from src.api.app import app
+    import_seconds = time.perf_counter() - start
+
+    methods = [
+        ('subprocess + sleep(3)', subprocess_fixed_sleep),
+        ('subprocess + socket probe', subprocess_probe),
+        ('in-process make_server', lambda: inprocess(app)),
+    ]
+    print(f"{'method':>28} {'seconds':>9}")
+    for label, method in methods:
+        timings = [method() for _ in range(args.runs)]
+        print(f"{label:>28} {min(timings):>9.3f}")
+    print(f"{'(in-process app import)':>28} {import_seconds:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Time building a large fixture: bulk seed, snapshot, restore vs one POST per user
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('LOG_MODE', 'off')
+os.environ.setdefault('SNAPSHOT_PATH', os.path.join(tempfile.mkdtemp(), 'bench.snapshot'))
+
+from src.api.app import app  # noqa: E402
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    response = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:>22} {elapsed:>9.2f}s  {response.get_json()}")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fixture load benchmark (in-process test client)")
+    parser.add_argument("--users", type=int, default=1000000, help="Users in the fixture")
+    parser.add_argument("--posts", type=int, default=10000,
+                        help="Users created one POST at a time to extrapolate that rate")
+    args = parser.parse_args()
+
+    client = app.test_client()
+    client.post('/reset')
+    start = time.perf_counter()
+    for i in range(args.posts):
+        client.post('/users', json={"name": f"Post User {i}", "email": f"post{i}@example.com"})
+    per_post = (time.perf_counter() - start) / args.posts
+    print(f"{'POST /users (extrap.)':>22} {per_post * args.users:>9.2f}s  "
+          f"({per_post * 1e6:.0f} us/user over {args.posts} users)")
+
+    client.post('/reset')
+    timed('POST /admin/seed', lambda: client.post(f'/admin/seed?count={args.users}'))
+    timed('POST /admin/snapshot', lambda: client.post('/admin/snapshot'))
+    client.post('/reset')
+    timed('POST /admin/restore', lambda: client.post('/admin/restore'))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Compare create/get throughput of the user store engines
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.api.sqlite_store import SQLiteUserStore  # noqa: E402
+from src.api.store import InMemoryUserStore  # noqa: E402
+
+
+def bench(store, count):
+    """Return (creates/sec, gets/sec) for ``count`` operations each"""
+    start = time.perf_counter()
+    for i in range(count):
+        store.create(f"Bench User {i}", f"bench{i}@example.com")
+    create_rate = count / (time.perf_counter() - start)
+
+    ids = [random.randint(1, count) for _ in range(count)]
+    start = time.perf_counter()
+    for user_id in ids:
+        store.get(user_id)
+    get_rate = count / (time.perf_counter() - start)
+
+    return create_rate, get_rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description="User store throughput benchmark")
+    parser.add_argument("--count", type=int, default=100000,
+                        help="Number of creates and gets per engine")
+    args = parser.parse_args()
+
+    print(f"{'engine':>8} {'create/s':>12} {'get/s':>12}")
+    create_rate, get_rate = bench(InMemoryUserStore(), args.count)
+    print(f"{'memory':>8} {create_rate:>12,.0f} {get_rate:>12,.0f}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SQLiteUserStore(os.path.join(tmp, 'users.db'))
+        create_rate, get_rate = bench(store, args.count)
+        store.close()
+    print(f"{'sqlite':>8} {create_rate:>12,.0f} {get_rate:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,31 @@ class Config:
     DEBUG = False
     API_BASE_URL = os.getenv('API_BASE_URL', 'http://localhost:5000')
     TIMEOUT = int(os.getenv('REQUEST_TIMEOUT', 10))
+    USER_STORE = os.getenv('USER_STORE', 'memory')
+    SQLITE_PATH = os.getenv('SQLITE_PATH', 'users.db')
+    SHARED_STORE_PATH = os.getenv('SHARED_STORE_PATH', 'users.shm')
+    SHARED_STORE_MAX_USERS = int(os.getenv('SHARED_STORE_MAX_USERS', 1000000))
+    SNAPSHOT_PATH = os.getenv('SNAPSHOT_PATH', 'users.snapshot')
+    RESPONSE_CACHE_SIZE = int(os.getenv('RESPONSE_CACHE_SIZE', 100000))
+    IDEMPOTENCY_CACHE_SIZE = int(os.getenv('IDEMPOTENCY_CACHE_SIZE', 10000))
+    IDEMPOTENCY_CACHE_BYTES = int(os.getenv('IDEMPOTENCY_CACHE_BYTES', 16 * 1024 * 1024))
+    IDEMPOTENCY_TTL = float(os.getenv('IDEMPOTENCY_TTL', 3600))
+    COMPRESSION = os.getenv('COMPRESSION', 'true').lower() == 'true'
+    COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', 1024))
+    COMPRESSION_LEVEL = int(os.getenv('COMPRESSION_LEVEL', 6))
+    HEALTH_CACHE_TTL = float(os.getenv('HEALTH_CACHE_TTL', 1.0))
+    READY_CHECK_INTERVAL = float(os.getenv('READY_CHECK_INTERVAL', 5.0))
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+    LOG_MODE = os.getenv('LOG_MODE', 'queue')
+    LOG_SAMPLE_RATES = os.getenv('LOG_SAMPLE_RATES', '')
+    ADMISSION_CONTROL = os.getenv('ADMISSION_CONTROL', 'false').lower() == 'true'
+    MAX_IN_FLIGHT = int(os.getenv('MAX_IN_FLIGHT', 64))
+    CLIENT_RATE_LIMIT = float(os.getenv('CLIENT_RATE_LIMIT', 0))
+    CLIENT_RATE_BURST = float(os.getenv('CLIENT_RATE_BURST', 0))
+    ROUTE_RATE_LIMITS = os.getenv('ROUTE_RATE_LIMITS', '')
+    FAULT_INJECTION = os.getenv('FAULT_INJECTION', 'false').lower() == 'true'
+    FAULT_SEED = int(os.getenv('FAULT_SEED')) if os.getenv('FAULT_SEED') else None
+    FAULT_RULES = os.getenv('FAULT_RULES', '')
 
 
 class DevelopmentConfig(Config):
@@ -6,9 +6,20 @@ import subprocess
 import sys
 import os
 import argparse
+import shutil
+import tempfile
+import threading
 import time
+import xml.etree.ElementTree as ET
+from urllib.parse import urlsplit
+
 import requests
 
+from utils.live_server import wait_for_port
+
+# Server the local (non-CI) tests talk to
+API_URL = os.getenv('TEST_API_URL', 'http://localhost:5000')
+
 
 def is_ci_environment():
     """Check if running in CI environment"""
@@ -20,21 +31,39 @@ def wait_for_api(base_url, timeout=30):
     if is_ci_environment():
         return True  # In CI, we use test client directly
 
-    start_time = time.time()
-    while time.time() - start_time < timeout:
+    # Probe the socket with exponential backoff, then confirm with /health
+    url = urlsplit(base_url)
+    if wait_for_port(url.hostname, url.port or 80, timeout):
         try:
             response = requests.get(f"{base_url}/health", timeout=5)
             if response.status_code == 200:
                 print("✅ API is ready!")
                 return True
         except requests.exceptions.RequestException:
-            print("⏳ Waiting for API to start...")
-            time.sleep(2)
+            pass
 
     print("❌ API failed to start within timeout period")
     return False
 
 
+def selection_args(test_type):
+    """Return the pytest arguments selecting ``test_type`` tests"""
+    if test_type == "unit":
+        return ["-m", "not integration"]
+    if test_type == "integration":
+        return ["-m", "integration"]
+    if test_type == "smoke":
+        if is_ci_environment():
+            return ["tests/test_health.py",
+                    "tests/test_users.py::TestUserCreation::test_create_user_success"]
+        return [
+            "tests/test_health.py::TestHealthEndpoint::test_health_check_success",
+            "tests/test_health.py::TestHealthEndpoint::test_health_check_method_not_allowed",
+            "tests/test_users.py::TestUserCreation::test_create_user_success"
+        ]
+    return []
+
+
 def run_tests(test_type="all", html_report=True):
     """Run tests with specified configuration"""
 
@@ -49,20 +78,7 @@ def run_tests(test_type="all", html_report=True):
         cmd = [sys.executable, "-m", "pytest", "-v"]
 
     # Add options based on test type
-    if test_type == "unit":
-        cmd.extend(["-m", "not integration"])
-    elif test_type == "integration":
-        cmd.extend(["-m", "integration"])
-    elif test_type == "smoke":
-        if is_ci_environment():
-            cmd.extend(["tests/test_health.py",
-                       "tests/test_users.py::TestUserCreation::test_create_user_success"])
-        else:
-            cmd.extend([
-                "tests/test_health.py::TestHealthEndpoint::test_health_check_success",
-                "tests/test_health.py::TestHealthEndpoint::test_health_check_method_not_allowed",
-                "tests/test_users.py::TestUserCreation::test_create_user_success"
-            ])
+    cmd.extend(selection_args(test_type))
 
     # Add reporting options
     if html_report:
@@ -81,7 +97,7 @@ def run_tests(test_type="all", html_report=True):
 
     try:
         # Wait for API to be ready (only in local)
-        if not is_ci_environment() and not wait_for_api("http://localhost:5000"):
+        if not is_ci_environment() and not wait_for_api(API_URL):
             print("❌ Cannot run tests - API is not available")
             return 1
 
@@ -102,12 +118,190 @@ def run_tests(test_type="all", html_report=True):
         return 1
 
 
+def collect_tests(test_type, env):
+    """Return the node IDs of the ``test_type`` tests"""
+    # Override the configured -v so tests are listed one node ID per line
+    cmd = [sys.executable, "-m", "pytest", "--collect-only", "-q", "-o", "addopts=",
+           "-p", "no:warnings"]
+    cmd.extend(selection_args(test_type) or ["tests/"])
+    result = subprocess.run(cmd, env=env, capture_output=True, text=True)
+    return [line.strip() for line in result.stdout.splitlines() if '::' in line]
+
+
+def shard_by_module(tests, workers):
+    """Split node IDs into at most ``workers`` shards, keeping each module whole
+
+    Tests in one module share a store and may rely on running in file
+    order, so a module never spans workers. Modules are dealt largest
+    first to the shard with the fewest tests.
+    """
+    modules = {}
+    for test in tests:
+        modules.setdefault(test.split('::', 1)[0], []).append(test)
+    shards = [[] for _ in range(max(1, min(workers, len(modules))))]
+    for module_tests in sorted(modules.values(), key=len, reverse=True):
+        min(shards, key=len).extend(module_tests)
+    return shards
+
+
+def start_worker_server(env, log, timeout=30):
+    """Start a single-process API server on a free port; return (process, base URL)
+
+    Raises RuntimeError if the server exits, or has not printed its URL
+    within ``timeout`` seconds.
+    """
+    server = subprocess.Popen(
+        [sys.executable, "-m", "src.api.serve", "--host", "127.0.0.1", "--port", "0",
+         "--workers", "1"],
+        env=env, stdout=subprocess.PIPE, stderr=log, text=True)
+    # serve prints "Serving on http://127.0.0.1:<port> ..." once it is listening.
+    # Read on a thread so a server that hangs before printing cannot block us.
+    lines = []
+    reader = threading.Thread(target=lambda: lines.append(server.stdout.readline()), daemon=True)
+    reader.start()
+    reader.join(timeout)
+    words = lines[0].split() if lines else []
+    if len(words) < 3 or not words[2].startswith('http'):
+        timed_out = reader.is_alive()
+        server.terminate()
+        code = server.wait(timeout=10)
+        reader.join()
+        server.stdout.close()
+        if timed_out:
+            raise RuntimeError(f"API server did not print its URL within {timeout}s")
+        raise RuntimeError(f"API server exited with code {code} before printing its URL")
+    return server, words[2]
+
+
+def merge_junit_reports(paths, output):
+    """Combine per-worker JUnit XML files into one; return the test results"""
+    merged = ET.Element('testsuites')
+    results = []
+    totals = dict.fromkeys(('tests', 'failures', 'errors', 'skipped'), 0)
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        root = ET.parse(path).getroot()
+        for suite in (root.iter('testsuite') if root.tag == 'testsuites' else [root]):
+            merged.append(suite)
+            for key in totals:
+                totals[key] += int(suite.get(key, 0))
+            for case in suite.iter('testcase'):
+                failure = case.find('failure')
+                if failure is None:
+                    failure = case.find('error')
+                status = ('failed' if failure is not None
+                          else 'skipped' if case.find('skipped') is not None else 'passed')
+                results.append({
+                    'name': f"{case.get('classname')}::{case.get('name')}",
+                    'status': status,
+                    'duration': float(case.get('time', 0)),
+                    'error': failure.get('message', '') if failure is not None else '',
+                })
+    for key, value in totals.items():
+        merged.set(key, str(value))
+    ET.ElementTree(merged).write(output, encoding='utf-8', xml_declaration=True)
+    return results
+
+
+def run_parallel(test_type="all", html_report=True, workers=2):
+    """Shard the tests over ``workers`` pytest processes, each against its own API
+
+    In CI each worker drives its own in-process app; locally each starts
+    its own server on a free port. Either way every worker has a private
+    user store and private snapshot/database files, so tests cannot
+    collide on emails or IDs across workers.
+    """
+    env = os.environ.copy()
+    env['ENVIRONMENT'] = 'testing'
+    env.setdefault('LOG_MODE', 'off')
+    # As tests/conftest.py sets for its own server, so /admin/faults tests can run
+    env.setdefault('FAULT_INJECTION', 'true')
+
+    tests = collect_tests(test_type, env)
+    if not tests:
+        print("❌ No tests collected")
+        return 5
+    shards = shard_by_module(tests, workers)
+    workers = len(shards)
+    print(f"Running {len(tests)} tests on {workers} workers")
+
+    scratch = tempfile.mkdtemp(prefix='api-tests-')
+    servers, procs, logs, junit_paths = [], [], [], []
+    start = time.time()
+    try:
+        for index, shard in enumerate(shards):
+            worker_dir = os.path.join(scratch, f'worker-{index}')
+            os.makedirs(worker_dir)
+            worker_env = dict(env, SNAPSHOT_PATH=os.path.join(worker_dir, 'users.snapshot'),
+                              SQLITE_PATH=os.path.join(worker_dir, 'users.db'),
+                              SHARED_STORE_PATH=os.path.join(worker_dir, 'users.shm'))
+            log = open(os.path.join("test-reports", f"worker-{index}.log"), 'w')
+            logs.append(log)
+            if not is_ci_environment():
+                try:
+                    server, base_url = start_worker_server(worker_env, log)
+                except RuntimeError as e:
+                    print(f"❌ Cannot run tests - worker {index}: {e} (see {log.name})")
+                    return 1
+                servers.append(server)
+                if not wait_for_api(base_url):
+                    print(f"❌ Cannot run tests - worker {index} API is not available")
+                    return 1
+                worker_env['TEST_API_URL'] = base_url
+
+            junit_path = os.path.join("test-reports", f"junit-worker-{index}.xml")
+            junit_paths.append(junit_path)
+            cmd = [sys.executable, "-m", "pytest", "-q", "-p", "no:warnings", "--tb=short",
+                   f"--junit-xml={junit_path}"] + shard
+            procs.append(subprocess.Popen(cmd, env=worker_env, stdout=log,
+                                          stderr=subprocess.STDOUT))
+
+        return_code = 0
+        for index, proc in enumerate(procs):
+            code = proc.wait()
+            print(f"   Worker {index}: {len(shards[index])} tests, return code {code} "
+                  f"(output in {logs[index].name})")
+            return_code = return_code or code
+    finally:
+        # On an early exit, workers already started are still running
+        for proc in procs:
+            if proc.poll() is None:
+                proc.terminate()
+                proc.wait()
+        for server in servers:
+            server.terminate()
+            server.wait(timeout=10)
+        for log in logs:
+            log.close()
+        shutil.rmtree(scratch, ignore_errors=True)
+    duration = time.time() - start
+
+    results = merge_junit_reports(junit_paths, "test-reports/junit-report.xml")
+    for path in junit_paths:
+        os.remove(path)
+    failed = [result for result in results if result['status'] == 'failed']
+    for result in failed:
+        print(f"   ❌ {result['name']}: {result['error']}")
+    print(f"📊 {len(results)} tests in {duration:.2f}s: "
+          f"{sum(r['status'] == 'passed' for r in results)} passed, {len(failed)} failed, "
+          f"{sum(r['status'] == 'skipped' for r in results)} skipped")
+
+    if html_report:
+        from utils.report_generator import HTMLReportGenerator
+        report = HTMLReportGenerator("test-reports").generate_report(results, duration)
+        print(f"📄 HTML report: {report}")
+    return return_code
+
+
 def main():
     parser = argparse.ArgumentParser(description="API Test Runner")
     parser.add_argument("--type", choices=["all", "unit", "integration", "smoke"],
                         default="all", help="Type of tests to run")
     parser.add_argument("--no-html", action="store_true",
                         help="Disable HTML report")
+    parser.add_argument("--workers", default="1",
+                        help="Parallel worker processes, or 'auto' for one per core")
 
     args = parser.parse_args()
 
@@ -117,8 +311,13 @@ def main():
     print(f"🚀 Starting test execution: {args.type} tests")
     print(f"📊 HTML reports: {not args.no_html}")
 
+    workers = (os.cpu_count() or 1) if args.workers == "auto" else int(args.workers)
+
     # Run tests
-    return_code = run_tests(args.type, not args.no_html)
+    if workers > 1:
+        return_code = run_parallel(args.type, not args.no_html, workers)
+    else:
+        return_code = run_tests(args.type, not args.no_html)
 
     if return_code == 0:
         print("✅ All tests passed!")
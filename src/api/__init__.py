@@ -1,81 +1,519 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, make_response, stream_with_context
+import functools
+import itertools
+import json
 import logging
-from datetime import datetime
+import secrets
+import threading
+
+from config.config import get_config
+from src.api.admission import AdmissionController, AdmissionMiddleware
+from src.api.compression import CompressionMiddleware
+from src.api.faults import FaultConfigError, FaultInjector, FaultMiddleware
+from src.api.health import HealthPayload, ReadinessMonitor
+from src.api.idempotency import (IDEMPOTENCY_HEADER, REPLAYED_HEADER, IdempotencyCache,
+                                 IdempotencyError, check_key, request_fingerprint)
+from src.api.logging_setup import configure_logging, parse_sample_rates
+from src.api.metrics import PROMETHEUS_CONTENT_TYPE, RequestMetrics, instrument_app, timed
+from src.api.response_cache import ResponseCache
+from src.api.schema import validate_user, validate_users
+from src.api.snapshot import SnapshotError, SnapshotNotFoundError, read_snapshot, write_snapshot
+from src.api.store import DuplicateEmailError, StoreFullError, create_store
+
+config = get_config()
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
+configure_logging(config.LOG_LEVEL, config.LOG_MODE, parse_sample_rates(config.LOG_SAMPLE_RATES))
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
 
-# In-memory storage for demo purposes
-users_db = {}
-user_id_counter = 1
+# Server-side request latency, exposed at /metrics
+request_metrics = RequestMetrics()
+instrument_app(app, request_metrics)
+
+# gzip/brotli for large list, batch and metrics bodies when the client accepts it
+if config.COMPRESSION:
+    app.wsgi_app = CompressionMiddleware(app.wsgi_app, config.COMPRESSION_MIN_SIZE,
+                                         config.COMPRESSION_LEVEL)
+
+# Fail fast with 429/503 instead of queueing when overloaded
+admission_controller = None
+if config.ADMISSION_CONTROL:
+    admission_controller = AdmissionController.from_config(config)
+    app.wsgi_app = AdmissionMiddleware(app.wsgi_app, admission_controller, request_metrics,
+                                       app.url_map)
+
+# Latency, errors and connection resets for testing clients, set via /admin/faults
+fault_injector = None
+if config.FAULT_INJECTION:
+    fault_injector = FaultInjector(config.FAULT_SEED)
+    if config.FAULT_RULES:
+        fault_injector.configure(json.loads(config.FAULT_RULES))
+    app.wsgi_app = FaultMiddleware(app.wsgi_app, fault_injector)
+    request_metrics.add_collector(fault_injector.render_metrics)
+
+# User storage, selected by configuration (in-memory by default)
+store = create_store(config)
+
+# Serialized GET /users/<id> bodies; user records are immutable once created
+user_response_cache = ResponseCache(config.RESPONSE_CACHE_SIZE)
+
+# First responses to POST /users requests sent with an Idempotency-Key
+idempotency_cache = IdempotencyCache(config.IDEMPOTENCY_CACHE_SIZE,
+                                     config.IDEMPOTENCY_CACHE_BYTES,
+                                     config.IDEMPOTENCY_TTL)
+request_metrics.add_collector(idempotency_cache.render_metrics)
+
+# Records validated and inserted together by POST /users/batch
+BATCH_CHUNK_SIZE = 500
+
+# Page sizes for GET /users
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# IDs one GET /users?ids= multi-get may request
+MAX_MULTI_GET_IDS = 1000
+
+# Users one POST /admin/seed may generate, and how many are inserted at a time
+MAX_SEED_COUNT = 10000000
+SEED_CHUNK_SIZE = 10000
+
+
+def serialize_json(obj):
+    """Serialize ``obj`` to the same bytes a non-debug jsonify() sends"""
+    return (json.dumps(obj, sort_keys=True, separators=(",", ":")) + "\n").encode()
+
+
+# Liveness body, rebuilt at most once per HEALTH_CACHE_TTL seconds
+health_payload = HealthPayload(serialize_json, config.HEALTH_CACHE_TTL)
+
+# Readiness verdict, refreshed every READY_CHECK_INTERVAL seconds in the background
+readiness = ReadinessMonitor(serialize_json, config.READY_CHECK_INTERVAL)
+
+# Set while /admin/restore swaps the store's contents
+store_loading = threading.Event()
+
+
+def _check_store():
+    if store_loading.is_set():
+        raise RuntimeError("store is loading a snapshot")
+    return {"users": len(store)}
+
+
+readiness.add_check('store', _check_store)
+
+
+def serialize_user_cached(user):
+    """Return ``(body, etag)`` for a user record from the response cache"""
+    # Keyed on created_at too, so a reset in another worker process
+    # cannot leave a stale body behind for a reused ID
+    return user_response_cache.get_or_build(
+        (user['id'], user['created_at']), lambda: serialize_json(user))
+
+
+def idempotent(view):
+    """Replay the first response to requests retried with the same Idempotency-Key
+
+    Replays are answered from ``idempotency_cache`` without running
+    ``view``. Responses with a 5xx status are not cached, so a retry after a
+    server error runs the request again.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if key is None or not idempotency_cache.enabled:
+            return view(*args, **kwargs)
+
+        try:
+            check_key(key)
+            fingerprint = request_fingerprint(request.get_data())
+            cached = idempotency_cache.begin(key, fingerprint)
+        except IdempotencyError as e:
+            return jsonify({"error": str(e)}), e.status
+        if cached is not None:
+            status, body = cached
+            logger.info("Replayed response for Idempotency-Key %s", key)
+            response = Response(body, status=status, mimetype='application/json')
+            response.headers[REPLAYED_HEADER] = 'true'
+            return response
+
+        try:
+            response = make_response(view(*args, **kwargs))
+        except BaseException:
+            idempotency_cache.release(key)
+            raise
+        if response.status_code >= 500:
+            idempotency_cache.release(key)
+        else:
+            idempotency_cache.complete(key, fingerprint, response.status_code, response.get_data())
+        return response
+
+    return wrapper
 
 
 @app.route('/health', methods=['GET'])
 def health_check():
-    """Health check endpoint"""
-    logger.info("Health check endpoint called")
-    return jsonify({
-        "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
-        "version": "1.0.0"
-    }), 200
+    """Liveness probe, served from a payload refreshed at most once a second"""
+    return Response(health_payload.body(), status=200, mimetype='application/json')
+
+
+@app.route('/ready', methods=['GET'])
+def readiness_check():
+    """Readiness probe: 503 until every dependency check passes
+
+    Checks run on a background interval; this only returns the last verdict.
+    """
+    status, body = readiness.status()
+    return Response(body, status=status, mimetype='application/json')
 
 
 @app.route('/users', methods=['POST'])
+@idempotent
 def create_user():
     """Create a new user"""
-    global user_id_counter
-
     logger.info("Create user endpoint called")
 
     # Validate request content type
     if not request.is_json:
         return jsonify({"error": "Content-Type must be application/json"}), 400
 
-    data = request.get_json()
+    with timed('parse'):
+        data = request.get_json()
+
+    with timed('validate'):
+        error = validate_user(data)
+    if error:
+        return jsonify({"error": error}), 400
+
+    # Create user, rejecting duplicate emails
+    try:
+        with timed('store'):
+            user = store.create(data['name'], data['email'])
+    except DuplicateEmailError:
+        return jsonify({"error": "Email already exists"}), 409
+
+    logger.info("User created with ID: %s", user['id'])
+    with timed('serialize'):
+        response = jsonify(user)
+    return response, 201
+
+
+def _iter_ndjson_records(stream):
+    """Yield decoded records from an NDJSON stream, None for undecodable lines"""
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield None
+
 
-    # Validate required fields
-    required_fields = ['name', 'email']
-    for field in required_fields:
-        if field not in data:
-            return jsonify({"error": f"Missing required field: {field}"}), 400
+def _create_chunk(chunk):
+    """Validate and bulk-insert ``(index, record)`` pairs, returning results in order"""
+    results = {}
+    valid = []
+    errors = validate_users([record for _, record in chunk])
+    for (index, record), error in zip(chunk, errors):
+        if error:
+            results[index] = {"index": index, "status": 400, "error": error}
+        else:
+            valid.append((index, record))
 
-    # Validate email format
-    if '@' not in data['email']:
-        return jsonify({"error": "Invalid email format"}), 400
+    created = store.create_many([(record['name'], record['email']) for _, record in valid])
+    for (index, _), outcome in zip(valid, created):
+        if isinstance(outcome, DuplicateEmailError):
+            results[index] = {"index": index, "status": 409, "error": "Email already exists"}
+        else:
+            results[index] = {"index": index, "status": 201, "user": outcome}
 
-    # Check if email already exists
-    for user in users_db.values():
-        if user['email'] == data['email']:
-            return jsonify({"error": "Email already exists"}), 409
+    return [results[index] for index, _ in chunk]
 
-    # Create user
-    user_id = user_id_counter
-    users_db[user_id] = {
-        'id': user_id,
-        'name': data['name'],
-        'email': data['email'],
-        'created_at': datetime.utcnow().isoformat()
-    }
 
-    user_id_counter += 1
+@app.route('/users/batch', methods=['POST'])
+def create_users_batch():
+    """Create many users from a JSON array or NDJSON stream
 
-    logger.info(f"User created with ID: {user_id}")
-    return jsonify(users_db[user_id]), 201
+    Streams back one NDJSON result line per input record, in input order.
+    """
+    logger.info("Batch create users endpoint called")
+
+    if request.mimetype not in ('application/json', 'application/x-ndjson'):
+        return jsonify({"error": "Content-Type must be application/json or application/x-ndjson"}), 400
+
+    if request.mimetype == 'application/x-ndjson':
+        records = _iter_ndjson_records(request.stream)
+    else:
+        records = request.get_json(silent=True)
+        if not isinstance(records, list):
+            return jsonify({"error": "Request body must be a JSON array"}), 400
+
+    def generate():
+        total = created = 0
+        numbered = enumerate(records)
+        while True:
+            chunk = list(itertools.islice(numbered, BATCH_CHUNK_SIZE))
+            if not chunk:
+                break
+            for result in _create_chunk(chunk):
+                created += result['status'] == 201
+                yield json.dumps(result) + "\n"
+            total += len(chunk)
+        logger.info("Batch created %d of %d users", created, total)
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
+def _int_arg(name, default, minimum, maximum=None):
+    """Parse a bounded integer query parameter, raising ValueError if invalid"""
+    raw = request.args.get(name)
+    if raw is None:
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer") from None
+    if value < minimum or (maximum is not None and value > maximum):
+        bounds = f"between {minimum} and {maximum}" if maximum is not None else f"at least {minimum}"
+        raise ValueError(f"{name} must be {bounds}")
+    return value
+
+
+def _ids_arg():
+    """Parse the comma-separated ``ids`` parameter, dropping repeats, or raise ValueError"""
+    try:
+        ids = [int(part) for part in request.args['ids'].split(',') if part.strip()]
+    except ValueError:
+        raise ValueError("ids must be a comma-separated list of integers") from None
+    if not ids:
+        raise ValueError("ids must not be empty")
+    if len(ids) > MAX_MULTI_GET_IDS:
+        raise ValueError(f"ids accepts at most {MAX_MULTI_GET_IDS} IDs per request")
+    return list(dict.fromkeys(ids))
+
+
+def _multi_get(user_ids):
+    """Respond with ``{"missing": [...], "users": [...]}`` for ``user_ids``
+
+    The body is spliced from the cached per-user serializations, so each
+    user is serialized at most once and never re-encoded here.
+    """
+    with timed('store'):
+        users = store.get_many(user_ids)
+
+    with timed('serialize'):
+        bodies = []
+        missing = []
+        for user_id, user in zip(user_ids, users):
+            if user is None:
+                missing.append(user_id)
+            else:
+                bodies.append(serialize_user_cached(user)[0][:-1])
+        body = b''.join([b'{"missing":', serialize_json(missing)[:-1],
+                         b',"users":[', b','.join(bodies), b']}\n'])
+    return Response(body, status=200, mimetype='application/json')
+
+
+def _wants_ndjson():
+    return (request.args.get('stream', '').lower() == 'true'
+            or request.accept_mimetypes.best == 'application/x-ndjson')
+
+
+@app.route('/users', methods=['GET'])
+def list_users():
+    """List users in ID order with keyset pagination
+
+    ``cursor`` is the last ID seen (``next_cursor`` from the previous page).
+    With ``stream=true`` or ``Accept: application/x-ndjson`` every user
+    after the cursor is streamed as NDJSON instead. ``ids=1,2,3`` fetches
+    those users in one round-trip instead, reporting unknown IDs as
+    ``missing``.
+    """
+    logger.info("List users endpoint called")
+
+    if 'ids' in request.args:
+        try:
+            user_ids = _ids_arg()
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        return _multi_get(user_ids)
+
+    try:
+        cursor = _int_arg('cursor', 0, minimum=0)
+        limit = _int_arg('limit', DEFAULT_PAGE_SIZE, minimum=1, maximum=MAX_PAGE_SIZE)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if _wants_ndjson():
+        def generate():
+            for user in store.iter_users(after_id=cursor, page_size=MAX_PAGE_SIZE):
+                yield serialize_json(user)
+
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+    with timed('store'):
+        users = store.list_users(after_id=cursor, limit=limit)
+    next_cursor = users[-1]['id'] if len(users) == limit else None
+    with timed('serialize'):
+        response = jsonify({"users": users, "next_cursor": next_cursor})
+    return response, 200
+
+
+@app.route('/users/search', methods=['GET'])
+def search_users():
+    """Find users by exact email (``email``) or case-insensitive name prefix (``name``)
+
+    Name matches are ordered by name, then ID, and capped by ``limit``.
+    """
+    logger.info("Search users endpoint called")
+
+    email = request.args.get('email')
+    name = request.args.get('name')
+    if (email is None) == (name is None):
+        return jsonify({"error": "Provide exactly one of email or name"}), 400
+    if name is not None and not name:
+        return jsonify({"error": "name must not be empty"}), 400
+    try:
+        limit = _int_arg('limit', DEFAULT_PAGE_SIZE, minimum=1, maximum=MAX_PAGE_SIZE)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    with timed('store'):
+        if email is not None:
+            user = store.find_by_email(email)
+            users = [] if user is None else [user]
+        else:
+            users = store.search_names(name, limit)
+    with timed('serialize'):
+        response = jsonify({"users": users})
+    return response, 200
 
 
 @app.route('/users/<int:user_id>', methods=['GET'])
 def get_user(user_id):
     """Get user details by ID"""
-    logger.info(f"Get user endpoint called for ID: {user_id}")
+    logger.info("Get user endpoint called for ID: %s", user_id)
 
-    if user_id not in users_db:
+    with timed('store'):
+        user = store.get(user_id)
+    if user is None:
         return jsonify({"error": "User not found"}), 404
 
-    return jsonify(users_db[user_id]), 200
+    with timed('serialize'):
+        body, etag = serialize_user_cached(user)
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(body, status=200, mimetype='application/json')
+    response.set_etag(etag)
+    return response
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Request counters and latency histograms in Prometheus text format"""
+    return Response(request_metrics.render(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@app.route('/reset', methods=['POST'])
+def reset_database():
+    """Reset the database (for testing only)"""
+    store.reset()
+    user_response_cache.clear()
+    idempotency_cache.clear()
+    logger.info("Database reset successfully")
+    return jsonify({"message": "Database reset successfully"}), 200
+
+
+@app.route('/admin/snapshot', methods=['POST'])
+def snapshot_users():
+    """Write every user to the binary snapshot at SNAPSHOT_PATH (for testing only)"""
+    with timed('store'):
+        users = list(store.iter_users())
+    with timed('write'):
+        count, size = write_snapshot(config.SNAPSHOT_PATH, users)
+    logger.info("Snapshot of %d users written to %s", count, config.SNAPSHOT_PATH)
+    return jsonify({"users": count, "bytes": size}), 200
+
+
+@app.route('/admin/restore', methods=['POST'])
+def restore_users():
+    """Replace every user with the snapshot at SNAPSHOT_PATH (for testing only)"""
+    try:
+        with timed('read'):
+            users = read_snapshot(config.SNAPSHOT_PATH)
+    except SnapshotNotFoundError as e:
+        return jsonify({"error": str(e)}), 404
+    except SnapshotError as e:
+        return jsonify({"error": str(e)}), 409
+    store_loading.set()
+    readiness.refresh()
+    try:
+        with timed('store'):
+            store.load(users)
+    except StoreFullError as e:
+        return jsonify({"error": str(e)}), 409
+    finally:
+        store_loading.clear()
+        readiness.refresh()
+    user_response_cache.clear()
+    idempotency_cache.clear()
+    logger.info("Restored %d users from %s", len(users), config.SNAPSHOT_PATH)
+    return jsonify({"users": len(users)}), 200
+
+
+@app.route('/admin/seed', methods=['POST'])
+def seed_users():
+    """Create ``count`` synthetic users in bulk (for testing only)"""
+    try:
+        count = _int_arg('count', None, minimum=1, maximum=MAX_SEED_COUNT)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if count is None:
+        return jsonify({"error": "count is required"}), 400
+
+    # A per-call token keeps seeded emails unique across calls
+    token = secrets.token_hex(4)
+    created_count = 0
+    first_id = last_id = None
+    with timed('store'):
+        for start in range(0, count, SEED_CHUNK_SIZE):
+            records = [(f"Seed User {i}", f"seed{i}.{token}@example.com")
+                       for i in range(start, min(count, start + SEED_CHUNK_SIZE))]
+            created = [user for user in store.create_many(records)
+                       if not isinstance(user, DuplicateEmailError)]
+            if created:
+                first_id = created[0]['id'] if first_id is None else first_id
+                last_id = created[-1]['id']
+            created_count += len(created)
+    logger.info("Seeded %d users", created_count)
+    return jsonify({"created": created_count, "first_id": first_id, "last_id": last_id}), 201
+
+
+@app.route('/admin/faults', methods=['GET', 'PUT', 'DELETE'])
+def configure_faults():
+    """Show, replace or clear the fault injection rules (for testing only)"""
+    if fault_injector is None:
+        return jsonify({"error": "Fault injection is disabled; set FAULT_INJECTION=true"}), 404
+    if request.method == 'PUT':
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({"error": "Body must be an object with a rules list"}), 400
+        seed = data.get('seed')
+        if seed is not None and (isinstance(seed, bool) or not isinstance(seed, int)):
+            return jsonify({"error": "seed must be an integer"}), 400
+        try:
+            fault_injector.configure(data.get('rules'), seed)
+        except FaultConfigError as e:
+            return jsonify({"error": str(e)}), 400
+        logger.info("Fault injection rules set for %s",
+                    ", ".join(rule['route'] for rule in data['rules']) or "no routes")
+    elif request.method == 'DELETE':
+        fault_injector.clear()
+        logger.info("Fault injection rules cleared")
+    return jsonify(fault_injector.to_dict()), 200
 
 
 @app.errorhandler(404)
@@ -89,4 +527,4 @@ def internal_error(error):
 
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    app.run(debug=True, host='0.0.0.0', port=5000, threaded=True)
@@ -0,0 +1,211 @@
+"""
+Admission control: token-bucket rate limits and an in-flight request cap
+"""
+import json
+import math
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from src.api.metrics import route_label
+
+_NUMERIC_SEGMENT = re.compile(r'/[0-9]+(?=/|$)')
+
+# Paths that are never shed, so probes and scrapes keep working under load
+EXEMPT_PATHS = frozenset(['/health', '/ready', '/metrics'])
+
+# ``admit`` result for exempt paths: admitted, but not counted in flight
+EXEMPT = 'exempt'
+
+
+def route_key(method, path):
+    """Collapse a request into a route key, e.g. ``GET /users/<id>``"""
+    return f"{method} {_NUMERIC_SEGMENT.sub('/<id>', path)}"
+
+
+def parse_route_limits(spec):
+    """Parse ``"METHOD /path=rate[/burst],..."`` into route key -> (rate, burst)
+
+    Raises ValueError for a rate that is not positive or a burst below one
+    token; such a bucket could never admit a request.
+    """
+    limits = {}
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        route, _, limit = item.rpartition('=')
+        rate, _, burst = limit.partition('/')
+        rate = float(rate)
+        burst = float(burst) if burst else rate
+        if not rate > 0:
+            raise ValueError(f"Rate limit for {route.strip()!r} must be positive, got {limit!r}")
+        if not burst >= 1:
+            raise ValueError(f"Burst for {route.strip()!r} must be at least 1, got {limit!r}")
+        limits[route.strip()] = (rate, burst)
+    return limits
+
+
+class TokenBucket:
+    """Refills ``rate`` tokens per second up to ``burst``; not thread-safe on its own"""
+
+    __slots__ = ('rate', 'burst', 'tokens', 'updated')
+
+    def __init__(self, rate, burst, now=None):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic() if now is None else now
+
+    def take(self, now):
+        """Take one token; return 0 if granted, else seconds until one is available"""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class AdmissionController:
+    """Decide whether to admit, rate-limit (429) or shed (503) a request
+
+    ``route_limits`` maps route keys to ``(rate, burst)``. ``client_rate``
+    and ``client_burst`` apply one bucket per client address; at most
+    ``max_clients`` client buckets are kept, least recently used first out.
+    ``max_in_flight`` caps concurrently admitted requests (0 disables).
+    """
+
+    def __init__(self, route_limits=None, client_rate=0, client_burst=0,
+                 max_in_flight=0, max_clients=10000):
+        self.route_buckets = {route: TokenBucket(rate, burst)
+                              for route, (rate, burst) in (route_limits or {}).items()}
+        self.client_rate = client_rate
+        self.client_burst = client_burst or client_rate
+        self.max_in_flight = max_in_flight
+        self.max_clients = max_clients
+        self.client_buckets = OrderedDict()
+        self.in_flight = 0
+        self.rejected = {429: 0, 503: 0}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            route_limits=parse_route_limits(config.ROUTE_RATE_LIMITS),
+            client_rate=config.CLIENT_RATE_LIMIT,
+            client_burst=config.CLIENT_RATE_BURST,
+            max_in_flight=config.MAX_IN_FLIGHT,
+        )
+
+    def _client_bucket(self, client, now):
+        bucket = self.client_buckets.get(client)
+        if bucket is None:
+            if len(self.client_buckets) >= self.max_clients:
+                self.client_buckets.popitem(last=False)
+            bucket = self.client_buckets[client] = TokenBucket(
+                self.client_rate, self.client_burst, now)
+        else:
+            self.client_buckets.move_to_end(client)
+        return bucket
+
+    def admit(self, method, path, client):
+        """Return None to admit (call ``release`` when done), EXEMPT to admit
+        without counting (do not call ``release``) or ``(status, retry_after)``
+        """
+        if path in EXEMPT_PATHS:
+            return EXEMPT
+
+        now = time.monotonic()
+        with self._lock:
+            if self.max_in_flight and self.in_flight >= self.max_in_flight:
+                self.rejected[503] += 1
+                return 503, 1
+
+            wait = 0.0
+            route_bucket = self.route_buckets.get(route_key(method, path))
+            if route_bucket is not None:
+                wait = route_bucket.take(now)
+            if not wait and self.client_rate:
+                wait = self._client_bucket(client, now).take(now)
+            if wait:
+                self.rejected[429] += 1
+                return 429, max(1, math.ceil(wait))
+
+            self.in_flight += 1
+            return None
+
+    def release(self):
+        with self._lock:
+            self.in_flight -= 1
+
+
+_REJECTIONS = {
+    429: ("429 Too Many Requests", {"error": "Too many requests"}),
+    503: ("503 Service Unavailable", {"error": "Server overloaded, retry later"}),
+}
+
+
+def rejection_response(status, retry_after):
+    """Return ``(status line, headers, body)`` for a rejected request"""
+    status_line, payload = _REJECTIONS[status]
+    body = (json.dumps(payload) + "\n").encode()
+    headers = [
+        ('Content-Type', 'application/json'),
+        ('Content-Length', str(len(body))),
+        ('Retry-After', str(retry_after)),
+    ]
+    return status_line, headers, body
+
+
+class AdmissionMiddleware:
+    """WSGI middleware applying an AdmissionController before the wrapped app
+
+    Rejections are recorded in ``metrics`` under the route label the app
+    itself would use, resolved against ``url_map`` (else the route key).
+    """
+
+    def __init__(self, wsgi_app, controller, metrics=None, url_map=None):
+        self.wsgi_app = wsgi_app
+        self.controller = controller
+        self.metrics = metrics
+        self.url_map = url_map
+
+    def __call__(self, environ, start_response):
+        method = environ['REQUEST_METHOD']
+        path = environ.get('PATH_INFO', '/')
+        decision = self.controller.admit(method, path, environ.get('REMOTE_ADDR', ''))
+        if decision is EXEMPT:
+            return self.wsgi_app(environ, start_response)
+        if decision is not None:
+            status, retry_after = decision
+            if self.metrics is not None:
+                route = (route_label(self.url_map, method, path) if self.url_map is not None
+                         else route_key(method, path))
+                self.metrics.observe(route, status, 0.0)
+            status_line, headers, body = rejection_response(status, retry_after)
+            start_response(status_line, headers)
+            return [body]
+
+        try:
+            result = self.wsgi_app(environ, start_response)
+        except BaseException:
+            self.controller.release()
+            raise
+        return _ReleasingIterable(result, self.controller.release)
+
+
+class _ReleasingIterable:
+    """Wrap a WSGI body so the in-flight slot is freed once it is fully sent"""
+
+    def __init__(self, result, release):
+        self._result = result
+        self._release = release
+
+    def __iter__(self):
+        return iter(self._result)
+
+    def close(self):
+        try:
+            if hasattr(self._result, 'close'):
+                self._result.close()
+        finally:
+            self._release()
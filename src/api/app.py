@@ -1,8 +1,12 @@
-@app.route('/reset', methods=['POST'])
-def reset_database():
-    """Reset the database (for testing only)"""
-    global users_db, user_id_counter
-    users_db.clear()
-    user_id_counter = 1
-    logger.info("Database reset successfully")
-    return jsonify({"message": "Database reset successfully"}), 200
+import os
+
+from src.api import app
+
+
+if __name__ == '__main__':
+    app.run(
+        debug=os.getenv('FLASK_DEBUG', 'False') == 'True',
+        host='0.0.0.0',
+        port=int(os.getenv('FLASK_PORT', 5000)),
+        threaded=True
+    )
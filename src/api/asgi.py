@@ -0,0 +1,373 @@
+"""
+ASGI variant of the users API
+
+Serve with any ASGI server, e.g. ``uvicorn src.api.asgi:app``.
+
+The hot routes (GET /health, GET /ready, POST /users, GET /users/<id>,
+POST /reset) are handled natively on the event loop, against the same
+store, response cache and metrics as the Flask app. Any other method/path pair is bridged
+to the Flask WSGI app on a worker thread, so every response contract
+(including 404/405 and malformed-JSON errors) is identical between the
+two variants. Injected faults (see ``/admin/faults``) are applied here,
+before routing, for native and bridged requests alike.
+"""
+import asyncio
+import io
+import json
+import re
+import sys
+import time
+
+from werkzeug.http import parse_etags
+
+import src.api as api
+from src.api.admission import EXEMPT, rejection_response
+from src.api.faults import error_response
+from src.api.idempotency import IdempotencyError, check_key, request_fingerprint
+from src.api.store import DuplicateEmailError
+
+_USER_PATH = re.compile(r'^/users/([0-9]+)$')
+
+
+class _Request:
+    """The parts of an ASGI HTTP request the native handlers need"""
+
+    def __init__(self, scope, body):
+        self.scope = scope
+        self.method = scope['method']
+        self.path = scope['path']
+        self.body = body
+        self.headers = {name.decode('latin-1').lower(): value.decode('latin-1')
+                        for name, value in scope.get('headers', ())}
+        self.timings = {}
+
+    @property
+    def mimetype(self):
+        return self.headers.get('content-type', '').split(';')[0].strip().lower()
+
+    def timed(self, phase, start):
+        self.timings[phase] = self.timings.get(phase, 0.0) + time.perf_counter() - start
+
+
+class _NotHandled(Exception):
+    """Raised by a native handler to hand the request to the Flask app"""
+
+
+def _json_response(payload, status):
+    return status, api.serialize_json(payload), [(b'content-type', b'application/json')]
+
+
+def _health(req):
+    return 200, api.health_payload.body(), [(b'content-type', b'application/json')]
+
+
+def _ready(req):
+    status, body = api.readiness.status()
+    return status, body, [(b'content-type', b'application/json')]
+
+
+def _create_user(req):
+    api.logger.info("Create user endpoint called")
+
+    mimetype = req.mimetype
+    if not (mimetype == 'application/json'
+            or (mimetype.startswith('application/') and mimetype.endswith('+json'))):
+        return _json_response({"error": "Content-Type must be application/json"}, 400)
+
+    start = time.perf_counter()
+    try:
+        data = json.loads(req.body)
+    except ValueError:
+        # Let Flask produce its standard 400 for malformed JSON
+        raise _NotHandled()
+    req.timed('parse', start)
+
+    start = time.perf_counter()
+    error = api.validate_user(data)
+    req.timed('validate', start)
+    if error:
+        return _json_response({"error": error}, 400)
+
+    start = time.perf_counter()
+    try:
+        user = api.store.create(data['name'], data['email'])
+    except DuplicateEmailError:
+        return _json_response({"error": "Email already exists"}, 409)
+    req.timed('store', start)
+
+    api.logger.info("User created with ID: %s", user['id'])
+    start = time.perf_counter()
+    response = _json_response(user, 201)
+    req.timed('serialize', start)
+    return response
+
+
+def _create_user_idempotent(req):
+    """``_create_user`` with the Flask app's Idempotency-Key replay semantics"""
+    key = req.headers.get('idempotency-key')
+    cache = api.idempotency_cache
+    if key is None or not cache.enabled:
+        return _create_user(req)
+
+    try:
+        check_key(key)
+        fingerprint = request_fingerprint(req.body)
+        cached = cache.begin(key, fingerprint)
+    except IdempotencyError as e:
+        return _json_response({"error": str(e)}, e.status)
+    if cached is not None:
+        status, body = cached
+        api.logger.info("Replayed response for Idempotency-Key %s", key)
+        return status, body, [(b'content-type', b'application/json'),
+                              (b'idempotent-replayed', b'true')]
+
+    try:
+        status, body, headers = _create_user(req)
+    except BaseException:
+        cache.release(key)
+        raise
+    if status >= 500:
+        cache.release(key)
+    else:
+        cache.complete(key, fingerprint, status, body)
+    return status, body, headers
+
+
+def _get_user(req, user_id):
+    api.logger.info("Get user endpoint called for ID: %s", user_id)
+
+    start = time.perf_counter()
+    user = api.store.get(user_id)
+    req.timed('store', start)
+    if user is None:
+        return _json_response({"error": "User not found"}, 404)
+
+    start = time.perf_counter()
+    body, etag = api.serialize_user_cached(user)
+    req.timed('serialize', start)
+    etag_header = [(b'etag', f'"{etag}"'.encode())]
+    if parse_etags(req.headers.get('if-none-match')).contains(etag):
+        return 304, b'', etag_header
+    return 200, body, [(b'content-type', b'application/json')] + etag_header
+
+
+def _reset(req):
+    api.store.reset()
+    api.user_response_cache.clear()
+    api.idempotency_cache.clear()
+    api.logger.info("Database reset successfully")
+    return _json_response({"message": "Database reset successfully"}, 200)
+
+
+def _route(req):
+    """Return ``(route rule, handler)`` for natively served requests, else None"""
+    method, path = req.method, req.path
+    if path == '/health' and method == 'GET':
+        return '/health', _health
+    if path == '/ready' and method == 'GET':
+        return '/ready', _ready
+    if path == '/users' and method == 'POST':
+        return '/users', _create_user_idempotent
+    if path == '/reset' and method == 'POST':
+        return '/reset', _reset
+    match = _USER_PATH.match(path)
+    if match and method == 'GET':
+        user_id = int(match.group(1))
+        return '/users/<int:user_id>', lambda r: _get_user(r, user_id)
+    return None
+
+
+async def _read_body(receive):
+    chunks = []
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            break
+        chunks.append(message.get('body', b''))
+        if not message.get('more_body'):
+            break
+    return b''.join(chunks)
+
+
+def _wsgi_environ(scope, body):
+    """Build a WSGI environ for ``scope`` with a fully buffered ``body``"""
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('127.0.0.1', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': client[0],
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+        # Faults were already injected on the event loop
+        'api.faults_applied': True,
+    }
+    for name, value in scope.get('headers', ()):
+        name = name.decode('latin-1').upper().replace('-', '_')
+        value = value.decode('latin-1')
+        if name == 'CONTENT_TYPE':
+            environ['CONTENT_TYPE'] = value
+        elif name != 'CONTENT_LENGTH':
+            key = f'HTTP_{name}'
+            environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+async def _call_wsgi(wsgi_app, scope, body, send):
+    """Run ``wsgi_app`` on one worker thread, streaming its body back chunk by chunk
+
+    The whole WSGI call, including iteration of the body, stays on a single
+    thread because Flask binds streamed generators to the thread's context.
+    A bounded queue applies backpressure to the producing thread.
+    """
+    loop = asyncio.get_running_loop()
+    chunks = asyncio.Queue(maxsize=16)
+    started = {}
+    done = object()
+
+    def start_response(status, headers, exc_info=None):
+        started['status'] = int(status.split(' ', 1)[0])
+        started['headers'] = [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                              for name, value in headers]
+
+    def put(item):
+        asyncio.run_coroutine_threadsafe(chunks.put(item), loop).result()
+
+    def run():
+        try:
+            result = wsgi_app(_wsgi_environ(scope, body), start_response)
+            try:
+                for chunk in result:
+                    put(chunk)
+            finally:
+                if hasattr(result, 'close'):
+                    result.close()
+        except BaseException as e:
+            put(e)
+        else:
+            put(done)
+
+    worker = loop.run_in_executor(None, run)
+    response_started = False
+    while True:
+        item = await chunks.get()
+        if isinstance(item, BaseException):
+            await worker
+            raise item
+        if not response_started:
+            await send({'type': 'http.response.start', 'status': started['status'],
+                        'headers': started['headers']})
+            response_started = True
+        if item is done:
+            await send({'type': 'http.response.body', 'body': b''})
+            break
+        if item:
+            await send({'type': 'http.response.body', 'body': item, 'more_body': True})
+    await worker
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def _inject_fault(fault, send):
+    """Apply an injected fault; return True if it answered the request"""
+    delay, action, status = fault
+    if delay:
+        await asyncio.sleep(delay)
+    if action == 'reset':
+        # ASGI servers do not expose the socket, so abort the request instead;
+        # uvicorn answers with a 500 and closes the connection
+        raise ConnectionResetError("Injected connection reset")
+    if action == 'error':
+        _, headers, payload = error_response(status)
+        await send({'type': 'http.response.start', 'status': status,
+                    'headers': [(k.lower().encode(), v.encode()) for k, v in headers]})
+        await send({'type': 'http.response.body', 'body': payload})
+        return True
+    return False
+
+
+async def _handle_natively(req, route, send):
+    """Serve ``req`` on the event loop; return False to fall back to Flask"""
+    controller = api.admission_controller
+    counted = False
+    if controller is not None:
+        client = (req.scope.get('client') or ('', 0))[0]
+        decision = controller.admit(req.method, req.path, client)
+        if decision is not None and decision is not EXEMPT:
+            api.request_metrics.observe(route[0], decision[0], 0.0)
+            _, headers, payload = rejection_response(*decision)
+            await send({'type': 'http.response.start', 'status': decision[0],
+                        'headers': [(k.lower().encode(), v.encode()) for k, v in headers]})
+            await send({'type': 'http.response.body', 'body': payload})
+            return True
+        counted = decision is None
+
+    rule, handler = route
+    start = time.perf_counter()
+    try:
+        status, payload, headers = handler(req)
+    except _NotHandled:
+        return False
+    finally:
+        if counted:
+            controller.release()
+
+    duration = time.perf_counter() - start
+    api.request_metrics.observe(rule, status, duration)
+    entries = [f"{phase};dur={seconds * 1000:.3f}" for phase, seconds in req.timings.items()]
+    entries.append(f"total;dur={duration * 1000:.3f}")
+    headers = headers + [
+        (b'content-length', str(len(payload)).encode()),
+        (b'server-timing', ", ".join(entries).encode()),
+    ]
+    await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+    await send({'type': 'http.response.body', 'body': payload})
+    return True
+
+
+def create_asgi_app(wsgi_app=None):
+    """Build the ASGI application; unhandled routes fall back to ``wsgi_app``"""
+    if wsgi_app is None:
+        from src.api.app import app as wsgi_app
+
+    async def application(scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await _lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            raise RuntimeError(f"Unsupported ASGI scope type: {scope['type']}")
+
+        body = await _read_body(receive)
+        req = _Request(scope, body)
+        injector = api.fault_injector
+        if injector is not None:
+            fault = injector.decide(req.method, req.path)
+            if fault is not None and await _inject_fault(fault, send):
+                return
+        route = _route(req)
+        if route is None or not await _handle_natively(req, route, send):
+            await _call_wsgi(wsgi_app, scope, body, send)
+
+    return application
+
+
+app = create_asgi_app()
@@ -0,0 +1,183 @@
+"""
+Memory-compact, column-oriented user store
+"""
+import threading
+from array import array
+from datetime import datetime, timedelta
+
+from src.api.name_index import NamePrefixIndex
+from src.api.store import DuplicateEmailError, UserStore, normalize_email
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def to_epoch_us(moment):
+    """Convert a naive UTC datetime to integer microseconds since the epoch"""
+    delta = moment - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+
+def format_epoch_us(epoch_us):
+    """Format integer epoch microseconds as the API's ISO-8601 timestamp"""
+    return (_EPOCH + timedelta(microseconds=epoch_us)).isoformat()
+
+
+class _StringColumn:
+    """Append-only UTF-8 strings packed into one buffer with end offsets"""
+
+    def __init__(self):
+        self._data = bytearray()
+        self._ends = array('Q')
+
+    def append(self, encoded):
+        """Append a string already encoded to UTF-8, so a bad string never half-appends"""
+        self._data += encoded
+        self._ends.append(len(self._data))
+
+    def __getitem__(self, index):
+        start = self._ends[index - 1] if index else 0
+        return self._data[start:self._ends[index]].decode('utf-8')
+
+    def nbytes(self):
+        return len(self._data) + self._ends.itemsize * len(self._ends)
+
+
+def _index_email_hash(index, key_hash, row):
+    """Add ``row`` under ``key_hash``; colliding rows are kept as a tuple"""
+    existing = index.get(key_hash)
+    if existing is None:
+        index[key_hash] = row
+    elif isinstance(existing, int):
+        index[key_hash] = (existing, row)
+    else:
+        index[key_hash] = existing + (row,)
+
+
+class CompactUserStore(UserStore):
+    """Store users as parallel columns instead of one dict per user
+
+    IDs are implicit (row index + 1), names and emails live in packed
+    UTF-8 buffers, and ``created_at`` is kept as epoch microseconds and
+    only formatted when a record is read. The email index maps the hash
+    of the normalized email to row numbers, so it holds no string copies;
+    the name prefix index does keep a casefolded copy of every name.
+    Locking mirrors InMemoryUserStore.
+    """
+
+    def __init__(self, stripes=64):
+        self._stripes = [threading.Lock() for _ in range(stripes)]
+        self._id_lock = threading.Lock()
+        self._init_columns()
+
+    def _init_columns(self):
+        self._names = _StringColumn()
+        self._emails = _StringColumn()
+        self._created = array('q')
+        self._by_email_hash = {}
+        self._by_name = NamePrefixIndex()
+        self._count = 0
+
+    def _stripe_for(self, email_key):
+        return self._stripes[hash(email_key) % len(self._stripes)]
+
+    def _find_email(self, email_key, key_hash):
+        """Return the row registered with ``email_key`` or None"""
+        rows = self._by_email_hash.get(key_hash)
+        if rows is None:
+            return None
+        if isinstance(rows, int):
+            rows = (rows,)
+        for row in rows:
+            if normalize_email(self._emails[row]) == email_key:
+                return row
+        return None
+
+    def _record(self, row):
+        return {
+            'id': row + 1,
+            'name': self._names[row],
+            'email': self._emails[row],
+            'created_at': format_epoch_us(self._created[row])
+        }
+
+    def create(self, name, email):
+        # Encode up front: a failure inside _id_lock would leave the columns misaligned
+        name_bytes, email_bytes = name.encode('utf-8'), email.encode('utf-8')
+        email_key = normalize_email(email)
+        key_hash = hash(email_key)
+        with self._stripe_for(email_key):
+            if self._find_email(email_key, key_hash) is not None:
+                raise DuplicateEmailError(email)
+
+            with self._id_lock:
+                row = self._count
+                self._names.append(name_bytes)
+                self._emails.append(email_bytes)
+                self._created.append(to_epoch_us(datetime.utcnow()))
+                self._count += 1
+
+            _index_email_hash(self._by_email_hash, key_hash, row)
+            self._by_name.add(name, row + 1)
+        return self._record(row)
+
+    def get(self, user_id):
+        if not 0 < user_id <= self._count:
+            return None
+        return self._record(user_id - 1)
+
+    def find_by_email(self, email):
+        email_key = normalize_email(email)
+        row = self._find_email(email_key, hash(email_key))
+        return None if row is None else self._record(row)
+
+    def search_names(self, prefix, limit=100):
+        users = (self.get(user_id) for user_id in self._by_name.search(prefix, limit))
+        return [user for user in users if user is not None]
+
+    def list_users(self, after_id=0, limit=100):
+        start = max(after_id, 0)
+        end = min(self._count, start + limit)
+        return [self._record(row) for row in range(start, end)]
+
+    def reset(self):
+        for lock in self._stripes:
+            lock.acquire()
+        try:
+            with self._id_lock:
+                self._init_columns()
+        finally:
+            for lock in self._stripes:
+                lock.release()
+
+    def load(self, users):
+        names, emails, created = _StringColumn(), _StringColumn(), array('q')
+        by_email_hash = {}
+        name_entries = []
+        for row, user in enumerate(users):
+            names.append(user['name'].encode('utf-8'))
+            emails.append(user['email'].encode('utf-8'))
+            created.append(to_epoch_us(datetime.fromisoformat(user['created_at'])))
+            _index_email_hash(by_email_hash, hash(normalize_email(user['email'])), row)
+            name_entries.append((user['name'], row + 1))
+        by_name = NamePrefixIndex()
+        by_name.load(name_entries)
+
+        for lock in self._stripes:
+            lock.acquire()
+        try:
+            with self._id_lock:
+                self._names, self._emails, self._created = names, emails, created
+                self._by_email_hash = by_email_hash
+                self._by_name = by_name
+                self._count = len(created)
+        finally:
+            for lock in self._stripes:
+                lock.release()
+
+    def nbytes(self):
+        """Approximate bytes held by the column buffers (excluding the email index)"""
+        return (self._names.nbytes() + self._emails.nbytes()
+                + self._created.itemsize * len(self._created))
+
+    def __len__(self):
+        return self._count
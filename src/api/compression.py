@@ -0,0 +1,194 @@
+"""
+Response compression negotiated from Accept-Encoding
+"""
+import re
+import zlib
+
+from werkzeug.http import parse_accept_header
+
+try:
+    import brotli
+except ImportError:  # brotli is optional
+    brotli = None
+
+# Content types worth compressing; everything else passes through untouched
+_COMPRESSIBLE = re.compile(r'^(text/|application/(json|x-ndjson|[^;]*\+json)\b)')
+# Streamed input is handed to the compressor in blocks of at least this size
+STREAM_BLOCK_SIZE = 16384
+# ETag suffix marking the compressed representation of a resource
+_ETAG_SUFFIX = re.compile(r'-(gzip|br)"')
+
+
+class _GzipCompressor:
+    def __init__(self, level):
+        self._zlib = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data):
+        return self._zlib.compress(data)
+
+    def flush(self):
+        return self._zlib.flush()
+
+
+class _BrotliCompressor:
+    def __init__(self, quality):
+        self._brotli = brotli.Compressor(quality=quality)
+
+    def compress(self, data):
+        return self._brotli.process(data)
+
+    def flush(self):
+        return self._brotli.finish()
+
+
+def available_encodings():
+    """Return the content codings this process can produce, most preferred first"""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def negotiate(accept_encoding, encodings):
+    """Return the coding from ``encodings`` the client accepts most, or None"""
+    if not accept_encoding:
+        return None
+    accept = parse_accept_header(accept_encoding)
+    best, best_quality = None, 0
+    for coding in encodings:
+        quality = accept.quality(coding)
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+class CompressionMiddleware:
+    """WSGI middleware compressing responses the client accepts in gzip or brotli
+
+    Only textual/JSON bodies of at least ``min_size`` bytes are compressed.
+    Up to ``min_size`` bytes are buffered to decide; longer bodies,
+    including streamed ones without a Content-Length, are then compressed
+    chunk by chunk as the wrapped app yields them rather than buffered.
+    Strong ETags get a ``-<coding>`` suffix, which is stripped from
+    If-None-Match on the way in so conditional requests still match.
+    """
+
+    def __init__(self, wsgi_app, min_size=1024, gzip_level=6, brotli_quality=4):
+        self.wsgi_app = wsgi_app
+        self.min_size = min_size
+        self.encodings = available_encodings()
+        self._factories = {
+            'gzip': lambda: _GzipCompressor(gzip_level),
+            'br': lambda: _BrotliCompressor(brotli_quality),
+        }
+
+    def __call__(self, environ, start_response):
+        coding = negotiate(environ.get('HTTP_ACCEPT_ENCODING'), self.encodings)
+        if coding is None or environ['REQUEST_METHOD'] == 'HEAD':
+            return self.wsgi_app(environ, start_response)
+
+        if_none_match = environ.get('HTTP_IF_NONE_MATCH')
+        if if_none_match:
+            environ['HTTP_IF_NONE_MATCH'] = _ETAG_SUFFIX.sub('"', if_none_match)
+
+        captured = []
+
+        def capture(status, headers, exc_info=None):
+            captured[:] = [status, headers, exc_info]
+            return self._no_write
+
+        result = self.wsgi_app(environ, capture)
+        return self._respond(result, captured, coding, start_response)
+
+    @staticmethod
+    def _no_write(data):
+        raise NotImplementedError("CompressionMiddleware does not support write()")
+
+    def _compressible(self, status, headers, length):
+        if not status.startswith('2') or status.startswith('204'):
+            return False
+        content_type = ''
+        for name, value in headers:
+            name = name.lower()
+            if name == 'content-encoding':
+                return False
+            if name == 'cache-control' and 'no-transform' in value.lower():
+                return False
+            if name == 'content-type':
+                content_type = value.lower()
+            elif name == 'content-length' and int(value) < self.min_size:
+                return False
+        if length is not None and length < self.min_size:
+            return False
+        return bool(_COMPRESSIBLE.match(content_type))
+
+    def _respond(self, result, captured, coding, start_response):
+        try:
+            chunks = iter(result)
+            buffered = []
+            size = 0
+            exhausted = True
+            for chunk in chunks:
+                if chunk:
+                    buffered.append(chunk)
+                    size += len(chunk)
+                if size >= self.min_size:
+                    exhausted = False
+                    break
+
+            status, headers, exc_info = captured
+            if not exhausted:
+                # A body that declared its length and has fully arrived is not a stream
+                declared = [value for name, value in headers if name.lower() == 'content-length']
+                exhausted = bool(declared) and size >= int(declared[0])
+            if not self._compressible(status, headers, size if exhausted else None):
+                if any(_COMPRESSIBLE.match(v.lower()) for k, v in headers
+                       if k.lower() == 'content-type'):
+                    headers = _add_vary(headers)
+                start_response(status, headers, exc_info)
+                yield from buffered
+                yield from chunks
+                return
+
+            compressor = self._factories[coding]()
+            headers = [(name, _tag_etag(value, coding) if name.lower() == 'etag' else value)
+                       for name, value in headers if name.lower() != 'content-length']
+            headers = _add_vary(headers) + [('Content-Encoding', coding)]
+
+            if exhausted:
+                body = compressor.compress(b''.join(buffered)) + compressor.flush()
+                start_response(status, headers + [('Content-Length', str(len(body)))], exc_info)
+                yield body
+                return
+
+            start_response(status, headers, exc_info)
+            # Feed the compressor in blocks: streams often yield one short
+            # line at a time, and per-call overhead would dominate otherwise
+            pending, pending_size = buffered, size
+            for chunk in chunks:
+                pending.append(chunk)
+                pending_size += len(chunk)
+                if pending_size >= STREAM_BLOCK_SIZE:
+                    out = compressor.compress(b''.join(pending))
+                    pending, pending_size = [], 0
+                    if out:
+                        yield out
+            yield compressor.compress(b''.join(pending)) + compressor.flush()
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+
+
+def _add_vary(headers):
+    for index, (name, value) in enumerate(headers):
+        if name.lower() == 'vary':
+            if 'accept-encoding' in value.lower():
+                return headers
+            headers = list(headers)
+            headers[index] = (name, f"{value}, Accept-Encoding")
+            return headers
+    return list(headers) + [('Vary', 'Accept-Encoding')]
+
+
+def _tag_etag(value, coding):
+    """Mark a strong ETag as belonging to the ``coding`` representation"""
+    if value.startswith('"') and value.endswith('"'):
+        return f'{value[:-1]}-{coding}"'
+    return value
@@ -0,0 +1,270 @@
+"""
+Fault injection: per-route latency, error responses and connection resets
+"""
+import json
+import math
+import os
+import random
+import socket
+import struct
+import threading
+import time
+from http import HTTPStatus
+
+from src.api.admission import route_key
+
+# Never faulted, so injection can always be inspected and switched off
+EXEMPT_PATHS = frozenset(['/admin/faults'])
+# Matches every route without a rule of its own
+ANY_ROUTE = '*'
+FAULT_HEADER = 'X-Fault-Injected'
+
+
+class FaultConfigError(ValueError):
+    """Raised for a fault rule that cannot be applied"""
+
+
+def _number(spec, field, minimum=0.0, default=None):
+    value = spec.get(field, default)
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise FaultConfigError(f"{field} must be a number")
+    if value < minimum:
+        raise FaultConfigError(f"{field} must be at least {minimum}")
+    return float(value)
+
+
+class Latency:
+    """A delay distribution, parsed from e.g. ``{"distribution": "uniform", ...}``
+
+    ``fixed`` takes ``ms``; ``uniform`` takes ``min_ms`` and ``max_ms``;
+    ``lognormal`` takes ``median_ms`` and ``sigma`` (the spread of the
+    underlying normal), giving the long right tail of real services.
+    """
+
+    DISTRIBUTIONS = {
+        'fixed': ('ms',),
+        'uniform': ('min_ms', 'max_ms'),
+        'lognormal': ('median_ms', 'sigma'),
+    }
+
+    def __init__(self, distribution, **params):
+        self.distribution = distribution
+        self.params = params
+
+    @classmethod
+    def from_spec(cls, spec):
+        if not isinstance(spec, dict):
+            raise FaultConfigError("latency must be an object")
+        distribution = spec.get('distribution')
+        fields = cls.DISTRIBUTIONS.get(distribution)
+        if fields is None:
+            raise FaultConfigError(
+                f"latency distribution must be one of {', '.join(cls.DISTRIBUTIONS)}")
+        params = {field: _number(spec, field) for field in fields}
+        if distribution == 'uniform' and params['min_ms'] > params['max_ms']:
+            raise FaultConfigError("min_ms must not exceed max_ms")
+        if distribution == 'lognormal' and params['median_ms'] == 0:
+            raise FaultConfigError("median_ms must be positive")
+        return cls(distribution, **params)
+
+    def sample(self, rng):
+        """Draw one delay, in seconds"""
+        params = self.params
+        if self.distribution == 'fixed':
+            ms = params['ms']
+        elif self.distribution == 'uniform':
+            ms = rng.uniform(params['min_ms'], params['max_ms'])
+        else:
+            ms = rng.lognormvariate(math.log(params['median_ms']), params['sigma'])
+        return ms / 1000
+
+    def to_dict(self):
+        return {'distribution': self.distribution, **self.params}
+
+
+class FaultRule:
+    """Faults for one route key (see ``route_key``), or ``*`` for any route
+
+    Each request is delayed by a ``latency`` sample, if given, and then
+    reset with probability ``reset_rate`` or answered with
+    ``error_status`` with probability ``error_rate``.
+    """
+
+    __slots__ = ('route', 'latency', 'error_rate', 'error_status', 'reset_rate')
+
+    def __init__(self, route, latency=None, error_rate=0.0, error_status=503, reset_rate=0.0):
+        self.route = route
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.reset_rate = reset_rate
+
+    @classmethod
+    def from_dict(cls, data):
+        if not isinstance(data, dict):
+            raise FaultConfigError("each rule must be an object")
+        route = data.get('route')
+        if not isinstance(route, str) or not route:
+            raise FaultConfigError("route is required, e.g. \"GET /users/<id>\" or \"*\"")
+        latency = data.get('latency')
+        error_rate = _number(data, 'error_rate', default=0)
+        reset_rate = _number(data, 'reset_rate', default=0)
+        if error_rate + reset_rate > 1:
+            raise FaultConfigError("error_rate and reset_rate must add up to at most 1")
+        error_status = data.get('error_status', 503)
+        if not isinstance(error_status, int) or not 400 <= error_status <= 599:
+            raise FaultConfigError("error_status must be a 4xx or 5xx status code")
+        return cls(route, Latency.from_spec(latency) if latency is not None else None,
+                   error_rate, error_status, reset_rate)
+
+    def to_dict(self):
+        data = {'route': self.route, 'error_rate': self.error_rate,
+                'error_status': self.error_status, 'reset_rate': self.reset_rate}
+        if self.latency is not None:
+            data['latency'] = self.latency.to_dict()
+        return data
+
+
+class FaultInjector:
+    """Pick the faults for each request from the configured rules
+
+    Rules are replaced wholesale by ``configure``, so a request sees either
+    the old or the new set, never a mix. Pass ``seed`` for a reproducible
+    sequence of delays and failures.
+    """
+
+    def __init__(self, seed=None):
+        self._rules = {}
+        self._rng = random.Random(seed)
+        self.seed = seed
+        self.injected = {'latency': 0, 'error': 0, 'reset': 0}
+        self._lock = threading.Lock()
+
+    def configure(self, rules, seed=None):
+        """Replace every rule with ``rules`` (dicts); reseed if ``seed`` is given"""
+        if not isinstance(rules, list):
+            raise FaultConfigError("rules must be a list")
+        parsed = {}
+        for data in rules:
+            rule = FaultRule.from_dict(data)
+            if rule.route in parsed:
+                raise FaultConfigError(f"Duplicate rule for route {rule.route}")
+            parsed[rule.route] = rule
+        with self._lock:
+            if seed is not None:
+                self._rng.seed(seed)
+                self.seed = seed
+            self._rules = parsed
+
+    def clear(self):
+        self._rules = {}
+
+    def decide(self, method, path):
+        """Return ``(delay seconds, action, error status)``, or None to leave it alone
+
+        ``action`` is None, ``'error'`` or ``'reset'``.
+        """
+        rules = self._rules
+        if not rules or path in EXEMPT_PATHS:
+            return None
+        rule = rules.get(route_key(method, path)) or rules.get(ANY_ROUTE)
+        if rule is None:
+            return None
+
+        with self._lock:
+            delay = rule.latency.sample(self._rng) if rule.latency is not None else 0.0
+            draw = self._rng.random()
+            if draw < rule.reset_rate:
+                action = 'reset'
+            elif draw < rule.reset_rate + rule.error_rate:
+                action = 'error'
+            else:
+                action = None
+            if delay:
+                self.injected['latency'] += 1
+            if action:
+                self.injected[action] += 1
+        return delay, action, rule.error_status
+
+    def to_dict(self):
+        return {'rules': [rule.to_dict() for rule in self._rules.values()], 'seed': self.seed}
+
+    def render_metrics(self):
+        """Return the injected fault counters in Prometheus text format"""
+        with self._lock:
+            injected = sorted(self.injected.items())
+        lines = [
+            "# HELP api_faults_injected_total Requests delayed, failed or reset by fault injection",
+            "# TYPE api_faults_injected_total counter",
+        ]
+        for kind, count in injected:
+            lines.append(f'api_faults_injected_total{{kind="{kind}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+def error_response(status):
+    """Return ``(status line, headers, body)`` for an injected error"""
+    try:
+        phrase = HTTPStatus(status).phrase
+    except ValueError:
+        phrase = 'Error'
+    body = (json.dumps({"error": "Injected fault"}) + "\n").encode()
+    headers = [
+        ('Content-Type', 'application/json'),
+        ('Content-Length', str(len(body))),
+        (FAULT_HEADER, 'error'),
+    ]
+    return f"{status} {phrase}", headers, body
+
+
+def reset_connection(sock):
+    """Abort ``sock`` with a TCP RST instead of an orderly close"""
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack('ii', 1, 0))
+    # The server's buffered reader/writer keep socket.close() from closing the
+    # descriptor. Replace it in place with a socket whose peer is gone: that
+    # drops the last reference to the connection (sending the RST), and the
+    # server's next read sees EOF and ends the keep-alive loop cleanly.
+    dead, peer = socket.socketpair()
+    peer.close()
+    try:
+        os.dup2(dead.fileno(), sock.fileno())
+    finally:
+        dead.close()
+
+
+class FaultMiddleware:
+    """WSGI middleware applying a FaultInjector before the wrapped app
+
+    A reset closes the client socket with SO_LINGER 0 when the server
+    exposes it (Werkzeug's ``werkzeug.socket``, gunicorn's
+    ``gunicorn.socket``); otherwise, as under a test client, it raises
+    ConnectionResetError. Requests whose environ already carries
+    ``api.faults_applied`` (set by the ASGI app) are passed through.
+    """
+
+    def __init__(self, wsgi_app, injector):
+        self.wsgi_app = wsgi_app
+        self.injector = injector
+
+    def __call__(self, environ, start_response):
+        if environ.get('api.faults_applied'):
+            return self.wsgi_app(environ, start_response)
+        method = environ['REQUEST_METHOD']
+        path = environ.get('PATH_INFO', '/')
+        fault = self.injector.decide(method, path)
+        if fault is None:
+            return self.wsgi_app(environ, start_response)
+
+        delay, action, status = fault
+        if delay:
+            time.sleep(delay)
+        if action == 'reset':
+            sock = environ.get('werkzeug.socket') or environ.get('gunicorn.socket')
+            if sock is not None:
+                reset_connection(sock)
+            raise ConnectionResetError("Injected connection reset")
+        if action == 'error':
+            status_line, headers, body = error_response(status)
+            start_response(status_line, headers)
+            return [body]
+        return self.wsgi_app(environ, start_response)
@@ -0,0 +1,114 @@
+"""
+Precomputed liveness and background-refreshed readiness probes
+"""
+import os
+import threading
+import time
+from datetime import datetime
+
+API_VERSION = "1.0.0"
+
+
+class HealthPayload:
+    """The serialized /health body, rebuilt at most once every ``ttl`` seconds
+
+    Probes between rebuilds get the same bytes, so ``timestamp`` has a
+    resolution of ``ttl``.
+    """
+
+    def __init__(self, serialize, ttl=1.0, version=API_VERSION):
+        self.serialize = serialize
+        self.ttl = ttl
+        self.version = version
+        self._body = None
+        self._expires = float('-inf')
+        self._lock = threading.Lock()
+
+    def body(self, now=None):
+        now = time.monotonic() if now is None else now
+        if now >= self._expires:
+            with self._lock:
+                if now >= self._expires:
+                    self._body = self.serialize({
+                        "status": "healthy",
+                        "timestamp": datetime.utcnow().isoformat(),
+                        "version": self.version
+                    })
+                    self._expires = now + self.ttl
+        return self._body
+
+
+class ReadinessMonitor:
+    """Run dependency checks every ``interval`` seconds and cache the verdict
+
+    Each check is a callable that raises, or returns False, when its
+    dependency is unavailable; any other non-boolean return value is
+    reported as the check's ``detail``. Checks run on a daemon thread that
+    starts on first use in each process, so forked workers run their own.
+    Once stopped, the monitor keeps serving its last verdict.
+    """
+
+    def __init__(self, serialize, interval=5.0):
+        self.serialize = serialize
+        self.interval = interval
+        self._checks = {}
+        self._state = None
+        self._pid = None
+        self._stop = threading.Event()
+        self._stopped = False
+        self._lock = threading.Lock()
+
+    def add_check(self, name, check):
+        self._checks[name] = check
+
+    def refresh(self):
+        """Run every check now and cache the result"""
+        results = {}
+        ready = True
+        for name, check in list(self._checks.items()):
+            start = time.perf_counter()
+            try:
+                detail = check()
+                ok = detail is not False
+            except Exception as e:
+                ok, detail = False, f"{type(e).__name__}: {e}"
+            result = {"ok": ok, "duration_ms": round((time.perf_counter() - start) * 1000, 3)}
+            if not isinstance(detail, bool) and detail is not None:
+                result["detail"] = detail
+            results[name] = result
+            ready = ready and ok
+
+        body = self.serialize({
+            "status": "ready" if ready else "not ready",
+            "checked_at": datetime.utcnow().isoformat(),
+            "checks": results
+        })
+        self._state = (200 if ready else 503, body)
+
+    def _run(self, stop):
+        while not stop.wait(self.interval):
+            self.refresh()
+
+    def ensure_started(self):
+        """Run the first checks and start the refresh thread in this process"""
+        if self._pid == os.getpid() or self._stopped:
+            return
+        with self._lock:
+            if self._pid == os.getpid() or self._stopped:
+                return
+            self.refresh()
+            self._stop = stop = threading.Event()
+            threading.Thread(target=self._run, args=(stop,), name='readiness-checks',
+                             daemon=True).start()
+            self._pid = os.getpid()
+
+    def status(self):
+        """Return the cached ``(HTTP status, body)``"""
+        self.ensure_started()
+        return self._state
+
+    def stop(self):
+        with self._lock:
+            self._stopped = True
+            self._stop.set()
+            self._pid = None
@@ -0,0 +1,171 @@
+"""
+Idempotency-Key support: replay the first response to a retried request
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+MAX_KEY_LENGTH = 255
+
+# Rough per-entry bookkeeping (dict slot, tuple, key and fingerprint objects)
+# added to the key and body lengths when accounting memory use
+ENTRY_OVERHEAD = 256
+
+
+class IdempotencyError(Exception):
+    """A request's Idempotency-Key cannot be honoured; carries the HTTP status"""
+
+    status = 400
+
+
+class IdempotencyKeyInUse(IdempotencyError):
+    """The first request with this key is still being processed"""
+
+    status = 409
+
+    def __init__(self):
+        super().__init__("A request with this Idempotency-Key is already in progress")
+
+
+class IdempotencyKeyMismatch(IdempotencyError):
+    """The key was first used with a different request body"""
+
+    status = 422
+
+    def __init__(self):
+        super().__init__("Idempotency-Key was already used with a different request body")
+
+
+def request_fingerprint(body):
+    """Return a digest identifying the request ``body`` a key was first used with"""
+    return hashlib.blake2b(body, digest_size=16).digest()
+
+
+def check_key(key):
+    """Raise IdempotencyError unless ``key`` is an acceptable Idempotency-Key"""
+    if not key or len(key) > MAX_KEY_LENGTH:
+        raise IdempotencyError(f"Idempotency-Key must be 1 to {MAX_KEY_LENGTH} characters")
+
+
+class IdempotencyCache:
+    """LRU map of Idempotency-Key -> first (status, body), bounded by count, bytes and age
+
+    A key is reserved by ``begin`` while its first request runs and filled in
+    by ``complete``, or dropped by ``release`` if that request fails. Entries
+    expire ``ttl`` seconds after they are completed; least recently replayed
+    entries are evicted first once ``max_entries`` or ``max_bytes`` is
+    exceeded. A ``max_entries`` of 0 disables the cache.
+    """
+
+    def __init__(self, max_entries=10000, max_bytes=16 * 1024 * 1024, ttl=3600.0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._pending = set()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.replays = 0
+        self.evictions = {'capacity': 0, 'expired': 0}
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0
+
+    def begin(self, key, fingerprint, now=None):
+        """Return the cached ``(status, body)`` for ``key``, or None after reserving it
+
+        Raises IdempotencyKeyInUse while another request holds the key and
+        IdempotencyKeyMismatch if the key was used with a different body.
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if key in self._pending:
+                raise IdempotencyKeyInUse()
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= now:
+                self._remove(key, 'expired')
+                entry = None
+            if entry is None:
+                self._pending.add(key)
+                return None
+            _, stored_fingerprint, status, body, _ = entry
+            if stored_fingerprint != fingerprint:
+                raise IdempotencyKeyMismatch()
+            self._entries.move_to_end(key)
+            self.replays += 1
+            return status, body
+
+    def complete(self, key, fingerprint, status, body, now=None):
+        """Store the response to the request that reserved ``key``"""
+        now = time.monotonic() if now is None else now
+        size = len(key) + len(body) + ENTRY_OVERHEAD
+        with self._lock:
+            if key not in self._pending:
+                return
+            self._pending.discard(key)
+            self._entries[key] = (now + self.ttl, fingerprint, status, body, size)
+            self.bytes += size
+            self._evict(now)
+
+    def release(self, key):
+        """Drop the reservation on ``key`` so a retry can run the request again"""
+        with self._lock:
+            self._pending.discard(key)
+
+    def _remove(self, key, reason):
+        entry = self._entries.pop(key)
+        self.bytes -= entry[4]
+        self.evictions[reason] += 1
+
+    def _evict(self, now):
+        # Expiry and recency mostly agree, so expired entries are swept from
+        # the LRU end; any stragglers expire when they are next looked up
+        entries = self._entries
+        while entries:
+            key, entry = next(iter(entries.items()))
+            if entry[0] > now:
+                break
+            self._remove(key, 'expired')
+        while entries and (len(entries) > self.max_entries or self.bytes > self.max_bytes):
+            self._remove(next(iter(entries)), 'capacity')
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._pending.clear()
+            self.bytes = 0
+            self.replays = 0
+            self.evictions = {'capacity': 0, 'expired': 0}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def render_metrics(self):
+        """Return the cache's gauges and counters in Prometheus text format"""
+        with self._lock:
+            entries, size, replays = len(self._entries), self.bytes, self.replays
+            in_flight = len(self._pending)
+            evictions = sorted(self.evictions.items())
+        lines = [
+            "# HELP api_idempotency_entries Cached responses held for Idempotency-Key replays",
+            "# TYPE api_idempotency_entries gauge",
+            f"api_idempotency_entries {entries}",
+            "# HELP api_idempotency_in_flight Idempotency-Keys reserved by requests still running",
+            "# TYPE api_idempotency_in_flight gauge",
+            f"api_idempotency_in_flight {in_flight}",
+            "# HELP api_idempotency_bytes Approximate memory held by cached idempotent responses",
+            "# TYPE api_idempotency_bytes gauge",
+            f"api_idempotency_bytes {size}",
+            "# HELP api_idempotency_replays_total Requests answered from the idempotency cache",
+            "# TYPE api_idempotency_replays_total counter",
+            f"api_idempotency_replays_total {replays}",
+            "# HELP api_idempotency_evictions_total Idempotency entries evicted by reason",
+            "# TYPE api_idempotency_evictions_total counter",
+        ]
+        for reason, count in evictions:
+            lines.append(f'api_idempotency_evictions_total{{reason="{reason}"}} {count}')
+        return "\n".join(lines) + "\n"
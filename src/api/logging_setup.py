@@ -0,0 +1,117 @@
+"""
+Logging configuration for the API
+"""
+import atexit
+import os
+import logging
+import logging.handlers
+import queue
+import random
+
+from flask import has_request_context, request
+
+LOG_FORMAT = logging.BASIC_FORMAT
+
+_listener = None
+_settings = None
+# Root handlers installed by configure_logging; others are left alone
+_handlers = []
+
+
+def parse_sample_rates(spec):
+    """Parse ``"endpoint=rate,..."`` into a dict of endpoint -> float rate"""
+    rates = {}
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        endpoint, _, rate = item.partition('=')
+        rates[endpoint.strip()] = float(rate)
+    return rates
+
+
+class RouteSamplingFilter(logging.Filter):
+    """Keep only a sampled fraction of records logged while serving a route
+
+    Rates are keyed by Flask endpoint name (e.g. ``get_user``); records
+    logged outside a request, or for endpoints without a rate, always pass.
+    Warnings and errors are never sampled out.
+    """
+
+    def __init__(self, rates):
+        super().__init__()
+        self.rates = rates
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or not self.rates or not has_request_context():
+            return True
+        rate = self.rates.get(request.endpoint, 1.0)
+        return rate >= 1.0 or random.random() < rate
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that defers message formatting to the listener thread"""
+
+    def prepare(self, record):
+        return record
+
+
+def configure_logging(level='INFO', mode='queue', sample_rates=None):
+    """Install root handlers for ``mode``: ``queue``, ``sync`` or ``off``
+
+    In ``queue`` mode request threads only enqueue records; a
+    QueueListener thread formats them and writes to stderr. Calling it
+    again replaces the handlers it installed before; handlers added by
+    anyone else (pytest, an embedding application) are kept.
+    """
+    global _listener, _settings
+
+    _settings = (level, mode, sample_rates)
+    root = logging.getLogger()
+    stop_logging()
+    while _handlers:
+        root.removeHandler(_handlers.pop())
+
+    if mode == 'off':
+        _install(root, logging.NullHandler())
+        root.setLevel(logging.CRITICAL + 1)
+        return
+
+    root.setLevel(level)
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    if mode == 'sync':
+        handler = stream_handler
+    elif mode == 'queue':
+        log_queue = queue.SimpleQueue()
+        handler = LazyQueueHandler(log_queue)
+        _listener = logging.handlers.QueueListener(log_queue, stream_handler)
+        _listener.start()
+    else:
+        raise ValueError(f"Unknown log mode: {mode}")
+
+    handler.addFilter(RouteSamplingFilter(sample_rates or {}))
+    _install(root, handler)
+
+
+def _install(root, handler):
+    root.addHandler(handler)
+    _handlers.append(handler)
+
+
+def stop_logging():
+    """Flush and stop the queue listener, if one is running"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def _restart_listener_in_child():
+    """Give a forked worker its own listener; the parent's thread is not copied"""
+    global _listener
+    if _listener is not None:
+        _listener = None
+        configure_logging(*_settings)
+
+
+atexit.register(stop_logging)
+os.register_at_fork(after_in_child=_restart_listener_in_child)
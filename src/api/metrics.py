@@ -0,0 +1,139 @@
+"""
+In-process request metrics in Prometheus text format
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from flask import g, has_request_context, request
+from werkzeug.exceptions import HTTPException
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Route label for requests that match no URL rule
+UNMATCHED_ROUTE = 'unmatched'
+
+
+class _Histogram:
+    __slots__ = ('counts', 'total', 'count')
+
+    def __init__(self, size):
+        self.counts = [0] * size
+        self.total = 0.0
+        self.count = 0
+
+
+class RequestMetrics:
+    """Per-route, per-status request counters and fixed-bucket latency histograms"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._requests = {}
+        self._histograms = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def add_collector(self, render):
+        """Append the Prometheus text returned by ``render()`` to every ``render``"""
+        self._collectors.append(render)
+
+    def observe(self, route, status, duration):
+        """Record one request to ``route`` that returned ``status`` after ``duration`` seconds"""
+        bucket = bisect_left(self.buckets, duration)
+        key = (route, status)
+        with self._lock:
+            self._requests[key] = self._requests.get(key, 0) + 1
+            histogram = self._histograms.get(route)
+            if histogram is None:
+                histogram = self._histograms[route] = _Histogram(len(self.buckets) + 1)
+            histogram.counts[bucket] += 1
+            histogram.total += duration
+            histogram.count += 1
+
+    def render(self):
+        """Return all metrics in the Prometheus text exposition format"""
+        with self._lock:
+            requests = sorted(self._requests.items())
+            histograms = sorted(
+                (route, list(h.counts), h.total, h.count) for route, h in self._histograms.items())
+
+        lines = [
+            "# HELP api_requests_total Total HTTP requests by route and status code",
+            "# TYPE api_requests_total counter",
+        ]
+        for (route, status), count in requests:
+            lines.append(f'api_requests_total{{route="{route}",status="{status}"}} {count}')
+
+        lines += [
+            "# HELP api_request_duration_seconds Server-side request latency by route",
+            "# TYPE api_request_duration_seconds histogram",
+        ]
+        for route, counts, total, count in histograms:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(
+                    f'api_request_duration_seconds_bucket{{route="{route}",le="{bound}"}} {cumulative}')
+            lines.append(f'api_request_duration_seconds_bucket{{route="{route}",le="+Inf"}} {count}')
+            lines.append(f'api_request_duration_seconds_sum{{route="{route}"}} {total}')
+            lines.append(f'api_request_duration_seconds_count{{route="{route}"}} {count}')
+
+        return "\n".join(lines) + "\n" + "".join(render() for render in self._collectors)
+
+    def reset(self):
+        with self._lock:
+            self._requests.clear()
+            self._histograms.clear()
+
+
+def route_label(url_map, method, path):
+    """Return the route label ``instrument_app`` would record for a request
+
+    That is the matching URL rule template, e.g. ``/users/<int:user_id>``,
+    for requests answered before they reach Flask.
+    """
+    try:
+        rule, _ = url_map.bind('localhost').match(path, method, return_rule=True)
+    except HTTPException:
+        return UNMATCHED_ROUTE
+    return rule.rule
+
+
+@contextmanager
+def timed(phase):
+    """Add the time spent in the block to the request's ``phase`` Server-Timing entry"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if has_request_context() and 'server_timings' in g:
+            timings = g.server_timings
+            timings[phase] = timings.get(phase, 0.0) + time.perf_counter() - start
+
+
+def instrument_app(app, metrics):
+    """Time every request on ``app`` into ``metrics`` and add a Server-Timing header"""
+
+    @app.before_request
+    def _start_request_timer():
+        g.request_start = time.perf_counter()
+        g.server_timings = {}
+
+    @app.after_request
+    def _record_request_metrics(response):
+        start = g.get('request_start')
+        if start is None:
+            return response
+        duration = time.perf_counter() - start
+        route = request.url_rule.rule if request.url_rule is not None else UNMATCHED_ROUTE
+        metrics.observe(route, response.status_code, duration)
+
+        entries = [f"{phase};dur={seconds * 1000:.3f}" for phase, seconds in g.server_timings.items()]
+        entries.append(f"total;dur={duration * 1000:.3f}")
+        response.headers['Server-Timing'] = ", ".join(entries)
+        return response
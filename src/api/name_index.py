@@ -0,0 +1,115 @@
+"""
+Sorted index of user names for case-insensitive prefix search
+"""
+import sys
+import threading
+from bisect import bisect_left, bisect_right
+
+
+def normalize_name(name):
+    """Normalize a name (or name prefix) for case-insensitive matching"""
+    return name.casefold()
+
+
+def prefix_upper_bound(prefix):
+    """Return the smallest string greater than every string starting with ``prefix``
+
+    Trailing U+10FFFF characters cannot be incremented and are dropped
+    first; returns None when nothing is left, as no string bounds the
+    prefix from above.
+    """
+    prefix = prefix.rstrip(chr(sys.maxunicode))
+    if not prefix:
+        return None
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class NamePrefixIndex:
+    """Normalized name -> user ID index answering prefix queries in O(log n + k)
+
+    Keys are kept sorted in chunks of up to ``2 * load`` entries, alongside
+    the last key of every chunk, so an insert shifts one small list rather
+    than the whole index and a lookup is two binary searches. Keys and IDs
+    live in parallel lists, so no per-entry tuple is allocated. Users with
+    the same name come back in insertion (ID) order.
+    """
+
+    def __init__(self, load=512):
+        self._load = load
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._keys = []
+            self._ids = []
+            self._maxes = []
+            self._len = 0
+
+    def load(self, entries):
+        """Replace the index with ``(name, user_id)`` pairs in one sort"""
+        pairs = sorted((normalize_name(name), user_id) for name, user_id in entries)
+        keys = [key for key, _ in pairs]
+        ids = [user_id for _, user_id in pairs]
+        load = self._load
+        with self._lock:
+            self._keys = [keys[i:i + load] for i in range(0, len(keys), load)]
+            self._ids = [ids[i:i + load] for i in range(0, len(ids), load)]
+            self._maxes = [chunk[-1] for chunk in self._keys]
+            self._len = len(keys)
+
+    def add(self, name, user_id):
+        key = normalize_name(name)
+        with self._lock:
+            self._insert(key, user_id)
+
+    def add_many(self, entries):
+        """Add ``(name, user_id)`` pairs under a single lock acquisition"""
+        keyed = [(normalize_name(name), user_id) for name, user_id in entries]
+        with self._lock:
+            for key, user_id in keyed:
+                self._insert(key, user_id)
+
+    def _insert(self, key, user_id):
+        if not self._maxes:
+            self._keys.append([key])
+            self._ids.append([user_id])
+            self._maxes.append(key)
+            self._len = 1
+            return
+
+        chunk = min(bisect_right(self._maxes, key), len(self._maxes) - 1)
+        keys, ids = self._keys[chunk], self._ids[chunk]
+        at = bisect_right(keys, key)
+        keys.insert(at, key)
+        ids.insert(at, user_id)
+        self._maxes[chunk] = keys[-1]
+        self._len += 1
+
+        if len(keys) > 2 * self._load:
+            half = self._load
+            self._keys[chunk:chunk + 1] = [keys[:half], keys[half:]]
+            self._ids[chunk:chunk + 1] = [ids[:half], ids[half:]]
+            self._maxes[chunk:chunk + 1] = [keys[half - 1], keys[-1]]
+
+    def search(self, prefix, limit):
+        """Return up to ``limit`` IDs whose name starts with ``prefix``, ordered by name"""
+        prefix = normalize_name(prefix)
+        results = []
+        with self._lock:
+            chunk = bisect_left(self._maxes, prefix)
+            if chunk == len(self._maxes):
+                return results
+            at = bisect_left(self._keys[chunk], prefix)
+            while chunk < len(self._keys):
+                keys, ids = self._keys[chunk], self._ids[chunk]
+                for at in range(at, len(keys)):
+                    if len(results) >= limit or not keys[at].startswith(prefix):
+                        return results
+                    results.append(ids[at])
+                chunk += 1
+                at = 0
+        return results
+
+    def __len__(self):
+        return self._len
@@ -0,0 +1,51 @@
+"""
+Cache of pre-serialized JSON response bodies
+"""
+import hashlib
+import threading
+
+
+class ResponseCache:
+    """Bounded map of key -> (body bytes, strong ETag)
+
+    Entries are evicted oldest-first once ``max_entries`` is reached; a
+    ``max_entries`` of 0 disables caching entirely.
+    """
+
+    def __init__(self, max_entries=100000):
+        self.max_entries = max_entries
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_etag(body):
+        """Return a strong ETag value for ``body``"""
+        return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+    def get_or_build(self, key, build):
+        """Return the cached entry for ``key``, serializing it with ``build`` on a miss"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        body = build()
+        entry = (body, self.make_etag(body))
+        if self.max_entries > 0:
+            with self._lock:
+                while len(self._entries) >= self.max_entries:
+                    self._entries.pop(next(iter(self._entries)))
+                self._entries[key] = entry
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,80 @@
+"""
+Declarative request schemas compiled into fast validator functions
+"""
+
+# POST /users payload. Each field may declare:
+#   required - the key must be present ("Missing required field: <name>")
+#   type     - the value must be an instance of this type
+#   contains - the value must contain this substring
+#   message  - error returned when ``type`` or ``contains`` fails
+USER_SCHEMA = {
+    'name': {'required': True, 'type': str},
+    'email': {'required': True, 'type': str, 'contains': '@', 'message': 'Invalid email format'},
+}
+
+NOT_AN_OBJECT = "User record must be a JSON object"
+
+
+def _field_message(field, rules):
+    return rules.get('message', f"Invalid type for field: {field}")
+
+
+def _check_lines(schema, fail):
+    """Yield source lines validating ``data``; ``fail(expr)`` renders a failure"""
+    yield "if data.__class__ is not dict:"
+    yield f"    {fail(repr(NOT_AN_OBJECT))}"
+    # Required fields are checked first, in declaration order
+    for field, rules in schema.items():
+        if rules.get('required'):
+            yield f"if {field!r} not in data:"
+            yield f"    {fail(repr(f'Missing required field: {field}'))}"
+    for field, rules in schema.items():
+        conditions = []
+        if 'type' in rules:
+            conditions.append(f"not isinstance(value, _types[{field!r}])")
+        if 'contains' in rules:
+            conditions.append(f"{rules['contains']!r} not in value")
+        if not conditions:
+            continue
+        if rules.get('required'):
+            yield f"value = data[{field!r}]"
+            yield f"if {' or '.join(conditions)}:"
+        else:
+            yield f"if {field!r} in data:"
+            yield f"    value = data[{field!r}]"
+            yield f"    if {' or '.join(conditions)}:"
+            yield f"        {fail(repr(_field_message(field, rules)))}"
+            continue
+        yield f"    {fail(repr(_field_message(field, rules)))}"
+
+
+def _compile(source, schema, name):
+    namespace = {'_types': {field: rules['type'] for field, rules in schema.items() if 'type' in rules}}
+    exec(compile(source, f"<schema:{name}>", 'exec'), namespace)
+    return namespace[name]
+
+
+def compile_validator(schema):
+    """Compile ``schema`` into ``validate(data) -> error message or None``"""
+    lines = ["def validate(data):"]
+    lines += ["    " + line for line in _check_lines(schema, lambda expr: f"return {expr}")]
+    lines.append("    return None")
+    return _compile("\n".join(lines) + "\n", schema, 'validate')
+
+
+def compile_batch_validator(schema):
+    """Compile ``schema`` into ``validate_many(items) -> [error message or None, ...]``"""
+    lines = [
+        "def validate_many(items):",
+        "    results = []",
+        "    append = results.append",
+        "    for data in items:",
+    ]
+    fail = lambda expr: f"append({expr}); continue"  # noqa: E731
+    lines += ["        " + line for line in _check_lines(schema, fail)]
+    lines += ["        append(None)", "    return results"]
+    return _compile("\n".join(lines) + "\n", schema, 'validate_many')
+
+
+validate_user = compile_validator(USER_SCHEMA)
+validate_users = compile_batch_validator(USER_SCHEMA)
@@ -0,0 +1,107 @@
+"""
+Pre-forking multi-worker server for the users API
+
+Usage: USER_STORE=shared python -m src.api.serve --workers 4 --port 5000
+
+The parent binds one listening socket (with SO_REUSEPORT so another
+server generation can bind alongside it), then forks workers that all
+accept on it. Workers run a threaded werkzeug server. With more than one
+worker the configured store must be shared across processes (``shared``
+or ``sqlite``) so every worker sees every user.
+"""
+import argparse
+import os
+import signal
+import socket
+import sys
+
+from werkzeug.serving import make_server
+
+
+def bind_socket(host, port, backlog=1024):
+    """Create the shared listening socket"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if hasattr(socket, 'SO_REUSEPORT'):
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(sock, host, port):
+    """Serve requests on the inherited socket until terminated"""
+    from src.api import app
+
+    server = make_server(host, port, app, threaded=True, fd=sock.fileno())
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+def serve(host='0.0.0.0', port=5000, workers=None, ready=None):
+    """Fork ``workers`` processes serving the API on one socket; blocks until they exit
+
+    ``ready`` is called with the bound port once the socket is listening.
+    """
+    workers = workers or os.cpu_count() or 1
+
+    # Opening the store here also creates its file once, before workers race on it
+    from src.api import store
+    if workers > 1 and not store.shared_across_processes:
+        raise SystemExit(
+            f"{type(store).__name__} is private to each process; "
+            "set USER_STORE=shared or USER_STORE=sqlite to run multiple workers")
+
+    sock = bind_socket(host, port)
+    port = sock.getsockname()[1]
+
+    children = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            try:
+                run_worker(sock, host, port)
+            finally:
+                os._exit(0)
+        children.append(pid)
+
+    def _stop(signum, frame):
+        for child in children:
+            try:
+                os.kill(child, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+    if ready is not None:
+        ready(port)
+    print(f"Serving on http://{host}:{port} with {workers} workers (pid {os.getpid()})", flush=True)
+
+    for child in children:
+        while True:
+            try:
+                os.waitpid(child, 0)
+                break
+            except InterruptedError:
+                continue
+    sock.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-worker API server")
+    parser.add_argument("--host", default="0.0.0.0", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=int(os.getenv('FLASK_PORT', 5000)),
+                        help="Port to bind (0 picks a free port)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="Number of worker processes")
+    args = parser.parse_args()
+    serve(args.host, args.port, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""
+User store in a memory-mapped file shared by several worker processes
+"""
+import fcntl
+import mmap
+import os
+import struct
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+from src.api.compact_store import format_epoch_us, to_epoch_us
+from src.api.name_index import NamePrefixIndex
+from src.api.store import DuplicateEmailError, StoreFullError, UserStore, normalize_email
+
+_MAGIC = b'APIUSR01'
+# magic, generation, count, data_end, max_users, data_size
+_HEADER = struct.Struct('<8sQQQQQ')
+_HEADER_SIZE = 64
+_GENERATION_AT = 8
+_COUNT_AT = 16
+_DATA_END_AT = 24
+_OFFSET = struct.Struct('<Q')
+_U64 = struct.Struct('<Q')
+# created_at (epoch microseconds), name length, email length
+_RECORD = struct.Struct('<qII')
+
+# Sparse bytes reserved per user for names and emails
+DATA_BYTES_PER_USER = 256
+
+
+class SharedFileUserStore(UserStore):
+    """Append-only user log in an mmap'd file visible to every worker process
+
+    Layout: a fixed header, an offset slot per user ID, then packed
+    records. Writers serialise on a thread lock plus ``flock`` on the file;
+    readers only consult the published ``count`` and never lock. Each
+    process keeps its own hash -> row email index and name prefix index,
+    and catches up on records appended by other processes before every
+    write or search. ``reset`` bumps a generation counter so other
+    processes drop stale indexes.
+    """
+
+    shared_across_processes = True
+
+    def __init__(self, path, max_users=1000000):
+        self.path = path
+        self.max_users = max_users
+        self._pid = None
+        self._open()
+
+    def _open(self):
+        data_size = self.max_users * DATA_BYTES_PER_USER
+        size = _HEADER_SIZE + self.max_users * _OFFSET.size + data_size
+
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            header = os.pread(fd, _HEADER.size, 0)
+            if len(header) < _HEADER.size or header[:8] != _MAGIC:
+                os.ftruncate(fd, size)
+                os.pwrite(fd, _HEADER.pack(_MAGIC, 0, 0, 0, self.max_users, data_size), 0)
+            else:
+                _, _, _, _, self.max_users, data_size = _HEADER.unpack(header)
+                size = _HEADER_SIZE + self.max_users * _OFFSET.size + data_size
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+
+        self._fd = fd
+        self._map = mmap.mmap(fd, size)
+        self._data_start = _HEADER_SIZE + self.max_users * _OFFSET.size
+        self._data_size = data_size
+        self._lock = threading.Lock()
+        self._by_email_hash = {}
+        self._by_name = NamePrefixIndex()
+        self._indexed = 0
+        self._generation = None
+        self._pid = os.getpid()
+
+    def _ensure_open(self):
+        # A forked worker must not share the parent's file description,
+        # otherwise flock would not exclude it.
+        if self._pid != os.getpid():
+            self._open()
+
+    def _read_u64(self, at):
+        return _U64.unpack_from(self._map, at)[0]
+
+    def _write_u64(self, at, value):
+        _U64.pack_into(self._map, at, value)
+
+    def _record(self, row):
+        offset = self._data_start + _OFFSET.unpack_from(self._map, _HEADER_SIZE + row * _OFFSET.size)[0]
+        created_us, name_len, email_len = _RECORD.unpack_from(self._map, offset)
+        start = offset + _RECORD.size
+        name = self._map[start:start + name_len].decode('utf-8')
+        email = self._map[start + name_len:start + name_len + email_len].decode('utf-8')
+        return {
+            'id': row + 1,
+            'name': name,
+            'email': email,
+            'created_at': format_epoch_us(created_us)
+        }
+
+    def _index_row(self, row, email_key, name):
+        self._by_name.add(name, row + 1)
+        key_hash = hash(email_key)
+        existing = self._by_email_hash.get(key_hash)
+        if existing is None:
+            self._by_email_hash[key_hash] = row
+        elif isinstance(existing, int):
+            self._by_email_hash[key_hash] = (existing, row)
+        else:
+            self._by_email_hash[key_hash] = existing + (row,)
+
+    def _catch_up(self):
+        """Index records appended by other processes; caller holds the write lock"""
+        generation = self._read_u64(_GENERATION_AT)
+        if generation != self._generation:
+            self._by_email_hash = {}
+            self._by_name = NamePrefixIndex()
+            self._indexed = 0
+            self._generation = generation
+        count = self._read_u64(_COUNT_AT)
+        for row in range(self._indexed, count):
+            user = self._record(row)
+            self._index_row(row, normalize_email(user['email']), user['name'])
+        self._indexed = count
+
+    def _refresh_indexes(self):
+        """Catch up on other processes' writes before a read that uses the indexes"""
+        if (self._read_u64(_GENERATION_AT) != self._generation
+                or self._read_u64(_COUNT_AT) != self._indexed):
+            with self._locked():
+                self._catch_up()
+
+    def _find_email(self, email_key):
+        """Return the row registered with ``email_key`` or None"""
+        rows = self._by_email_hash.get(hash(email_key))
+        if rows is None:
+            return None
+        if isinstance(rows, int):
+            rows = (rows,)
+        for row in rows:
+            if normalize_email(self._record(row)['email']) == email_key:
+                return row
+        return None
+
+    def _write_record(self, row, data_end, created_us, name_bytes, email_bytes):
+        """Write record ``row`` at ``data_end`` without publishing it; return the new end"""
+        length = _RECORD.size + len(name_bytes) + len(email_bytes)
+        if row >= self.max_users or data_end + length > self._data_size:
+            raise StoreFullError(f"Shared user store {self.path} is full")
+
+        offset = self._data_start + data_end
+        _RECORD.pack_into(self._map, offset, created_us, len(name_bytes), len(email_bytes))
+        start = offset + _RECORD.size
+        self._map[start:start + len(name_bytes)] = name_bytes
+        self._map[start + len(name_bytes):start + length - _RECORD.size] = email_bytes
+        _OFFSET.pack_into(self._map, _HEADER_SIZE + row * _OFFSET.size, data_end)
+        return data_end + length
+
+    @contextmanager
+    def _locked(self):
+        """Exclude writers in this process (thread lock) and in others (flock)"""
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def create(self, name, email):
+        self._ensure_open()
+        email_key = normalize_email(email)
+        name_bytes = name.encode('utf-8')
+        email_bytes = email.encode('utf-8')
+        created_us = to_epoch_us(datetime.utcnow())
+
+        with self._locked():
+            self._catch_up()
+            if self._find_email(email_key) is not None:
+                raise DuplicateEmailError(email)
+
+            row = self._read_u64(_COUNT_AT)
+            data_end = self._write_record(
+                row, self._read_u64(_DATA_END_AT), created_us, name_bytes, email_bytes)
+
+            # Publish the record only after its bytes are in place
+            self._write_u64(_DATA_END_AT, data_end)
+            self._write_u64(_COUNT_AT, row + 1)
+            self._index_row(row, email_key, name)
+            self._indexed = row + 1
+
+        return {
+            'id': row + 1,
+            'name': name,
+            'email': email,
+            'created_at': format_epoch_us(created_us)
+        }
+
+    def get(self, user_id):
+        self._ensure_open()
+        if not 0 < user_id <= self._read_u64(_COUNT_AT):
+            return None
+        return self._record(user_id - 1)
+
+    def find_by_email(self, email):
+        self._ensure_open()
+        self._refresh_indexes()
+        row = self._find_email(normalize_email(email))
+        return None if row is None else self._record(row)
+
+    def search_names(self, prefix, limit=100):
+        self._ensure_open()
+        self._refresh_indexes()
+        users = (self.get(user_id) for user_id in self._by_name.search(prefix, limit))
+        return [user for user in users if user is not None]
+
+    def list_users(self, after_id=0, limit=100):
+        self._ensure_open()
+        start = max(after_id, 0)
+        end = min(self._read_u64(_COUNT_AT), start + limit)
+        return [self._record(row) for row in range(start, end)]
+
+    def reset(self):
+        self._ensure_open()
+        with self._locked():
+            self._write_u64(_COUNT_AT, 0)
+            self._write_u64(_DATA_END_AT, 0)
+            self._write_u64(_GENERATION_AT, self._read_u64(_GENERATION_AT) + 1)
+            self._catch_up()
+
+    def load(self, users):
+        """Replace every user; raises StoreFullError before touching the log if they do not fit"""
+        self._ensure_open()
+        records = [(to_epoch_us(datetime.fromisoformat(user['created_at'])),
+                    user['name'].encode('utf-8'), user['email'].encode('utf-8'))
+                   for user in users]
+        data_size = sum(_RECORD.size + len(name) + len(email) for _, name, email in records)
+        if len(records) > self.max_users or data_size > self._data_size:
+            raise StoreFullError(f"Shared user store {self.path} cannot hold "
+                                 f"{len(records)} users ({data_size} bytes)")
+        with self._locked():
+            # Empty the store for every process, then publish the new records at once
+            self._write_u64(_COUNT_AT, 0)
+            self._write_u64(_DATA_END_AT, 0)
+            self._write_u64(_GENERATION_AT, self._read_u64(_GENERATION_AT) + 1)
+            data_end = 0
+            for row, (created_us, name_bytes, email_bytes) in enumerate(records):
+                data_end = self._write_record(row, data_end, created_us, name_bytes, email_bytes)
+            self._write_u64(_DATA_END_AT, data_end)
+            self._write_u64(_COUNT_AT, len(records))
+            self._catch_up()
+
+    def close(self):
+        """Unmap the file and close its descriptor"""
+        self._map.close()
+        os.close(self._fd)
+
+    def __len__(self):
+        self._ensure_open()
+        return self._read_u64(_COUNT_AT)
@@ -0,0 +1,118 @@
+"""
+Binary snapshots of the user store, written and read through mmap
+"""
+import mmap
+import os
+import struct
+import sys
+from array import array
+from itertools import accumulate
+
+_MAGIC = b'APISNAP2'
+# magic, user count
+_HEADER = struct.Struct('<8sQ')
+_BLOB_SIZE = struct.Struct('<Q')
+# Stored as columns: for each field, ``count`` uint32 character lengths,
+# then the byte size and UTF-8 bytes of every value concatenated
+_FIELDS = ('name', 'email', 'created_at')
+
+
+class SnapshotError(ValueError):
+    """Raised for a missing, truncated or foreign snapshot file"""
+
+
+class SnapshotNotFoundError(SnapshotError):
+    """Raised when there is no snapshot file to read"""
+
+
+def _lengths_array(values):
+    lengths = array('I', map(len, values))
+    if sys.byteorder != 'little':
+        lengths.byteswap()
+    return lengths
+
+
+def write_snapshot(path, users):
+    """Write ``users`` (records with IDs 1..n, in ID order) to ``path``
+
+    IDs are implicit in record order. Each field is stored as a column of
+    character lengths followed by one UTF-8 blob, so a restore decodes a
+    whole column in one call instead of one call per user. The file is
+    built next to ``path`` and renamed into place, so readers never see a
+    partial snapshot. Returns ``(user count, file size)``.
+    """
+    for expected_id, user in enumerate(users, start=1):
+        if user['id'] != expected_id:
+            raise SnapshotError(f"User IDs must be dense; found {user['id']} at {expected_id}")
+
+    sections = []
+    for field in _FIELDS:
+        values = [user[field] for user in users]
+        sections.append((_lengths_array(values).tobytes(), ''.join(values).encode('utf-8')))
+    size = _HEADER.size + sum(len(lengths) + _BLOB_SIZE.size + len(blob)
+                              for lengths, blob in sections)
+
+    tmp_path = f"{path}.tmp"
+    fd = os.open(tmp_path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        os.ftruncate(fd, size)
+        with mmap.mmap(fd, size) as buf:
+            _HEADER.pack_into(buf, 0, _MAGIC, len(users))
+            offset = _HEADER.size
+            for lengths, blob in sections:
+                buf[offset:offset + len(lengths)] = lengths
+                offset += len(lengths)
+                _BLOB_SIZE.pack_into(buf, offset, len(blob))
+                offset += _BLOB_SIZE.size
+                buf[offset:offset + len(blob)] = blob
+                offset += len(blob)
+            buf.flush()
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, path)
+    return len(users), size
+
+
+def _read_column(buf, offset, count):
+    """Return ``(values, next offset)`` for the column starting at ``offset``"""
+    end = offset + 4 * count
+    if end + _BLOB_SIZE.size > len(buf):
+        raise SnapshotError("snapshot is truncated")
+    lengths = array('I')
+    lengths.frombytes(buf[offset:end])
+    if sys.byteorder != 'little':
+        lengths.byteswap()
+    (blob_size,) = _BLOB_SIZE.unpack_from(buf, end)
+    start = end + _BLOB_SIZE.size
+    if start + blob_size > len(buf):
+        raise SnapshotError("snapshot is truncated")
+    text = buf[start:start + blob_size].decode('utf-8')
+    bounds = list(accumulate(lengths, initial=0))
+    if bounds[-1] != len(text):
+        raise SnapshotError("snapshot column lengths do not match its data")
+    return [text[a:b] for a, b in zip(bounds, bounds[1:])], start + blob_size
+
+
+def read_snapshot(path):
+    """Return the user records stored in the snapshot at ``path``"""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except FileNotFoundError:
+        raise SnapshotNotFoundError(f"No snapshot at {path}") from None
+    try:
+        size = os.fstat(fd).st_size
+        if size < _HEADER.size:
+            raise SnapshotError(f"{path} is not a user snapshot")
+        with mmap.mmap(fd, size, access=mmap.ACCESS_READ) as buf:
+            magic, count = _HEADER.unpack_from(buf, 0)
+            if magic != _MAGIC:
+                raise SnapshotError(f"{path} is not a user snapshot")
+            offset = _HEADER.size
+            columns = []
+            for _ in _FIELDS:
+                values, offset = _read_column(buf, offset, count)
+                columns.append(values)
+    finally:
+        os.close(fd)
+    return [{'id': user_id, 'name': name, 'email': email, 'created_at': created_at}
+            for user_id, name, email, created_at in zip(range(1, count + 1), *columns)]
@@ -0,0 +1,236 @@
+"""
+SQLite-backed user store
+"""
+import os
+import queue
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+
+from src.api.name_index import normalize_name, prefix_upper_bound
+from src.api.store import DuplicateEmailError, UserStore, normalize_email
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    email TEXT NOT NULL,
+    email_key TEXT NOT NULL UNIQUE,
+    created_at TEXT NOT NULL,
+    name_key TEXT NOT NULL DEFAULT ''
+)
+"""
+_NAME_INDEX = "CREATE INDEX IF NOT EXISTS users_name_key ON users (name_key)"
+
+# Statements are kept as module constants so every connection's statement
+# cache reuses the same prepared statement.
+_INSERT_USER = ("INSERT INTO users (name, email, email_key, created_at, name_key) "
+                "VALUES (?, ?, ?, ?, ?)")
+_LOAD_USER = ("INSERT INTO users (id, name, email, email_key, created_at, name_key) "
+              "VALUES (?, ?, ?, ?, ?, ?)")
+_SELECT_USER = "SELECT id, name, email, created_at FROM users WHERE id = ?"
+_SELECT_USERS_IN = "SELECT id, name, email, created_at FROM users WHERE id IN ({})"
+_SELECT_BY_EMAIL = "SELECT id, name, email, created_at FROM users WHERE email_key = ?"
+_SEARCH_NAMES = ("SELECT id, name, email, created_at FROM users "
+                 "WHERE name_key >= ? AND name_key < ? ORDER BY name_key, id LIMIT ?")
+_SEARCH_NAMES_UNBOUNDED = ("SELECT id, name, email, created_at FROM users "
+                           "WHERE name_key >= ? ORDER BY name_key, id LIMIT ?")
+_LIST_BY_NAME = "SELECT id, name, email, created_at FROM users ORDER BY name_key, id LIMIT ?"
+_LIST_USERS = "SELECT id, name, email, created_at FROM users WHERE id > ? ORDER BY id LIMIT ?"
+_COUNT_USERS = "SELECT COUNT(*) FROM users"
+_DELETE_USERS = "DELETE FROM users"
+
+# Stay under SQLITE_MAX_VARIABLE_NUMBER (999 before SQLite 3.32)
+_MAX_IN_PARAMS = 500
+
+
+def _row_to_user(row):
+    return {'id': row[0], 'name': row[1], 'email': row[2], 'created_at': row[3]}
+
+
+class SQLiteUserStore(UserStore):
+    """Persistent store drawing connections from a bounded pool
+
+    Each operation borrows an idle connection, opening one if none is
+    free, and hands it back afterwards; at most ``pool_size`` idle
+    connections are kept, extras are closed. Request threads come and go
+    without leaking connections.
+
+    The database runs in WAL mode so readers never block the writer.
+    ``email_key`` carries a UNIQUE index that backs the duplicate check and
+    email lookups; the casefolded ``name_key`` is indexed for prefix search.
+    """
+
+    shared_across_processes = True
+
+    def __init__(self, path, timeout=30.0, pool_size=8):
+        self.path = path
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+        self._pid = os.getpid()
+        self.connections_opened = 0
+
+        with self._connection() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_SCHEMA)
+            self._migrate(conn)
+            conn.execute(_NAME_INDEX)
+
+    @staticmethod
+    def _migrate(conn):
+        """Add and backfill ``name_key`` in databases created before it existed"""
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(users)")}
+        if 'name_key' in columns:
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("ALTER TABLE users ADD COLUMN name_key TEXT NOT NULL DEFAULT ''")
+            rows = conn.execute("SELECT id, name FROM users").fetchall()
+            conn.executemany("UPDATE users SET name_key = ? WHERE id = ?",
+                             [(normalize_name(name), user_id) for user_id, name in rows])
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _open(self):
+        conn = sqlite3.connect(
+            self.path,
+            timeout=self.timeout,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=32
+        )
+        conn.execute("PRAGMA synchronous=NORMAL")
+        self.connections_opened += 1
+        return conn
+
+    @contextmanager
+    def _connection(self):
+        """Borrow a pooled connection for the block, opening one if none is idle"""
+        if self._pid != os.getpid():
+            # Connections must not cross a fork; a worker opens its own pool
+            self._pool = queue.LifoQueue(maxsize=self.pool_size)
+            self._pid = os.getpid()
+        pool = self._pool
+        try:
+            conn = pool.get_nowait()
+        except queue.Empty:
+            conn = self._open()
+        try:
+            yield conn
+        finally:
+            try:
+                pool.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+    def _insert(self, conn, name, email):
+        created_at = datetime.utcnow().isoformat()
+        try:
+            cursor = conn.execute(
+                _INSERT_USER,
+                (name, email, normalize_email(email), created_at, normalize_name(name)))
+        except sqlite3.IntegrityError:
+            raise DuplicateEmailError(email) from None
+        return {
+            'id': cursor.lastrowid,
+            'name': name,
+            'email': email,
+            'created_at': created_at
+        }
+
+    def create(self, name, email):
+        with self._connection() as conn:
+            return self._insert(conn, name, email)
+
+    def create_many(self, records):
+        """Insert all records in a single write transaction"""
+        results = []
+        with self._connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for name, email in records:
+                    try:
+                        results.append(self._insert(conn, name, email))
+                    except DuplicateEmailError as e:
+                        results.append(e)
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        return results
+
+    def get(self, user_id):
+        with self._connection() as conn:
+            row = conn.execute(_SELECT_USER, (user_id,)).fetchone()
+        if row is None:
+            return None
+        return _row_to_user(row)
+
+    def get_many(self, user_ids):
+        """Fetch the users with one ``IN`` query per 500 IDs"""
+        found = {}
+        with self._connection() as conn:
+            for start in range(0, len(user_ids), _MAX_IN_PARAMS):
+                chunk = user_ids[start:start + _MAX_IN_PARAMS]
+                query = _SELECT_USERS_IN.format(','.join('?' * len(chunk)))
+                for row in conn.execute(query, chunk):
+                    found[row[0]] = _row_to_user(row)
+        return [found.get(user_id) for user_id in user_ids]
+
+    def find_by_email(self, email):
+        with self._connection() as conn:
+            row = conn.execute(_SELECT_BY_EMAIL, (normalize_email(email),)).fetchone()
+        if row is None:
+            return None
+        return _row_to_user(row)
+
+    def search_names(self, prefix, limit=100):
+        prefix = normalize_name(prefix)
+        with self._connection() as conn:
+            upper = prefix_upper_bound(prefix) if prefix else None
+            if upper is not None:
+                rows = conn.execute(_SEARCH_NAMES, (prefix, upper, limit)).fetchall()
+            elif prefix:
+                rows = conn.execute(_SEARCH_NAMES_UNBOUNDED, (prefix, limit)).fetchall()
+            else:
+                rows = conn.execute(_LIST_BY_NAME, (limit,)).fetchall()
+        return [_row_to_user(row) for row in rows]
+
+    def list_users(self, after_id=0, limit=100):
+        with self._connection() as conn:
+            rows = conn.execute(_LIST_USERS, (after_id, limit)).fetchall()
+        return [_row_to_user(row) for row in rows]
+
+    def reset(self):
+        with self._connection() as conn:
+            conn.execute(_DELETE_USERS)
+
+    def load(self, users):
+        """Replace the table contents in a single write transaction"""
+        with self._connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(_DELETE_USERS)
+                conn.executemany(_LOAD_USER, (
+                    (user['id'], user['name'], user['email'], normalize_email(user['email']),
+                     user['created_at'], normalize_name(user['name']))
+                    for user in users))
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def close(self):
+        """Close every idle pooled connection"""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def __len__(self):
+        with self._connection() as conn:
+            return conn.execute(_COUNT_USERS).fetchone()[0]
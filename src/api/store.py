@@ -0,0 +1,240 @@
+"""
+User storage engines for the API
+"""
+import threading
+from datetime import datetime
+
+from src.api.name_index import NamePrefixIndex
+
+
+def normalize_email(email):
+    """Normalize an email address for case-insensitive lookups"""
+    return email.strip().lower()
+
+
+class DuplicateEmailError(Exception):
+    """Raised when creating a user whose email is already registered"""
+
+
+class StoreFullError(RuntimeError):
+    """Raised when a fixed-capacity store has no room for more users"""
+
+
+class UserStore:
+    """Interface the route handlers use to read and write users"""
+
+    # Whether separate worker processes opening the store see the same users
+    shared_across_processes = False
+
+    def create(self, name, email):
+        """Create a user and return its record, or raise DuplicateEmailError"""
+        raise NotImplementedError
+
+    def create_many(self, records):
+        """Create users from ``(name, email)`` pairs
+
+        Returns one entry per pair, in order: the new user record, or the
+        DuplicateEmailError instance for a rejected email.
+        """
+        results = []
+        for name, email in records:
+            try:
+                results.append(self.create(name, email))
+            except DuplicateEmailError as e:
+                results.append(e)
+        return results
+
+    def get(self, user_id):
+        """Return the user record for ``user_id`` or None"""
+        raise NotImplementedError
+
+    def get_many(self, user_ids):
+        """Return the user record or None for each of ``user_ids``, in order"""
+        return [self.get(user_id) for user_id in user_ids]
+
+    def find_by_email(self, email):
+        """Return the user registered with ``email`` (case-insensitive) or None"""
+        raise NotImplementedError
+
+    def search_names(self, prefix, limit=100):
+        """Return up to ``limit`` users whose name starts with ``prefix`` (case-insensitive)
+
+        Results are ordered by normalized name, then ID.
+        """
+        raise NotImplementedError
+
+    def list_users(self, after_id=0, limit=100):
+        """Return up to ``limit`` users with IDs greater than ``after_id``, in ID order"""
+        raise NotImplementedError
+
+    def iter_users(self, after_id=0, page_size=1000):
+        """Yield every user after ``after_id`` in ID order, one page at a time"""
+        while True:
+            page = self.list_users(after_id, page_size)
+            yield from page
+            if len(page) < page_size:
+                return
+            after_id = page[-1]['id']
+
+    def reset(self):
+        """Remove every user and restart ID allocation at 1"""
+        raise NotImplementedError
+
+    def load(self, users):
+        """Replace every user with ``users``: full records with IDs 1..n, in ID order
+
+        The next created user gets ID n + 1.
+        """
+        raise NotImplementedError
+
+    def __len__(self):
+        raise NotImplementedError
+
+
+class InMemoryUserStore(UserStore):
+    """Thread-safe dict-backed store
+
+    Email uniqueness is enforced under one of ``stripes`` locks chosen by
+    the email's hash, so writers with different emails rarely contend.
+    ID allocation and insertion share one short critical section, which
+    keeps IDs dense and lets listings walk them without sorting.
+    """
+
+    def __init__(self, stripes=64):
+        self._users = {}
+        self._by_email = {}
+        self._by_name = NamePrefixIndex()
+        self._stripes = [threading.Lock() for _ in range(stripes)]
+        self._id_lock = threading.Lock()
+        self._next_id = 1
+
+    def _stripe_for(self, email_key):
+        return self._stripes[hash(email_key) % len(self._stripes)]
+
+    def create(self, name, email):
+        email_key = normalize_email(email)
+        with self._stripe_for(email_key):
+            if email_key in self._by_email:
+                raise DuplicateEmailError(email)
+
+            with self._id_lock:
+                user_id = self._next_id
+                user = {
+                    'id': user_id,
+                    'name': name,
+                    'email': email,
+                    'created_at': datetime.utcnow().isoformat()
+                }
+                self._users[user_id] = user
+                self._next_id += 1
+            self._by_email[email_key] = user_id
+            self._by_name.add(name, user_id)
+        return user
+
+    def create_many(self, records):
+        """Create the whole batch under every stripe lock, taken once
+
+        Concurrent single creates wait for the batch, but each record skips
+        two lock round-trips and the name index is updated in one pass.
+        """
+        results = []
+        created = []
+        for lock in self._stripes:
+            lock.acquire()
+        try:
+            with self._id_lock:
+                users, by_email = self._users, self._by_email
+                user_id = self._next_id
+                for name, email in records:
+                    email_key = normalize_email(email)
+                    if email_key in by_email:
+                        results.append(DuplicateEmailError(email))
+                        continue
+                    user = {
+                        'id': user_id,
+                        'name': name,
+                        'email': email,
+                        'created_at': datetime.utcnow().isoformat()
+                    }
+                    users[user_id] = user
+                    by_email[email_key] = user_id
+                    created.append((name, user_id))
+                    results.append(user)
+                    user_id += 1
+                self._next_id = user_id
+                self._by_name.add_many(created)
+        finally:
+            for lock in self._stripes:
+                lock.release()
+        return results
+
+    def get(self, user_id):
+        return self._users.get(user_id)
+
+    def find_by_email(self, email):
+        user_id = self._by_email.get(normalize_email(email))
+        return None if user_id is None else self._users.get(user_id)
+
+    def search_names(self, prefix, limit=100):
+        users = (self._users.get(user_id) for user_id in self._by_name.search(prefix, limit))
+        return [user for user in users if user is not None]
+
+    def list_users(self, after_id=0, limit=100):
+        users = []
+        user_id = max(after_id, 0) + 1
+        end = self._next_id
+        while user_id < end and len(users) < limit:
+            user = self._users.get(user_id)
+            if user is not None:
+                users.append(user)
+            user_id += 1
+        return users
+
+    def reset(self):
+        for lock in self._stripes:
+            lock.acquire()
+        try:
+            with self._id_lock:
+                self._users.clear()
+                self._by_email.clear()
+                self._by_name.clear()
+                self._next_id = 1
+        finally:
+            for lock in self._stripes:
+                lock.release()
+
+    def load(self, users):
+        users = {user['id']: user for user in users}
+        by_email = {normalize_email(user['email']): user_id for user_id, user in users.items()}
+        by_name = NamePrefixIndex()
+        by_name.load((user['name'], user_id) for user_id, user in users.items())
+        for lock in self._stripes:
+            lock.acquire()
+        try:
+            with self._id_lock:
+                self._users = users
+                self._by_email = by_email
+                self._by_name = by_name
+                self._next_id = len(users) + 1
+        finally:
+            for lock in self._stripes:
+                lock.release()
+
+    def __len__(self):
+        return len(self._users)
+
+
+def create_store(config):
+    """Build the user store selected by ``config.USER_STORE``"""
+    if config.USER_STORE == 'sqlite':
+        from src.api.sqlite_store import SQLiteUserStore
+        return SQLiteUserStore(config.SQLITE_PATH)
+    if config.USER_STORE == 'compact':
+        from src.api.compact_store import CompactUserStore
+        return CompactUserStore()
+    if config.USER_STORE == 'shared':
+        from src.api.shared_store import SharedFileUserStore
+        return SharedFileUserStore(config.SHARED_STORE_PATH, config.SHARED_STORE_MAX_USERS)
+    if config.USER_STORE == 'memory':
+        return InMemoryUserStore()
+    raise ValueError(f"Unknown user store: {config.USER_STORE}")
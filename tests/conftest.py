@@ -1,35 +1,63 @@
+import asyncio
+import functools
+import json as _json
 import pytest
 import requests
 import subprocess
+import tempfile
 import time
 import os
 import sys
 from threading import Thread
+from urllib.parse import urlencode, urlsplit
+
+from requests.structures import CaseInsensitiveDict
+from werkzeug.test import create_environ
+
+# Keep /admin/snapshot output out of the working tree, in-process and in the server
+os.environ.setdefault('SNAPSHOT_PATH', os.path.join(tempfile.gettempdir(), 'api-tests.snapshot'))
+# Let tests drive /admin/faults, in-process and in the server
+os.environ.setdefault('FAULT_INJECTION', 'true')
+
+from config.config import get_config  # noqa: E402
+from src.api.schema import NOT_AN_OBJECT, USER_SCHEMA, validate_user  # noqa: E402
+from utils.async_client import AsyncAPIClient  # noqa: E402
+from utils.live_server import LiveServer, wait_for_port  # noqa: E402
+from utils.wsgi_adapter import wsgi_session  # noqa: E402
+
+# Server the local-mode tests talk to; run_tests.py --workers gives each worker its own
+TEST_API_URL = os.getenv('TEST_API_URL', 'http://localhost:5000')
+
+# How local runs reach the API when no server is running: wsgi (in-process,
+# no sockets), inprocess (background server thread) or subprocess
+TEST_SERVER_MODE = os.getenv('TEST_SERVER_MODE', 'wsgi')
+
+# Base URL whose requests the WSGI adapter hands straight to the app
+WSGI_BASE_URL = 'http://testserver'
 
 # Global variable to track the server process
 server_process = None
 
 
 def start_flask_app():
-    """Start the Flask app in a separate process"""
+    """Start the Flask app in a separate process; return True once it accepts connections"""
     global server_process
     try:
+        url = urlsplit(TEST_API_URL)
         env = os.environ.copy()
         env['FLASK_DEBUG'] = 'False'
-        env['FLASK_PORT'] = '5000'
+        env['FLASK_PORT'] = str(url.port or 80)
         env['PYTHONPATH'] = os.getcwd()
 
+        # Nobody reads the server's output; a pipe would fill up and stall it
         server_process = subprocess.Popen(
             [sys.executable, 'src/api/app.py'],
             env=env,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
         )
 
-        # Wait for server to start
-        time.sleep(3)
-        return True
+        return wait_for_port(url.hostname, url.port or 80, timeout=30)
     except Exception as e:
         print(f"Failed to start Flask app: {e}")
         return False
@@ -44,7 +72,13 @@ def stop_flask_app():
         server_process = None
 
 
-def is_server_running(base_url='http://localhost:5000'):
+def start_inprocess_app():
+    """Serve the Flask app on a background thread on a free port; return the LiveServer"""
+    from src.api.app import app
+    return LiveServer(app).start()
+
+
+def is_server_running(base_url=TEST_API_URL):
     """Check if the server is running"""
     try:
         response = requests.get(f'{base_url}/health', timeout=2)
@@ -55,102 +89,227 @@ def is_server_running(base_url='http://localhost:5000'):
 
 @pytest.fixture(scope='session')
 def flask_server():
-    """Start and stop Flask server for tests - only if not in CI"""
-    # In CI, we use the test client directly, no need for external server
+    """Base URL of the API server, or None when requests go to the app in-process"""
+    # In CI, we call the app directly, no need for external server
     if os.getenv('CI') == 'true':
-        print("Running in CI environment - using test client")
-        yield
+        print("Running in CI environment - calling the app in-process")
+        yield None
         return
 
-    # Local development - start actual server
-    print("Starting Flask server for local testing...")
-    if not start_flask_app():
-        pytest.skip("Could not start Flask server")
-
-    # Wait for server to be ready
-    max_attempts = 10
-    for i in range(max_attempts):
-        if is_server_running():
-            print("Flask server is ready!")
-            break
-        print(f"Waiting for server... attempt {i+1}/{max_attempts}")
-        time.sleep(1)
-    else:
-        pytest.skip("Flask server failed to start within timeout")
+    # Use an already running server, e.g. one per run_tests.py worker
+    if is_server_running():
+        yield TEST_API_URL
+        return
 
-    yield
+    if TEST_SERVER_MODE == 'wsgi':
+        yield None
+        return
 
-    print("Stopping Flask server...")
-    stop_flask_app()
+    start = time.perf_counter()
+    if TEST_SERVER_MODE == 'subprocess':
+        print("Starting Flask server for local testing...")
+        if not start_flask_app():
+            stop_flask_app()
+            pytest.skip("Flask server failed to start within timeout")
+        print(f"Flask server is ready in {time.perf_counter() - start:.3f}s")
+        yield TEST_API_URL
+        print("Stopping Flask server...")
+        stop_flask_app()
+    else:
+        server = start_inprocess_app()
+        print(f"In-process Flask server is ready on {server.url} "
+              f"in {time.perf_counter() - start:.3f}s")
+        yield server.url
+        server.stop()
 
 
 @pytest.fixture
-def base_url():
+def base_url(flask_server):
     """Base URL for API requests"""
-    if os.getenv('CI') == 'true':
-        # In CI, we'll use the test client directly
-        return 'http://testserver'
-    return 'http://localhost:5000'
+    return flask_server or WSGI_BASE_URL
+
+
+class ResponseWrapper:
+    """requests-like view of a response produced in-process"""
+
+    def __init__(self, status_code, headers, body):
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers)
+        self.content = body
+
+    def json(self):
+        return _json.loads(self.text)
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8')
+
+
+async def _asgi_request(app, method, endpoint, json=None, data=None, headers=None, **kwargs):
+    """Send one request through an ASGI app and collect the response"""
+    path, _, query = endpoint.partition('?')
+    headers = dict(headers or {})
+    if json:
+        body = _json.dumps(json).encode('utf-8')
+        headers.setdefault('Content-Type', 'application/json')
+    elif isinstance(data, dict):
+        body = urlencode(data).encode('utf-8')
+        headers.setdefault('Content-Type', 'application/x-www-form-urlencoded')
+    elif isinstance(data, str):
+        body = data.encode('utf-8')
+    else:
+        body = data or b''
+
+    scope = {
+        'type': 'http',
+        'http_version': '1.1',
+        'method': method.upper(),
+        'scheme': 'http',
+        'path': path,
+        'root_path': '',
+        'query_string': query.encode('latin-1'),
+        'headers': [(k.lower().encode('latin-1'), str(v).encode('latin-1'))
+                    for k, v in headers.items()],
+        'server': ('testserver', 80),
+        'client': ('127.0.0.1', 12345),
+    }
+    request_messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+    status = None
+    response_headers = []
+    chunks = []
+
+    async def receive():
+        if request_messages:
+            return request_messages.pop()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        nonlocal status, response_headers
+        if message['type'] == 'http.response.start':
+            status = message['status']
+            response_headers = [(k.decode('latin-1'), v.decode('latin-1'))
+                                for k, v in message.get('headers', [])]
+        elif message['type'] == 'http.response.body':
+            chunks.append(message.get('body', b''))
+
+    await app(scope, receive, send)
+    return ResponseWrapper(status, response_headers, b''.join(chunks))
+
+
+def _wsgi_call(app, method='GET', path='/', headers=None, client='127.0.0.1'):
+    """Invoke a WSGI app directly and return (status code, headers, body)"""
+    captured = {}
+
+    def start_response(status, response_headers, exc_info=None):
+        captured['status'] = int(status.split()[0])
+        captured['headers'] = dict(response_headers)
+
+    environ = create_environ(path, method=method, headers=headers)
+    environ['REMOTE_ADDR'] = client
+    result = app(environ, start_response)
+    try:
+        body = b''.join(result)
+    finally:
+        if hasattr(result, 'close'):
+            result.close()
+    return captured['status'], captured['headers'], body
+
+
+def _ok_app(environ, start_response):
+    start_response('200 OK', [('Content-Type', 'text/plain')])
+    return [b'ok']
 
 
 @pytest.fixture
-def api_client(base_url):
-    """API client for making requests"""
-    if os.getenv('CI') == 'true':
-        # In CI, use Flask test client
+def wsgi_call():
+    """Call a WSGI app in-process: ``wsgi_call(app, method, path, headers, client)``"""
+    return _wsgi_call
+
+
+@pytest.fixture
+def ok_app():
+    """WSGI app answering every request with 200 ``ok``"""
+    return _ok_app
+
+
+@pytest.fixture
+def asgi_call():
+    """Send one request through an ASGI app: ``asgi_call(app, method, endpoint, **kwargs)``"""
+    def _call(app, method, endpoint, **kwargs):
+        return asyncio.run(_asgi_request(app, method, endpoint, **kwargs))
+    return _call
+
+
+@pytest.fixture
+def api_client(flask_server, base_url):
+    """API client for making requests: ``api_client(method, endpoint, **kwargs)``
+
+    Calls take requests' keyword arguments and return ``requests.Response``
+    objects. Without a server, the session's WSGI adapter hands requests
+    to the Flask app in-process instead of opening a socket.
+    """
+    if os.getenv('CI') == 'true' and os.getenv('API_VARIANT') == 'asgi':
+        # In CI, drive the ASGI variant in-process
+        from src.api.asgi import app
+
+        def _make_request(method, endpoint, **kwargs):
+            return asyncio.run(_asgi_request(app, method, endpoint, **kwargs))
+
+        yield _make_request
+        return
+
+    if flask_server is None:
         from src.api.app import app
-        with app.test_client() as client:
-            def _make_request(method, endpoint, **kwargs):
-                # Convert requests-like API to Flask test client API
-                method = method.lower()
-                flask_method = getattr(client, method)
-
-                # Handle JSON data
-                json_data = kwargs.get('json')
-                if json_data:
-                    response = flask_method(
-                        endpoint,
-                        json=json_data,
-                        headers=kwargs.get('headers', {})
-                    )
-                else:
-                    response = flask_method(
-                        endpoint,
-                        data=kwargs.get('data'),
-                        headers=kwargs.get('headers', {})
-                    )
-
-                # Convert Flask response to requests-like response
-                class ResponseWrapper:
-                    def __init__(self, flask_response):
-                        self.status_code = flask_response.status_code
-                        self.headers = dict(flask_response.headers)
-                        self._flask_response = flask_response
-
-                    def json(self):
-                        import json
-                        return json.loads(self._flask_response.data.decode('utf-8'))
-
-                    @property
-                    def text(self):
-                        return self._flask_response.data.decode('utf-8')
-
-                return ResponseWrapper(response)
-
-            yield _make_request
+        session = wsgi_session(app, base_url)
     else:
-        # Local development - use requests
         session = requests.Session()
-        session.timeout = 10
 
-        def _make_request(method, endpoint, **kwargs):
-            url = f"{base_url}{endpoint}"
-            print(f"Making {method} request to {url}")
-            response = session.request(method, url, **kwargs)
-            print(f"Response status: {response.status_code}")
-            return response
+    def _make_request(method, endpoint, **kwargs):
+        return session.request(method, f"{base_url}{endpoint}", **kwargs)
 
-        yield _make_request
+    yield _make_request
+    session.close()
+
+
+class InProcessAsyncClient:
+    """async_api_client counterpart of AsyncAPIClient for in-process apps"""
+
+    def __init__(self, send, timeout):
+        self._send = send
+        self.timeout = timeout
+
+    async def __call__(self, method, endpoint, timeout=None, **kwargs):
+        return await asyncio.wait_for(self._send(method, endpoint, **kwargs),
+                                      self.timeout if timeout is None else timeout)
+
+    def run(self, coro):
+        return asyncio.run(coro)
+
+
+@pytest.fixture
+def async_api_client(flask_server, base_url, api_client):
+    """Asyncio API client: ``await async_api_client(method, endpoint, **kwargs)``
+
+    Run coroutines with ``async_api_client.run(coro)``. Against a local
+    server requests share a bounded keep-alive connection pool, so a test
+    can have thousands in flight at once.
+    """
+    timeout = get_config().TIMEOUT
+    if os.getenv('CI') == 'true' and os.getenv('API_VARIANT') == 'asgi':
+        # In CI, drive the ASGI variant in-process on the caller's event loop
+        from src.api.asgi import app
+        yield InProcessAsyncClient(functools.partial(_asgi_request, app), timeout)
+    elif flask_server is None:
+        # Without a server, run in-process api_client calls on the event loop's thread pool
+        async def _send(method, endpoint, **kwargs):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                None, functools.partial(api_client, method, endpoint, **kwargs))
+
+        yield InProcessAsyncClient(_send, timeout)
+    else:
+        client = AsyncAPIClient(base_url, max_connections=100, timeout=timeout)
+        yield client
 
 
 @pytest.fixture
@@ -158,7 +317,37 @@ def unique_user_data():
     """Generate unique user data for each test"""
     import time
     timestamp = int(time.time() * 1000)
-    return {
+    data = {
         "name": f"Test User {timestamp}",
         "email": f"test{timestamp}@example.com"
     }
+    assert validate_user(data) is None, "Generated user data violates USER_SCHEMA"
+    return data
+
+
+def generate_invalid_payloads(schema, valid):
+    """Derive ``(payload, expected error)`` cases from a valid payload
+
+    Each case breaks exactly one rule of ``schema``: a dropped required
+    field, a value of the wrong type, or a value missing a required
+    substring.
+    """
+    cases = [([valid], NOT_AN_OBJECT)]
+    for field, rules in schema.items():
+        message = rules.get('message', f"Invalid type for field: {field}")
+        if rules.get('required'):
+            payload = dict(valid)
+            del payload[field]
+            cases.append((payload, f"Missing required field: {field}"))
+        if 'type' in rules:
+            cases.append(({**valid, field: 12345 if rules['type'] is str else "12345"}, message))
+        if 'contains' in rules:
+            broken = valid[field].replace(rules['contains'], '')
+            cases.append(({**valid, field: broken}, message))
+    return cases
+
+
+@pytest.fixture
+def invalid_user_payloads(unique_user_data):
+    """(payload, expected error) pairs that each break one USER_SCHEMA rule"""
+    return generate_invalid_payloads(USER_SCHEMA, unique_user_data)
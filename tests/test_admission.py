@@ -0,0 +1,160 @@
+import json
+
+import pytest
+from flask import Flask
+
+from src.api.admission import (AdmissionController, AdmissionMiddleware, TokenBucket,
+                               parse_route_limits, route_key)
+from src.api.metrics import RequestMetrics, instrument_app
+
+
+@pytest.mark.unit
+class TestTokenBucket:
+    """Test cases for token bucket refill and rate limiting"""
+
+    def test_burst_then_refill(self):
+        """Test a full bucket allows a burst, then refills at the configured rate"""
+        bucket = TokenBucket(rate=10, burst=2, now=0.0)
+
+        assert bucket.take(0.0) == 0
+        assert bucket.take(0.0) == 0
+        assert bucket.take(0.0) == pytest.approx(0.1)
+        assert bucket.take(0.1) == 0
+
+    def test_parse_route_limits(self):
+        """Test route limit specs parse into rate and burst"""
+        assert parse_route_limits("POST /users=5/10, GET /users/<id>=100") == {
+            'POST /users': (5.0, 10.0), 'GET /users/<id>': (100.0, 100.0)}
+        assert route_key('GET', '/users/42') == 'GET /users/<id>'
+
+    @pytest.mark.parametrize('spec', ["POST /users=0/10", "POST /users=-1", "POST /users=5/0.5"])
+    def test_parse_route_limits_rejects_unusable_bucket(self, spec):
+        """Test a zero or negative rate, or a burst below one token, is a config error"""
+        with pytest.raises(ValueError):
+            parse_route_limits(spec)
+
+
+@pytest.mark.unit
+class TestAdmissionMiddleware:
+    """Test cases for 429/503 responses from the admission middleware"""
+
+    def test_route_limit_returns_429_with_retry_after(self, wsgi_call, ok_app):
+        """Test exceeding a route bucket yields 429 and a Retry-After header"""
+        controller = AdmissionController(route_limits={'POST /users': (1, 1)})
+        app = AdmissionMiddleware(ok_app, controller)
+
+        assert wsgi_call(app, 'POST', '/users')[0] == 200
+        status, headers, body = wsgi_call(app, 'POST', '/users')
+        assert status == 429
+        assert int(headers['Retry-After']) >= 1
+        assert 'error' in json.loads(body)
+        assert wsgi_call(app, 'GET', '/users/1')[0] == 200
+
+    def test_client_limit_is_per_address(self, wsgi_call, ok_app):
+        """Test one client's bucket does not affect another client"""
+        controller = AdmissionController(client_rate=1, client_burst=1)
+        app = AdmissionMiddleware(ok_app, controller)
+
+        assert wsgi_call(app, client='10.0.0.1')[0] == 200
+        assert wsgi_call(app, client='10.0.0.1')[0] == 429
+        assert wsgi_call(app, client='10.0.0.2')[0] == 200
+
+    def test_health_is_never_shed(self, wsgi_call, ok_app):
+        """Test probes bypass admission control"""
+        controller = AdmissionController(client_rate=1, client_burst=1, max_in_flight=1)
+        controller.in_flight = 1
+        app = AdmissionMiddleware(ok_app, controller)
+
+        assert wsgi_call(app, path='/health')[0] == 200
+
+    def test_exempt_requests_not_counted(self, wsgi_call, ok_app):
+        """Test probes leave the in-flight count alone, so the cap still sheds"""
+        controller = AdmissionController(max_in_flight=2)
+        app = AdmissionMiddleware(ok_app, controller)
+
+        for path in ['/health'] * 5 + ['/ready', '/metrics']:
+            assert wsgi_call(app, path=path)[0] == 200
+        assert controller.in_flight == 0
+
+        controller.in_flight = 2
+        assert wsgi_call(app)[0] == 503
+
+    def test_exempt_requests_not_counted_asgi(self, monkeypatch, asgi_call):
+        """Test natively served ASGI probes leave the in-flight count alone"""
+        import src.api as api
+        from src.api.asgi import app as asgi_app
+
+        controller = AdmissionController(max_in_flight=2)
+        monkeypatch.setattr(api, 'admission_controller', controller)
+
+        for _ in range(5):
+            assert asgi_call(asgi_app, 'GET', '/health').status_code == 200
+        assert controller.in_flight == 0
+
+        controller.in_flight = 2
+        assert asgi_call(asgi_app, 'GET', '/users/1').status_code == 503
+
+    def test_rejections_labelled_like_admitted_requests(self):
+        """Test rejected requests are counted under the route's URL rule template"""
+        flask_app = Flask(__name__)
+        flask_app.add_url_rule('/users/<int:user_id>', 'get_user', lambda user_id: 'ok')
+        metrics = RequestMetrics()
+        instrument_app(flask_app, metrics)
+        flask_app.wsgi_app = AdmissionMiddleware(
+            flask_app.wsgi_app, AdmissionController(client_rate=1, client_burst=1),
+            metrics, flask_app.url_map)
+
+        client = flask_app.test_client()
+
+        assert client.get('/users/1').status_code == 200
+        assert client.get('/users/2').status_code == 429
+        assert client.get('/nope').status_code == 429
+
+        rendered = metrics.render()
+        assert 'api_requests_total{route="/users/<int:user_id>",status="200"} 1' in rendered
+        assert 'api_requests_total{route="/users/<int:user_id>",status="429"} 1' in rendered
+        assert 'api_requests_total{route="unmatched",status="429"} 1' in rendered
+
+    def test_in_flight_slot_released_after_response(self, wsgi_call, ok_app):
+        """Test the in-flight counter returns to zero once bodies are closed"""
+        controller = AdmissionController(max_in_flight=1)
+        app = AdmissionMiddleware(ok_app, controller)
+
+        for _ in range(3):
+            assert wsgi_call(app)[0] == 200
+        assert controller.in_flight == 0
+
+    def test_real_app_sheds_excess_while_saturated(self):
+        """Test the app sheds with 503 and Retry-After only while every slot is held"""
+        from werkzeug.test import create_environ
+        from src.api.app import app as flask_app
+
+        controller = AdmissionController(max_in_flight=4)
+        app = AdmissionMiddleware(flask_app.wsgi_app, controller, RequestMetrics(),
+                                  flask_app.url_map)
+
+        def request(path='/users?limit=1'):
+            captured = {}
+
+            def start_response(status, headers, exc_info=None):
+                captured['status'] = int(status.split()[0])
+                captured['headers'] = dict(headers)
+
+            body = app(create_environ(path), start_response)
+            return captured, body
+
+        # Admitted bodies hold their slot until closed, like slow responses in flight
+        held = [request() for _ in range(4)]
+        assert all(captured['status'] == 200 for captured, _ in held)
+
+        shed = [request() for _ in range(10)]
+        assert [captured['status'] for captured, _ in shed] == [503] * 10
+        assert all(captured['headers']['Retry-After'] == '1' for captured, _ in shed)
+        assert request('/health')[0]['status'] == 200
+
+        for _, body in held:
+            body.close()
+        assert controller.in_flight == 0
+        captured, body = request()
+        body.close()
+        assert captured['status'] == 200
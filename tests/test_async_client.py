@@ -0,0 +1,145 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import pytest
+
+from utils.async_client import AsyncAPIClient
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    """Keep-alive HTTP/1.1 server echoing the request; also /stream, /slow and /close"""
+
+    protocol_version = 'HTTP/1.1'
+    # Send headers and body in one write, so Nagle's algorithm does not stall keep-alive
+    wbufsize = 65536
+
+    def log_message(self, format, *args):
+        pass
+
+    def _respond(self):
+        url = urlsplit(self.path)
+        if url.path == '/slow':
+            time.sleep(0.5)
+        if url.path == '/stream':
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/x-ndjson')
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            for i in range(100):
+                line = f'{{"n": {i}}}\n'.encode()
+                self.wfile.write(f"{len(line):x}\r\n".encode() + line + b"\r\n")
+            self.wfile.write(b"0\r\n\r\n")
+            return
+        length = int(self.headers.get('Content-Length') or 0)
+        body = json.dumps({
+            'method': self.command,
+            'path': url.path,
+            'query': url.query,
+            'body': self.rfile.read(length).decode(),
+            'content_type': self.headers.get('Content-Type'),
+        }).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if url.path == '/close':
+            self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_PUT = _respond
+
+
+@pytest.fixture
+def echo_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), EchoHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+@pytest.mark.unit
+class TestAsyncAPIClient:
+    """Test cases for the asyncio HTTP client"""
+
+    def test_requests_and_bodies(self, echo_server):
+        """Test methods, JSON and form bodies, queries and chunked responses round-trip"""
+        client = AsyncAPIClient(echo_server)
+
+        async def calls():
+            posted = await client('POST', '/users?x=1', json={"name": "Ann"})
+            form = await client('PUT', '/form', data={"a": "b"})
+            streamed = await client('GET', '/stream')
+            return posted, form, streamed
+
+        posted, form, streamed = client.run(calls())
+
+        assert posted.status_code == 200
+        assert posted.json() == {'method': 'POST', 'path': '/users', 'query': 'x=1',
+                                 'body': '{"name": "Ann"}', 'content_type': 'application/json'}
+        assert form.json()['body'] == 'a=b'
+        assert [json.loads(line)['n'] for line in streamed.text.splitlines()] == list(range(100))
+
+    def test_fan_out_reuses_bounded_pool(self, echo_server):
+        """Test many concurrent requests share at most max_connections connections"""
+        client = AsyncAPIClient(echo_server, max_connections=10)
+
+        async def fan_out():
+            return await asyncio.gather(*(client('GET', f'/n/{i}') for i in range(500)))
+
+        responses = client.run(fan_out())
+
+        assert [r.json()['path'] for r in responses] == [f'/n/{i}' for i in range(500)]
+        assert client.connections_opened <= 10
+
+    def test_connection_close_not_reused(self, echo_server):
+        """Test a Connection: close response is not put back in the pool"""
+        client = AsyncAPIClient(echo_server, max_connections=1)
+
+        async def sequential():
+            for _ in range(3):
+                assert (await client('GET', '/close')).status_code == 200
+            await client('GET', '/a')
+            await client('GET', '/b')
+
+        client.run(sequential())
+
+        assert client.connections_opened == 4
+
+    def test_timeout(self, echo_server):
+        """Test a request slower than its timeout raises asyncio.TimeoutError"""
+        client = AsyncAPIClient(echo_server, timeout=5)
+
+        with pytest.raises(asyncio.TimeoutError):
+            client.run(client('GET', '/slow', timeout=0.1))
+        assert client.run(client('GET', '/fast')).status_code == 200
+
+
+class TestAsyncAPIClientFixture:
+    """Test cases for the async_api_client fixture against the API"""
+
+    def test_concurrent_fan_out(self, async_api_client):
+        """Test a thousand concurrent requests all succeed"""
+        stamp = int(time.time() * 1000)
+
+        async def fan_out():
+            created = await asyncio.gather(*(
+                async_api_client('POST', '/users', json={"name": f"Async User {i}",
+                                                         "email": f"async{i}_{stamp}@example.com"})
+                for i in range(200)))
+            health = await asyncio.gather(*(async_api_client('GET', '/health')
+                                            for _ in range(1000)))
+            return created, health
+
+        created, health = async_api_client.run(fan_out())
+
+        assert all(r.status_code == 201 for r in created)
+        assert len({r.json()['id'] for r in created}) == 200
+        assert all(r.status_code == 200 for r in health)
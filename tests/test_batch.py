@@ -0,0 +1,84 @@
+import json
+import time
+
+import pytest
+
+
+def parse_ndjson(response):
+    """Decode an NDJSON response body into a list of objects"""
+    return [json.loads(line) for line in response.text.splitlines() if line]
+
+
+class TestBatchUserCreation:
+    """Test cases for POST /users/batch endpoint"""
+
+    def test_batch_create_json_array(self, api_client):
+        """Test a JSON array of users is created with one result per record"""
+        stamp = int(time.time() * 1000)
+        users = [{"name": f"Batch User {i}", "email": f"batch{i}_{stamp}@example.com"}
+                 for i in range(5)]
+
+        response = api_client('POST', '/users/batch', json=users)
+
+        assert response.status_code == 200
+        assert 'application/x-ndjson' in response.headers['Content-Type']
+        results = parse_ndjson(response)
+        assert [r['index'] for r in results] == list(range(5))
+        assert all(r['status'] == 201 for r in results)
+        assert [r['user']['email'] for r in results] == [u['email'] for u in users]
+
+        user_id = results[0]['user']['id']
+        get_response = api_client('GET', f'/users/{user_id}')
+        assert get_response.status_code == 200
+        assert get_response.json()['email'] == users[0]['email']
+
+    def test_batch_create_ndjson_stream(self, api_client):
+        """Test an NDJSON body reports per-record validation and duplicate errors"""
+        stamp = int(time.time() * 1000)
+        lines = [
+            json.dumps({"name": "Stream User", "email": f"stream_{stamp}@example.com"}),
+            json.dumps({"name": "No Email"}),
+            json.dumps({"name": "Bad Email", "email": "invalid-email"}),
+            "not json",
+            json.dumps({"name": "Stream User", "email": f"STREAM_{stamp}@example.com"}),
+        ]
+
+        response = api_client('POST', '/users/batch', data="\n".join(lines) + "\n",
+                              headers={'Content-Type': 'application/x-ndjson'})
+
+        assert response.status_code == 200
+        statuses = [r['status'] for r in parse_ndjson(response)]
+        assert statuses == [201, 400, 400, 400, 409]
+
+    def test_batch_create_schema_violations(self, api_client, invalid_user_payloads):
+        """Test batch validation reports the same errors as POST /users"""
+        payloads = [payload for payload, _ in invalid_user_payloads]
+
+        response = api_client('POST', '/users/batch', json=payloads)
+
+        results = parse_ndjson(response)
+        assert [r['status'] for r in results] == [400] * len(payloads)
+        assert [r['error'] for r in results] == [error for _, error in invalid_user_payloads]
+
+    def test_batch_create_rejects_non_array(self, api_client, unique_user_data):
+        """Test a JSON body that is not an array is rejected"""
+        response = api_client('POST', '/users/batch', json=unique_user_data)
+
+        assert response.status_code == 400
+        assert 'array' in response.json()['error'].lower()
+
+    @pytest.mark.slow
+    def test_batch_create_spans_multiple_chunks(self, api_client):
+        """Test batches larger than one insert chunk are fully processed"""
+        stamp = int(time.time() * 1000)
+        body = "".join(
+            json.dumps({"name": f"Chunk {i}", "email": f"chunk{i}_{stamp}@example.com"}) + "\n"
+            for i in range(1200))
+
+        response = api_client('POST', '/users/batch', data=body,
+                              headers={'Content-Type': 'application/x-ndjson'})
+
+        results = parse_ndjson(response)
+        assert len(results) == 1200
+        assert all(r['status'] == 201 for r in results)
+        assert len({r['user']['id'] for r in results}) == 1200
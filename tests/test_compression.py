@@ -0,0 +1,151 @@
+import gzip
+import json
+import os
+
+import pytest
+
+from src.api.compression import CompressionMiddleware, negotiate
+
+
+def body_app(body, content_type='application/json', extra_headers=()):
+    def app(environ, start_response):
+        start_response('200 OK', [('Content-Type', content_type),
+                                  ('Content-Length', str(len(body)))] + list(extra_headers))
+        return [body]
+    return app
+
+
+def decoded(response):
+    """Return a response body, gunzipping it if the client did not already"""
+    body = response.content
+    return gzip.decompress(body) if body[:2] == b'\x1f\x8b' else body
+
+
+@pytest.mark.unit
+class TestNegotiation:
+    """Test cases for Accept-Encoding negotiation"""
+
+    def test_highest_quality_available_coding_wins(self):
+        """Test q-values pick the coding and unavailable codings are ignored"""
+        assert negotiate('gzip;q=0.5, br', ('br', 'gzip')) == 'br'
+        assert negotiate('gzip;q=0.5, br', ('gzip',)) == 'gzip'
+        assert negotiate('gzip, br', ('br', 'gzip')) == 'br'
+        assert negotiate('*', ('gzip',)) == 'gzip'
+
+    def test_no_acceptable_coding(self):
+        """Test identity-only, refused and missing headers mean no compression"""
+        assert negotiate('identity', ('gzip',)) is None
+        assert negotiate('gzip;q=0', ('gzip',)) is None
+        assert negotiate(None, ('gzip',)) is None
+
+
+@pytest.mark.unit
+class TestCompressionMiddleware:
+    """Test cases for the compression middleware"""
+
+    def test_large_body_compressed_with_length(self, wsgi_call):
+        """Test a large buffered body is gzipped with an accurate Content-Length"""
+        body = json.dumps([{"id": i, "name": f"User {i}"} for i in range(200)]).encode()
+        app = CompressionMiddleware(body_app(body), min_size=1024)
+
+        _, headers, compressed = wsgi_call(app, headers={'Accept-Encoding': 'gzip'})
+
+        assert headers['Content-Encoding'] == 'gzip'
+        assert headers['Vary'] == 'Accept-Encoding'
+        assert int(headers['Content-Length']) == len(compressed) < len(body)
+        assert gzip.decompress(compressed) == body
+
+    def test_small_body_passes_through(self, wsgi_call):
+        """Test bodies under the threshold are sent as-is"""
+        app = CompressionMiddleware(body_app(b'{"status":"healthy"}'), min_size=1024)
+
+        _, headers, body = wsgi_call(app, headers={'Accept-Encoding': 'gzip'})
+
+        assert 'Content-Encoding' not in headers
+        assert headers['Vary'] == 'Accept-Encoding'
+        assert body == b'{"status":"healthy"}'
+
+    def test_uncompressible_or_already_encoded_bodies_pass_through(self, wsgi_call):
+        """Test binary content types and pre-encoded bodies are not compressed"""
+        body = b'x' * 4096
+        for app in (body_app(body, 'image/png'),
+                    body_app(body, extra_headers=[('Content-Encoding', 'br')]),
+                    body_app(body, extra_headers=[('Cache-Control', 'no-transform')])):
+            _, headers, sent = wsgi_call(CompressionMiddleware(app),
+                                         headers={'Accept-Encoding': 'gzip'})
+            assert headers.get('Content-Encoding') != 'gzip'
+            assert sent == body
+
+    def test_stream_compressed_incrementally(self):
+        """Test streamed output is emitted before the wrapped app finishes"""
+        produced = []
+
+        def streaming_app(environ, start_response):
+            start_response('200 OK', [('Content-Type', 'application/x-ndjson')])
+
+            def generate():
+                for i in range(20):
+                    produced.append(i)
+                    yield os.urandom(32768)
+            return generate()
+
+        app = CompressionMiddleware(streaming_app, min_size=1024)
+        captured = {}
+        result = app({'REQUEST_METHOD': 'GET', 'HTTP_ACCEPT_ENCODING': 'gzip'},
+                     lambda status, headers, exc_info=None: captured.update(headers))
+        chunks = iter(result)
+
+        first = next(chunks)
+        assert first and len(produced) < 20
+        assert captured['Content-Encoding'] == 'gzip'
+        assert 'Content-Length' not in captured
+        rest = b''.join(chunks)
+        assert len(gzip.decompress(first + rest)) == 20 * 32768
+
+    def test_etag_tagged_and_if_none_match_restored(self, wsgi_call):
+        """Test compressed ETags get a suffix that conditional requests strip again"""
+        seen = {}
+        body = b'{"data": "' + b'a' * 2048 + b'"}'
+
+        def etag_app(environ, start_response):
+            seen['if_none_match'] = environ.get('HTTP_IF_NONE_MATCH')
+            start_response('200 OK', [('Content-Type', 'application/json'), ('ETag', '"abc"')])
+            return [body]
+
+        app = CompressionMiddleware(etag_app)
+        _, headers, _ = wsgi_call(app, headers={'Accept-Encoding': 'gzip'})
+        assert headers['ETag'] == '"abc-gzip"'
+
+        wsgi_call(app, headers={'Accept-Encoding': 'gzip', 'If-None-Match': '"abc-gzip"'})
+        assert seen['if_none_match'] == '"abc"'
+
+    def test_no_accept_encoding_untouched(self, wsgi_call):
+        """Test clients that do not ask for compression get the original response"""
+        body = b'y' * 4096
+        _, headers, sent = wsgi_call(CompressionMiddleware(body_app(body)))
+
+        assert 'Content-Encoding' not in headers
+        assert sent == body
+
+
+class TestCompressedEndpoints:
+    """Test cases for compression on the API's endpoints"""
+
+    def test_user_list_gzipped(self, api_client):
+        """Test a large user page is gzipped and decodes to the plain response"""
+        seeded = api_client('POST', '/admin/seed?count=50').json()
+        endpoint = f"/users?cursor={seeded['first_id'] - 1}&limit=50"
+
+        plain = api_client('GET', endpoint, headers={'Accept-Encoding': 'identity'})
+        compressed = api_client('GET', endpoint, headers={'Accept-Encoding': 'gzip'})
+
+        assert 'Content-Encoding' not in plain.headers
+        assert compressed.headers['Content-Encoding'] == 'gzip'
+        assert json.loads(decoded(compressed)) == plain.json()
+
+    def test_health_not_compressed(self, api_client):
+        """Test tiny bodies like /health skip compression"""
+        response = api_client('GET', '/health', headers={'Accept-Encoding': 'gzip'})
+
+        assert response.status_code == 200
+        assert 'Content-Encoding' not in response.headers
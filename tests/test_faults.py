@@ -0,0 +1,173 @@
+import json
+import random
+import statistics
+import threading
+import time
+
+import pytest
+import requests
+from werkzeug.serving import make_server
+
+from src.api.faults import FaultConfigError, FaultInjector, FaultMiddleware, Latency
+
+
+@pytest.mark.unit
+class TestLatency:
+    """Test cases for latency distributions"""
+
+    def test_distributions_sample_in_range(self):
+        """Test each distribution draws delays with the configured shape"""
+        rng = random.Random(1)
+        fixed = Latency.from_spec({"distribution": "fixed", "ms": 25})
+        uniform = Latency.from_spec({"distribution": "uniform", "min_ms": 10, "max_ms": 20})
+        lognormal = Latency.from_spec({"distribution": "lognormal", "median_ms": 50,
+                                       "sigma": 1.0})
+
+        assert fixed.sample(rng) == 0.025
+        assert all(0.010 <= uniform.sample(rng) <= 0.020 for _ in range(1000))
+        samples = [lognormal.sample(rng) for _ in range(5000)]
+        assert statistics.median(samples) == pytest.approx(0.050, rel=0.1)
+        # The long right tail: p99 far above the median
+        assert sorted(samples)[int(len(samples) * 0.99)] > 0.4
+
+    @pytest.mark.parametrize("spec", [
+        {"distribution": "pareto", "ms": 1},
+        {"distribution": "fixed"},
+        {"distribution": "fixed", "ms": -1},
+        {"distribution": "uniform", "min_ms": 20, "max_ms": 10},
+        {"distribution": "lognormal", "median_ms": 0, "sigma": 1},
+        "fixed:10",
+    ])
+    def test_invalid_specs_rejected(self, spec):
+        """Test malformed latency specs raise FaultConfigError"""
+        with pytest.raises(FaultConfigError):
+            Latency.from_spec(spec)
+
+
+@pytest.mark.unit
+class TestFaultInjector:
+    """Test cases for picking faults from the configured rules"""
+
+    def test_route_rule_overrides_wildcard(self):
+        """Test an exact route rule wins over '*' and exempt paths are never faulted"""
+        injector = FaultInjector(seed=1)
+        injector.configure([
+            {"route": "*", "error_rate": 1},
+            {"route": "GET /users/<id>", "latency": {"distribution": "fixed", "ms": 5}},
+        ])
+
+        assert injector.decide('GET', '/users/7') == (0.005, None, 503)
+        assert injector.decide('POST', '/users')[1] == 'error'
+        assert injector.decide('PUT', '/admin/faults') is None
+
+    def test_rates_and_seed_reproducible(self):
+        """Test error and reset rates are honoured and a seed replays the same faults"""
+        rules = [{"route": "GET /users", "error_rate": 0.2, "reset_rate": 0.1,
+                  "error_status": 500}]
+        injector = FaultInjector()
+        injector.configure(rules, seed=42)
+        first = [injector.decide('GET', '/users') for _ in range(2000)]
+        injector.configure(rules, seed=42)
+        second = [injector.decide('GET', '/users') for _ in range(2000)]
+
+        assert first == second
+        actions = [action for _, action, _ in first]
+        assert actions.count('error') / 2000 == pytest.approx(0.2, abs=0.03)
+        assert actions.count('reset') / 2000 == pytest.approx(0.1, abs=0.03)
+        assert 'api_faults_injected_total{kind="error"}' in injector.render_metrics()
+
+    @pytest.mark.parametrize("rules", [
+        {"route": "*"},
+        [{"error_rate": 0.5}],
+        [{"route": "*", "error_rate": 0.7, "reset_rate": 0.5}],
+        [{"route": "*", "error_status": 200}],
+        [{"route": "*"}, {"route": "*"}],
+    ])
+    def test_invalid_rules_rejected_without_change(self, rules):
+        """Test a bad rule set raises and leaves the current rules in place"""
+        injector = FaultInjector()
+        injector.configure([{"route": "*", "error_rate": 1}])
+
+        with pytest.raises(FaultConfigError):
+            injector.configure(rules)
+        assert injector.to_dict()['rules'][0]['error_rate'] == 1
+
+
+@pytest.mark.unit
+class TestFaultMiddleware:
+    """Test cases for the fault injection middleware"""
+
+    def test_injected_error_and_delay(self, wsgi_call, ok_app):
+        """Test a faulted request is delayed and answered with the configured status"""
+        injector = FaultInjector()
+        injector.configure([{"route": "GET /users/<id>", "error_rate": 1, "error_status": 502,
+                             "latency": {"distribution": "fixed", "ms": 50}}])
+        app = FaultMiddleware(ok_app, injector)
+
+        start = time.perf_counter()
+        status, headers, body = wsgi_call(app, path='/users/1')
+        assert time.perf_counter() - start >= 0.05
+        assert status == 502
+        assert headers['X-Fault-Injected'] == 'error'
+        assert json.loads(body) == {"error": "Injected fault"}
+        assert wsgi_call(app, path='/health')[0] == 200
+
+    def test_reset_without_socket_raises(self, wsgi_call, ok_app):
+        """Test a reset surfaces as ConnectionResetError when no socket is exposed"""
+        injector = FaultInjector()
+        injector.configure([{"route": "*", "reset_rate": 1}])
+
+        with pytest.raises(ConnectionResetError):
+            wsgi_call(FaultMiddleware(ok_app, injector))
+
+    def test_reset_aborts_real_connection(self, ok_app):
+        """Test a reset over a real socket reaches the client as a connection error"""
+        injector = FaultInjector()
+        injector.configure([{"route": "GET /users/<id>", "reset_rate": 1}])
+        server = make_server('127.0.0.1', 0, FaultMiddleware(ok_app, injector), threaded=True)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        base = f"http://127.0.0.1:{server.server_port}"
+        try:
+            with pytest.raises(requests.exceptions.ConnectionError):
+                requests.get(f"{base}/users/1", timeout=5)
+            assert requests.get(f"{base}/users", timeout=5).status_code == 200
+        finally:
+            server.shutdown()
+            thread.join()
+
+
+class TestFaultsEndpoint:
+    """Test cases for configuring faults through /admin/faults"""
+
+    @pytest.fixture(autouse=True)
+    def clear_faults(self, api_client):
+        yield
+        api_client('DELETE', '/admin/faults')
+
+    def test_errors_injected_until_cleared(self, api_client, unique_user_data):
+        """Test rules set over the API fault matching routes until deleted"""
+        created = api_client('POST', '/users', json=unique_user_data).json()
+        rules = {"rules": [{"route": "GET /users/<id>", "error_rate": 1, "error_status": 503}],
+                 "seed": 7}
+
+        response = api_client('PUT', '/admin/faults', json=rules)
+        assert response.status_code == 200
+        assert response.json()['rules'][0]['route'] == 'GET /users/<id>'
+
+        faulted = api_client('GET', f"/users/{created['id']}")
+        assert faulted.status_code == 503
+        assert faulted.headers['X-Fault-Injected'] == 'error'
+        assert api_client('GET', '/health').status_code == 200
+
+        assert api_client('DELETE', '/admin/faults').json()['rules'] == []
+        assert api_client('GET', f"/users/{created['id']}").status_code == 200
+
+    def test_invalid_rules_rejected(self, api_client):
+        """Test malformed rule sets return 400"""
+        response = api_client('PUT', '/admin/faults',
+                              json={"rules": [{"route": "*", "error_rate": 2}]})
+
+        assert response.status_code == 400
+        assert 'error' in response.json()
+        assert api_client('GET', '/admin/faults').json()['rules'] == []
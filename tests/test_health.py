@@ -1,6 +1,14 @@
+import json
+import os
 import pytest
 import time
 
+from src.api.health import HealthPayload, ReadinessMonitor
+
+
+def serialize(payload):
+    return json.dumps(payload).encode()
+
 
 class TestHealthEndpoint:
     """Test cases for /health endpoint"""
@@ -63,3 +71,96 @@ class TestHealthEndpoint:
         assert data['status'] == 'healthy'
         assert isinstance(data['timestamp'], str)
         assert isinstance(data['version'], str)
+
+
+class TestReadyEndpoint:
+    """Test cases for /ready endpoint"""
+
+    def test_ready_reports_store_check(self, api_client):
+        """Test readiness returns 200 with the cached store check"""
+        response = api_client('GET', '/ready')
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data['status'] == 'ready'
+        assert data['checks']['store']['ok'] is True
+        assert isinstance(data['checks']['store']['detail']['users'], int)
+
+
+@pytest.mark.unit
+class TestHealthPayload:
+    """Test cases for the precomputed /health body"""
+
+    def test_body_rebuilt_at_most_once_per_ttl(self):
+        """Test probes within the TTL share one body and later ones get a fresh one"""
+        calls = []
+
+        def counting_serialize(payload):
+            calls.append(payload)
+            return serialize(payload)
+
+        health = HealthPayload(counting_serialize, ttl=1.0)
+        first = health.body(now=100.0)
+
+        assert health.body(now=100.5) is first
+        assert len(calls) == 1
+        health.body(now=101.0)
+        assert len(calls) == 2
+        assert json.loads(first)['status'] == 'healthy'
+
+
+@pytest.mark.unit
+class TestReadinessMonitor:
+    """Test cases for background readiness checks"""
+
+    def test_failing_check_reports_not_ready(self):
+        """Test a raising or False check makes the verdict 503 with details"""
+        monitor = ReadinessMonitor(serialize, interval=60)
+        monitor.add_check('ok', lambda: {"users": 3})
+        monitor.add_check('down', lambda: False)
+
+        def broken():
+            raise ConnectionError("refused")
+        monitor.add_check('broken', broken)
+
+        status, body = monitor.status()
+        data = json.loads(body)
+        monitor.stop()
+
+        assert status == 503
+        assert data['status'] == 'not ready'
+        assert data['checks']['ok'] == {"ok": True, "duration_ms": data['checks']['ok']['duration_ms'],
+                                        "detail": {"users": 3}}
+        assert data['checks']['down']['ok'] is False
+        assert data['checks']['broken']['detail'] == "ConnectionError: refused"
+
+    def test_verdict_refreshed_in_background(self):
+        """Test the cached verdict follows a dependency without blocking probes"""
+        healthy = {'value': False}
+        monitor = ReadinessMonitor(serialize, interval=0.01)
+        monitor.add_check('flappy', lambda: healthy['value'])
+
+        assert monitor.status()[0] == 503
+        healthy['value'] = True
+        deadline = time.monotonic() + 2
+        while monitor.status()[0] != 200 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        status = monitor.status()[0]
+        monitor.stop()
+
+        assert status == 200
+
+    def test_stopped_monitor_not_restarted(self):
+        """Test probing a stopped monitor serves the last verdict without new checks"""
+        runs = []
+        monitor = ReadinessMonitor(serialize, interval=0.01)
+        monitor.add_check('counted', lambda: runs.append(1))
+
+        assert monitor.status()[0] == 200
+        monitor.stop()
+        time.sleep(0.05)
+        seen = len(runs)
+
+        assert monitor.status()[0] == 200
+        time.sleep(0.05)
+        assert len(runs) == seen
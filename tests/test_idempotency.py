@@ -0,0 +1,141 @@
+import uuid
+
+import pytest
+
+from src.api.idempotency import (ENTRY_OVERHEAD, IdempotencyCache, IdempotencyKeyInUse,
+                                 IdempotencyKeyMismatch)
+
+
+class TestIdempotentCreateUser:
+    """Test cases for POST /users with an Idempotency-Key header"""
+
+    def test_retry_replays_first_response(self, api_client, unique_user_data):
+        """Test a retried create returns the original 201 instead of a 409"""
+        headers = {'Idempotency-Key': str(uuid.uuid4())}
+
+        first = api_client('POST', '/users', json=unique_user_data, headers=headers)
+        retry = api_client('POST', '/users', json=unique_user_data, headers=headers)
+
+        assert first.status_code == 201
+        assert retry.status_code == 201
+        assert retry.json() == first.json()
+        assert retry.headers['Idempotent-Replayed'] == 'true'
+        assert 'Idempotent-Replayed' not in first.headers
+
+    def test_new_key_reaches_the_store(self, api_client, unique_user_data):
+        """Test a different key is a new request and hits the duplicate check"""
+        api_client('POST', '/users', json=unique_user_data,
+                   headers={'Idempotency-Key': str(uuid.uuid4())})
+
+        response = api_client('POST', '/users', json=unique_user_data,
+                              headers={'Idempotency-Key': str(uuid.uuid4())})
+
+        assert response.status_code == 409
+
+    def test_validation_errors_are_replayed(self, api_client, unique_user_data):
+        """Test 4xx responses are cached like successes"""
+        headers = {'Idempotency-Key': str(uuid.uuid4())}
+        del unique_user_data['email']
+
+        first = api_client('POST', '/users', json=unique_user_data, headers=headers)
+        retry = api_client('POST', '/users', json=unique_user_data, headers=headers)
+
+        assert first.status_code == retry.status_code == 400
+        assert retry.json() == first.json()
+
+    def test_key_reused_with_different_body(self, api_client, unique_user_data):
+        """Test reusing a key for a different payload is rejected with 422"""
+        headers = {'Idempotency-Key': str(uuid.uuid4())}
+        api_client('POST', '/users', json=unique_user_data, headers=headers)
+
+        other = dict(unique_user_data, name="Someone Else")
+        response = api_client('POST', '/users', json=other, headers=headers)
+
+        assert response.status_code == 422
+        assert 'different request body' in response.json()['error']
+
+    def test_overlong_key_rejected(self, api_client, unique_user_data):
+        """Test keys longer than 255 characters are rejected"""
+        response = api_client('POST', '/users', json=unique_user_data,
+                              headers={'Idempotency-Key': 'k' * 256})
+
+        assert response.status_code == 400
+
+    def test_cache_metrics_exposed(self, api_client, unique_user_data):
+        """Test /metrics reports idempotency cache size, memory and evictions"""
+        headers = {'Idempotency-Key': str(uuid.uuid4())}
+        api_client('POST', '/users', json=unique_user_data, headers=headers)
+        api_client('POST', '/users', json=unique_user_data, headers=headers)
+
+        body = api_client('GET', '/metrics').text
+
+        assert '# TYPE api_idempotency_bytes gauge' in body
+        assert 'api_idempotency_evictions_total{reason="capacity"}' in body
+        replays = [line for line in body.splitlines()
+                   if line.startswith('api_idempotency_replays_total ')]
+        assert int(replays[0].split()[1]) >= 1
+
+
+@pytest.mark.unit
+class TestIdempotencyCache:
+    """Test cases for key reservation, expiry and eviction"""
+
+    def test_concurrent_request_with_same_key(self):
+        """Test a key is held while its first request runs, and freed by release"""
+        cache = IdempotencyCache()
+        assert cache.begin('k', b'fp', now=0) is None
+
+        with pytest.raises(IdempotencyKeyInUse):
+            cache.begin('k', b'fp', now=0)
+
+        cache.release('k')
+        assert cache.begin('k', b'fp', now=0) is None
+
+    def test_replay_and_mismatch(self):
+        """Test completed keys replay for the same body and reject another"""
+        cache = IdempotencyCache()
+        cache.begin('k', b'fp', now=0)
+        cache.complete('k', b'fp', 201, b'{}', now=0)
+
+        assert cache.begin('k', b'fp', now=1) == (201, b'{}')
+        with pytest.raises(IdempotencyKeyMismatch):
+            cache.begin('k', b'other', now=1)
+        assert cache.replays == 1
+
+    def test_entries_expire_after_ttl(self):
+        """Test an expired key runs the request again"""
+        cache = IdempotencyCache(ttl=10)
+        cache.begin('k', b'fp', now=0)
+        cache.complete('k', b'fp', 201, b'{}', now=0)
+
+        assert cache.begin('k', b'fp', now=10) is None
+        assert cache.evictions['expired'] == 1
+        assert cache.bytes == 0
+
+    def test_least_recently_used_evicted_by_count(self):
+        """Test the entry replayed least recently is evicted first"""
+        cache = IdempotencyCache(max_entries=2)
+        for key in ('a', 'b'):
+            cache.begin(key, b'fp', now=0)
+            cache.complete(key, b'fp', 201, b'{}', now=0)
+        cache.begin('a', b'fp', now=1)
+
+        cache.begin('c', b'fp', now=1)
+        cache.complete('c', b'fp', 201, b'{}', now=1)
+
+        assert cache.begin('a', b'fp', now=2) == (201, b'{}')
+        assert cache.begin('b', b'fp', now=2) is None
+        assert cache.evictions['capacity'] == 1
+
+    def test_evicted_by_memory_budget(self):
+        """Test entries are evicted to keep accounted bytes within max_bytes"""
+        body = b'x' * 1000
+        entry_size = 1 + len(body) + ENTRY_OVERHEAD
+        cache = IdempotencyCache(max_bytes=2 * entry_size)
+        for key in 'abc':
+            cache.begin(key, b'fp', now=0)
+            cache.complete(key, b'fp', 201, body, now=0)
+
+        assert len(cache) == 2
+        assert cache.bytes == 2 * entry_size
+        assert cache.evictions['capacity'] == 1
@@ -0,0 +1,66 @@
+import socket
+import threading
+import time
+
+import pytest
+import requests
+
+from utils.live_server import LiveServer, wait_for_port
+
+
+def hello_app(environ, start_response):
+    start_response('200 OK', [('Content-Type', 'text/plain')])
+    return [b'hello']
+
+
+@pytest.mark.unit
+class TestWaitForPort:
+    """Test cases for the socket-level readiness probe"""
+
+    def test_detects_late_listener_quickly(self):
+        """Test a port that starts listening after a delay is noticed promptly"""
+        with socket.socket() as reserve:
+            reserve.bind(('127.0.0.1', 0))
+            port = reserve.getsockname()[1]
+
+        listener = socket.socket()
+        listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+
+        def listen_later():
+            time.sleep(0.1)
+            listener.bind(('127.0.0.1', port))
+            listener.listen()
+
+        thread = threading.Thread(target=listen_later)
+        thread.start()
+        try:
+            start = time.perf_counter()
+            assert wait_for_port('127.0.0.1', port, timeout=5)
+            assert time.perf_counter() - start < 0.5
+        finally:
+            thread.join()
+            listener.close()
+
+    def test_gives_up_after_timeout(self):
+        """Test a port nobody listens on returns False once the timeout passes"""
+        with socket.socket() as reserve:
+            reserve.bind(('127.0.0.1', 0))
+            port = reserve.getsockname()[1]
+
+        start = time.perf_counter()
+        assert not wait_for_port('127.0.0.1', port, timeout=0.2)
+        assert time.perf_counter() - start < 1
+
+
+@pytest.mark.unit
+class TestLiveServer:
+    """Test cases for the in-process background server"""
+
+    def test_serves_on_ephemeral_port_until_stopped(self):
+        """Test the server answers on its chosen port and releases it on stop"""
+        with LiveServer(hello_app) as server:
+            assert server.port != 0
+            assert requests.get(server.url, timeout=5).text == 'hello'
+
+        with pytest.raises(requests.exceptions.ConnectionError):
+            requests.get(server.url, timeout=1)
@@ -0,0 +1,108 @@
+import threading
+import time
+
+import pytest
+
+from utils.load_generator import Endpoint, LatencyStats, LoadGenerator, parse_mix, percentile
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+def instant(method, path, **kwargs):
+    return FakeResponse(200)
+
+
+@pytest.mark.unit
+class TestLoadStatistics:
+    """Test cases for mix parsing and latency percentiles"""
+
+    def test_parse_mix(self):
+        """Test weighted mix specs parse into endpoints"""
+        endpoints = parse_mix("GET /health=9, GET /users?limit=10=1,POST /reset")
+
+        assert [(e.method, e.path, e.weight) for e in endpoints] == [
+            ('GET', '/health', 9.0), ('GET', '/users?limit=10', 1.0), ('POST', '/reset', 1.0)]
+
+    def test_nearest_rank_percentiles(self):
+        """Test percentiles pick the nearest-rank sample"""
+        samples = [i / 1000 for i in range(1, 1001)]
+        stats = LatencyStats(reversed(samples))
+
+        assert percentile(samples, 0.5) == 0.5
+        assert (stats.p50, stats.p90, stats.p99, stats.p999, stats.max) == (
+            0.5, 0.9, 0.99, 0.999, 1.0)
+        assert LatencyStats([]).p99 == 0.0
+
+
+@pytest.mark.unit
+class TestLoadGenerator:
+    """Test cases for the open-loop load generator"""
+
+    def test_schedule_rate_and_weights(self):
+        """Test the plan has rate x duration requests spread by weight"""
+        generator = LoadGenerator(instant, [Endpoint('GET', '/a', weight=3),
+                                            Endpoint('GET', '/b')], seed=1)
+        plan = generator.schedule(rate=1000, duration=4)
+
+        assert len(plan) == 4000
+        assert plan[1][0] == pytest.approx(0.001)
+        share = sum(endpoint.path == '/a' for _, endpoint in plan) / len(plan)
+        assert share == pytest.approx(0.75, abs=0.03)
+        assert plan == generator.schedule(rate=1000, duration=4)
+
+        poisson = LoadGenerator(instant, [Endpoint('GET', '/a')], poisson=True, seed=1)
+        assert len(poisson.schedule(rate=1000, duration=4)) == pytest.approx(4000, rel=0.05)
+
+    def test_stall_counted_from_scheduled_start(self):
+        """Test a stall shows up in latency for every request queued behind it"""
+        stalled = threading.Event()
+
+        def request(method, path, **kwargs):
+            if not stalled.is_set():
+                stalled.set()
+                time.sleep(0.2)
+            return FakeResponse(200)
+
+        generator = LoadGenerator(request, [Endpoint('GET', '/users/1')], concurrency=1)
+        result = generator.run(rate=100, duration=0.5)
+
+        assert result.requests == 50
+        # Requests scheduled during the stall waited for it...
+        assert result.latency.p90 >= 0.1
+        assert result.max_start_lag >= 0.15
+        # ...even though the server took almost no time to serve them
+        assert result.service_time.p90 < 0.05
+
+    def test_failures_counted(self):
+        """Test 5xx responses and exceptions count as failures, 4xx do not"""
+        outcomes = iter([200, 404, 503, None] * 5)
+
+        def request(method, path, **kwargs):
+            status = next(outcomes)
+            if status is None:
+                raise ConnectionResetError()
+            return FakeResponse(status)
+
+        result = LoadGenerator(request, [Endpoint('GET', '/x')], concurrency=1).run(
+            rate=200, duration=0.1)
+
+        assert result.statuses == {200: 5, 404: 5, 503: 5, 'error': 5}
+        assert result.error_rate == 0.5
+        assert result.by_endpoint['GET /x'].count == 20
+
+    def test_callable_paths_and_payloads(self):
+        """Test endpoints can vary their path and body per request"""
+        seen = []
+
+        def request(method, path, **kwargs):
+            seen.append((method, path, kwargs.get('json')))
+            return FakeResponse(201)
+
+        endpoint = Endpoint('post', lambda seq: f"/users?n={seq}",
+                            json=lambda seq: {"n": seq}, name='POST /users')
+        LoadGenerator(request, [endpoint], concurrency=1).run(rate=100, duration=0.03)
+
+        assert seen == [('POST', f"/users?n={i}", {"n": i}) for i in range(3)]
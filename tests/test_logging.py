@@ -0,0 +1,64 @@
+import logging
+import queue
+
+import pytest
+
+from src.api import logging_setup
+from src.api.app import app
+from src.api.logging_setup import (LazyQueueHandler, RouteSamplingFilter, configure_logging,
+                                   parse_sample_rates)
+
+
+def make_record(level=logging.INFO):
+    return logging.LogRecord('test', level, __file__, 1, "User %s", ('42',), None)
+
+
+@pytest.mark.unit
+class TestLoggingSetup:
+    """Test cases for queued, sampled request logging"""
+
+    def test_parse_sample_rates(self):
+        """Test sample rate specs parse into endpoint -> rate"""
+        assert parse_sample_rates("get_user=0.01, create_user=0.5") == {
+            'get_user': 0.01, 'create_user': 0.5}
+        assert parse_sample_rates("") == {}
+
+    def test_sampling_applies_per_endpoint(self):
+        """Test a zero rate drops INFO records for that endpoint only"""
+        sampling = RouteSamplingFilter({'get_user': 0.0})
+
+        with app.test_request_context('/users/1'):
+            assert not sampling.filter(make_record())
+            assert sampling.filter(make_record(logging.WARNING))
+        with app.test_request_context('/health'):
+            assert sampling.filter(make_record())
+        assert sampling.filter(make_record())
+
+    def test_queue_handler_defers_formatting(self):
+        """Test records are enqueued with their arguments still unformatted"""
+        log_queue = queue.SimpleQueue()
+        LazyQueueHandler(log_queue).handle(make_record())
+
+        queued = log_queue.get_nowait()
+        assert queued.msg == "User %s"
+        assert queued.args == ('42',)
+        assert queued.getMessage() == "User 42"
+
+    def test_reconfigure_keeps_foreign_handlers(self):
+        """Test configure_logging only replaces the handlers it installed itself"""
+        root = logging.getLogger()
+        saved = logging_setup._settings
+        level = root.level
+        foreign = logging.NullHandler()
+        root.addHandler(foreign)
+        others = [h for h in root.handlers if h not in logging_setup._handlers]
+        try:
+            configure_logging('INFO', 'sync')
+            configure_logging('INFO', 'off')
+
+            assert [h for h in root.handlers if h not in logging_setup._handlers] == others
+            assert len(logging_setup._handlers) == 1
+        finally:
+            root.removeHandler(foreign)
+            configure_logging(*saved)
+            root.setLevel(level)
@@ -0,0 +1,48 @@
+import pytest
+
+from src.api.metrics import RequestMetrics
+
+
+class TestMetricsEndpoint:
+    """Test cases for /metrics endpoint and Server-Timing headers"""
+
+    def test_metrics_counts_requests_by_route_and_status(self, api_client):
+        """Test served requests appear as Prometheus counters and histograms"""
+        api_client('GET', '/health')
+        api_client('GET', '/users/999999')
+
+        response = api_client('GET', '/metrics')
+
+        assert response.status_code == 200
+        assert response.headers['Content-Type'].startswith('text/plain')
+        body = response.text
+        assert '# TYPE api_requests_total counter' in body
+        assert 'api_requests_total{route="/health",status="200"}' in body
+        assert 'api_requests_total{route="/users/<int:user_id>",status="404"}' in body
+        assert 'api_request_duration_seconds_bucket{route="/health",le="+Inf"}' in body
+
+    def test_server_timing_breaks_down_create_user(self, api_client, unique_user_data):
+        """Test POST /users reports parse, validate, store and serialize phases"""
+        response = api_client('POST', '/users', json=unique_user_data)
+
+        assert response.status_code == 201
+        phases = [entry.split(';')[0] for entry in response.headers['Server-Timing'].split(', ')]
+        assert phases == ['parse', 'validate', 'store', 'serialize', 'total']
+
+
+@pytest.mark.unit
+class TestRequestMetrics:
+    """Test cases for the in-process histogram aggregation"""
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test bucket counts accumulate and +Inf matches the request count"""
+        metrics = RequestMetrics(buckets=(0.01, 0.1))
+        for duration in (0.005, 0.05, 0.05, 5.0):
+            metrics.observe('/users', 201, duration)
+
+        body = metrics.render()
+        assert 'api_request_duration_seconds_bucket{route="/users",le="0.01"} 1' in body
+        assert 'api_request_duration_seconds_bucket{route="/users",le="0.1"} 3' in body
+        assert 'api_request_duration_seconds_bucket{route="/users",le="+Inf"} 4' in body
+        assert 'api_request_duration_seconds_count{route="/users"} 4' in body
+        assert 'api_requests_total{route="/users",status="201"} 4' in body
@@ -0,0 +1,50 @@
+import random
+
+import pytest
+
+from src.api.name_index import NamePrefixIndex, prefix_upper_bound
+
+
+@pytest.mark.unit
+class TestNamePrefixIndex:
+    """Test cases for the chunked sorted name index"""
+
+    def test_matches_sorted_scan_across_chunks(self):
+        """Test prefix results equal a brute-force scan once chunks have split"""
+        rng = random.Random(42)
+        index = NamePrefixIndex(load=4)
+        names = {}
+        for user_id in range(1, 501):
+            name = ''.join(rng.choice('abC') for _ in range(rng.randint(1, 5)))
+            names[user_id] = name
+            index.add(name, user_id)
+
+        for prefix in ('a', 'ab', 'C', 'cab', 'bbbbbb'):
+            expected = sorted((name.casefold(), user_id) for user_id, name in names.items()
+                              if name.casefold().startswith(prefix.casefold()))
+            assert index.search(prefix, limit=1000) == [user_id for _, user_id in expected]
+            assert index.search(prefix, limit=3) == [user_id for _, user_id in expected[:3]]
+        assert len(index) == 500
+
+    def test_clear(self):
+        """Test clear empties the index"""
+        index = NamePrefixIndex()
+        index.add("Ada", 1)
+        index.clear()
+
+        assert index.search("a", limit=10) == []
+        assert len(index) == 0
+
+    def test_prefix_upper_bound(self):
+        """Test the bound sorts after every extension of the prefix"""
+        bound = prefix_upper_bound("ab")
+
+        assert "ab" < "ab\U0010fffe" < bound
+        assert "ac" >= bound
+
+    def test_prefix_upper_bound_max_code_point(self):
+        """Test trailing U+10FFFF is dropped before incrementing, leaving no bound if all"""
+        top = '\U0010ffff'
+
+        assert prefix_upper_bound("a" + top + top) == "b"
+        assert prefix_upper_bound(top) is None
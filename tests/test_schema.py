@@ -0,0 +1,40 @@
+import pytest
+
+from src.api.schema import compile_batch_validator, compile_validator, validate_user, validate_users
+
+VALID_USER = {"name": "Schema User", "email": "schema@example.com"}
+
+
+@pytest.mark.unit
+class TestCompiledSchema:
+    """Test cases for compiled declarative validators"""
+
+    def test_valid_payload_passes(self):
+        """Test a payload satisfying every rule validates cleanly"""
+        assert validate_user(VALID_USER) is None
+        assert validate_user({**VALID_USER, "extra": True}) is None
+
+    def test_invalid_payloads_report_rule(self, invalid_user_payloads):
+        """Test each generated violation yields its expected error"""
+        for payload, expected in invalid_user_payloads:
+            assert validate_user(payload) == expected, payload
+
+    def test_required_fields_checked_in_declaration_order(self):
+        """Test the first missing required field is reported"""
+        assert validate_user({}) == "Missing required field: name"
+
+    def test_batch_matches_single(self, invalid_user_payloads):
+        """Test batched validation agrees with per-payload validation"""
+        payloads = [VALID_USER] + [p for p, _ in invalid_user_payloads]
+        assert validate_users(payloads) == [validate_user(p) for p in payloads]
+
+    def test_optional_field_checked_only_when_present(self):
+        """Test optional fields are validated only if supplied"""
+        schema = {'name': {'required': True, 'type': str}, 'age': {'type': int}}
+        validate = compile_validator(schema)
+        validate_many = compile_batch_validator(schema)
+
+        assert validate({'name': 'x'}) is None
+        assert validate({'name': 'x', 'age': 'old'}) == "Invalid type for field: age"
+        assert validate_many([{'name': 'x', 'age': 3}, {'name': 'x', 'age': 'old'}]) == [
+            None, "Invalid type for field: age"]
@@ -0,0 +1,99 @@
+import pytest
+
+from src.api.snapshot import SnapshotError, SnapshotNotFoundError, read_snapshot, write_snapshot
+
+
+def make_users(count):
+    return [{'id': i, 'name': f"Snapshot Usér {i}", 'email': f"snap{i}@exämple.com",
+             'created_at': f"2024-05-06T07:08:{i % 60:02d}.{i:06d}"} for i in range(1, count + 1)]
+
+
+@pytest.mark.unit
+class TestSnapshotFormat:
+    """Test cases for the binary snapshot file format"""
+
+    def test_round_trip(self, tmp_path):
+        """Test users, including multi-byte strings, survive a write and read"""
+        path = str(tmp_path / 'users.snapshot')
+        users = make_users(50)
+
+        count, size = write_snapshot(path, users)
+
+        assert count == 50
+        assert size == (tmp_path / 'users.snapshot').stat().st_size
+        assert read_snapshot(path) == users
+
+    def test_empty_store(self, tmp_path):
+        """Test an empty store round-trips to an empty list"""
+        path = str(tmp_path / 'users.snapshot')
+        write_snapshot(path, [])
+
+        assert read_snapshot(path) == []
+
+    def test_ids_must_be_dense(self, tmp_path):
+        """Test IDs that skip a value cannot be snapshotted"""
+        users = make_users(3)
+        users[2]['id'] = 7
+
+        with pytest.raises(SnapshotError):
+            write_snapshot(str(tmp_path / 'users.snapshot'), users)
+
+    def test_missing_foreign_and_truncated_files(self, tmp_path):
+        """Test unreadable files raise SnapshotError"""
+        path = tmp_path / 'users.snapshot'
+        with pytest.raises(SnapshotNotFoundError):
+            read_snapshot(str(path))
+
+        path.write_bytes(b'not a snapshot at all')
+        with pytest.raises(SnapshotError):
+            read_snapshot(str(path))
+
+        write_snapshot(str(path), make_users(10))
+        path.write_bytes(path.read_bytes()[:-5])
+        with pytest.raises(SnapshotError):
+            read_snapshot(str(path))
+
+
+class TestAdminEndpoints:
+    """Test cases for /admin/seed, /admin/snapshot and /admin/restore"""
+
+    def test_seed_snapshot_restore(self, api_client, unique_user_data):
+        """Test a restore brings back exactly the snapshotted users"""
+        seeded = api_client('POST', '/admin/seed?count=5')
+        assert seeded.status_code == 201
+        assert seeded.json()['created'] == 5
+        first_id = seeded.json()['first_id']
+        assert seeded.json()['last_id'] == first_id + 4
+        seeded_user = api_client('GET', f'/users/{first_id}').json()
+
+        snapshot = api_client('POST', '/admin/snapshot')
+        assert snapshot.status_code == 200
+        total = snapshot.json()['users']
+        assert total >= 5
+
+        extra = api_client('POST', '/users', json=unique_user_data).json()
+        assert extra['id'] == total + 1
+
+        restored = api_client('POST', '/admin/restore')
+        assert restored.status_code == 200
+        assert restored.json() == {"users": total}
+        assert api_client('GET', f"/users/{extra['id']}").status_code == 404
+        assert api_client('GET', f'/users/{first_id}').json() == seeded_user
+        assert api_client('POST', '/users', json=unique_user_data).status_code == 201
+
+    def test_restore_without_snapshot_is_404(self, monkeypatch, tmp_path):
+        """Test a missing snapshot file is reported as not found, not as a conflict"""
+        import src.api as api
+        from src.api.app import app
+
+        monkeypatch.setattr(api.config, 'SNAPSHOT_PATH', str(tmp_path / 'missing.snapshot'))
+        response = app.test_client().post('/admin/restore')
+
+        assert response.status_code == 404
+        assert 'No snapshot' in response.get_json()['error']
+
+    def test_seed_requires_valid_count(self, api_client):
+        """Test a missing or out-of-range count is rejected"""
+        assert api_client('POST', '/admin/seed').status_code == 400
+        assert api_client('POST', '/admin/seed?count=0').status_code == 400
+        assert api_client('POST', '/admin/seed?count=abc').status_code == 400
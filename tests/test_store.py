@@ -0,0 +1,419 @@
+import multiprocessing
+import os
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from src.api.compact_store import CompactUserStore
+from src.api.shared_store import SharedFileUserStore
+from src.api.sqlite_store import SQLiteUserStore
+from src.api.store import DuplicateEmailError, InMemoryUserStore, StoreFullError
+
+
+@pytest.fixture(params=['memory', 'sqlite', 'compact', 'shared'])
+def store(request, tmp_path):
+    """Provide an empty instance of each user store engine"""
+    if request.param == 'sqlite':
+        store = SQLiteUserStore(str(tmp_path / 'users.db'))
+        yield store
+        store.close()
+    elif request.param == 'compact':
+        yield CompactUserStore()
+    elif request.param == 'shared':
+        store = SharedFileUserStore(str(tmp_path / 'users.shm'), max_users=100000)
+        yield store
+        store.close()
+    else:
+        yield InMemoryUserStore()
+
+
+@pytest.mark.unit
+class TestUserStore:
+    """Test cases shared by every thread-safe user store engine"""
+
+    def test_create_and_get(self, store):
+        """Test created users can be read back by ID"""
+        user = store.create("Store User", "store@example.com")
+
+        assert user['id'] == 1
+        assert store.get(1) == user
+        assert store.get(2) is None
+        assert len(store) == 1
+
+    def test_duplicate_email_rejected(self, store):
+        """Test duplicate emails are rejected regardless of case"""
+        store.create("Store User", "dup@example.com")
+
+        with pytest.raises(DuplicateEmailError):
+            store.create("Other User", "DUP@example.com")
+        assert len(store) == 1
+
+    def test_reset_restarts_ids(self, store):
+        """Test reset empties the store and restarts ID allocation"""
+        store.create("Store User", "reset@example.com")
+        store.reset()
+
+        assert len(store) == 0
+        assert store.create("Store User", "reset@example.com")['id'] == 1
+
+    def test_list_users_keyset_pages(self, store):
+        """Test listing walks users in ID order from a cursor"""
+        for i in range(5):
+            store.create(f"List User {i}", f"list{i}@example.com")
+
+        assert [u['id'] for u in store.list_users(0, 2)] == [1, 2]
+        assert [u['id'] for u in store.list_users(2, 2)] == [3, 4]
+        assert [u['id'] for u in store.list_users(4, 2)] == [5]
+        assert store.list_users(5, 2) == []
+        assert [u['id'] for u in store.iter_users(1, page_size=2)] == [2, 3, 4, 5]
+
+    def test_get_many_preserves_order(self, store):
+        """Test multi-get returns records in request order with None for unknown IDs"""
+        for i in range(3):
+            store.create(f"Many User {i}", f"many{i}@example.com")
+
+        users = store.get_many([3, 99, 1])
+
+        assert [u and u['id'] for u in users] == [3, None, 1]
+        assert users[0] == store.get(3)
+
+    def test_find_by_email(self, store):
+        """Test exact email lookup ignores case and misses unknown emails"""
+        store.create("Email User", "Find.Me@example.com")
+
+        assert store.find_by_email("find.me@EXAMPLE.com")['id'] == 1
+        assert store.find_by_email("missing@example.com") is None
+
+    def test_search_names_by_prefix(self, store):
+        """Test name prefix search is case-insensitive, name-ordered and limited"""
+        for name in ("bob", "Alice Smith", "ALICE Jones", "Alfred", "Zoë"):
+            store.create(name, f"{name.split()[0].lower()}{len(store)}@example.com")
+
+        assert [u['name'] for u in store.search_names("ali")] == ["ALICE Jones", "Alice Smith"]
+        assert [u['name'] for u in store.search_names("AL", limit=2)] == ["Alfred", "ALICE Jones"]
+        assert [u['name'] for u in store.search_names("zoe")] == []
+        assert [u['name'] for u in store.search_names("ZOË")] == ["Zoë"]
+        assert store.search_names("carol") == []
+
+    def test_search_names_max_code_point_prefix(self, store):
+        """Test prefixes ending in U+10FFFF search instead of failing to build a bound"""
+        top = '\U0010ffff'
+        store.create("a" + top + "x", "top1@example.com")
+        store.create(top, "top2@example.com")
+        store.create("b", "top3@example.com")
+
+        assert [u['name'] for u in store.search_names("a" + top)] == ["a" + top + "x"]
+        assert [u['name'] for u in store.search_names(top)] == [top]
+
+    def test_reset_clears_search_indexes(self, store):
+        """Test reset drops users from email and name lookups"""
+        store.create("Indexed User", "indexed@example.com")
+        store.reset()
+
+        assert store.find_by_email("indexed@example.com") is None
+        assert store.search_names("indexed") == []
+
+    def test_load_replaces_users_and_indexes(self, store):
+        """Test a bulk load replaces users, lookups and the next ID"""
+        store.create("Old User", "old@example.com")
+        users = [
+            {'id': 1, 'name': "Loaded Ada", 'email': "ada@example.com",
+             'created_at': "2024-01-02T03:04:05.678901"},
+            {'id': 2, 'name': "Loaded Bob", 'email': "bob@example.com",
+             'created_at': "2024-01-02T03:04:06"},
+        ]
+
+        store.load(users)
+
+        assert len(store) == 2
+        assert store.get(2) == users[1]
+        assert store.find_by_email("old@example.com") is None
+        assert store.find_by_email("ADA@example.com") == users[0]
+        assert [u['id'] for u in store.search_names("loaded")] == [1, 2]
+        with pytest.raises(DuplicateEmailError):
+            store.create("Ada Again", "ada@example.com")
+        assert store.create("Old User", "old@example.com")['id'] == 3
+
+    def test_create_many_rejects_duplicates_within_batch(self, store):
+        """Test a batch repeating an email creates it once and reports the repeat"""
+        results = store.create_many([("A", "a@example.com"), ("B", "A@example.com"),
+                                     ("C", "c@example.com")])
+
+        assert [r['id'] for r in results if isinstance(r, dict)] == [1, 2]
+        assert isinstance(results[1], DuplicateEmailError)
+        assert store.get(2)['name'] == "C"
+
+    def test_concurrent_writers_get_unique_ids(self, store):
+        """Test 64 concurrent writers never receive duplicate IDs"""
+        writers = 64
+        users_per_writer = 200
+        barrier = threading.Barrier(writers)
+        ids = [[] for _ in range(writers)]
+
+        def writer(index):
+            barrier.wait()
+            for i in range(users_per_writer):
+                user = store.create(f"Writer {index}", f"w{index}_{i}@example.com")
+                ids[index].append(user['id'])
+
+        threads = [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        all_ids = [user_id for chunk in ids for user_id in chunk]
+        total = writers * users_per_writer
+        assert len(all_ids) == total
+        assert set(all_ids) == set(range(1, total + 1))
+        assert len(store) == total
+
+    def test_concurrent_duplicate_email_created_once(self, store):
+        """Test racing writers with the same email create exactly one user"""
+        writers = 64
+        barrier = threading.Barrier(writers)
+        results = []
+
+        def writer():
+            barrier.wait()
+            try:
+                results.append(store.create("Racer", "race@example.com")['id'])
+            except DuplicateEmailError:
+                results.append(None)
+
+        threads = [threading.Thread(target=writer) for _ in range(writers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert [r for r in results if r is not None] == [1]
+        assert len(store) == 1
+
+
+@pytest.mark.unit
+class TestSQLiteUserStore:
+    """Test cases specific to the SQLite user store"""
+
+    def test_users_persist_across_instances(self, tmp_path):
+        """Test users survive closing and reopening the database"""
+        path = str(tmp_path / 'users.db')
+        store = SQLiteUserStore(path)
+        user = store.create("Persistent User", "persist@example.com")
+        store.close()
+
+        reopened = SQLiteUserStore(path)
+        assert reopened.get(user['id']) == user
+        with pytest.raises(DuplicateEmailError):
+            reopened.create("Persistent User", "persist@example.com")
+        reopened.close()
+
+    def test_name_key_migrated_into_existing_database(self, tmp_path):
+        """Test databases created without name_key gain the column and index"""
+        import sqlite3
+
+        path = str(tmp_path / 'users.db')
+        conn = sqlite3.connect(path)
+        conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT NOT NULL, "
+                     "email TEXT NOT NULL, email_key TEXT NOT NULL UNIQUE, "
+                     "created_at TEXT NOT NULL)")
+        conn.execute("INSERT INTO users (name, email, email_key, created_at) "
+                     "VALUES ('Legacy User', 'legacy@example.com', 'legacy@example.com', "
+                     "'2024-01-01T00:00:00')")
+        conn.commit()
+        conn.close()
+
+        store = SQLiteUserStore(path)
+        assert [u['id'] for u in store.search_names("legacy")] == [1]
+        store.close()
+
+    def test_wal_mode_enabled(self, tmp_path):
+        """Test the database is opened in WAL journal mode"""
+        store = SQLiteUserStore(str(tmp_path / 'users.db'))
+        with store._connection() as conn:
+            mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == 'wal'
+        store.close()
+
+    def test_connection_pool_bounded_across_threads(self, tmp_path):
+        """Test short-lived threads hand connections back instead of leaking them"""
+        store = SQLiteUserStore(str(tmp_path / 'users.db'), pool_size=4)
+        user = store.create("Pooled User", "pooled@example.com")
+
+        def worker():
+            assert store.get(user['id']) == user
+
+        for _ in range(10):
+            threads = [threading.Thread(target=worker) for _ in range(20)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        for _ in range(200):
+            thread = threading.Thread(target=worker)
+            thread.start()
+            thread.join()
+
+        assert store._pool.qsize() <= 4
+        assert store.connections_opened <= 4 + 10 * 20
+        opened = store.connections_opened
+        for _ in range(200):
+            thread = threading.Thread(target=worker)
+            thread.start()
+            thread.join()
+        assert store.connections_opened == opened
+        store.close()
+
+
+@pytest.mark.unit
+class TestCompactUserStore:
+    """Test cases specific to the compact columnar user store"""
+
+    def test_created_at_round_trips_through_epoch(self):
+        """Test timestamps stored as epoch microseconds format like isoformat()"""
+        from datetime import datetime
+        from src.api.compact_store import format_epoch_us, to_epoch_us
+
+        for moment in (datetime(2024, 2, 29, 23, 59, 59, 999999), datetime(2024, 1, 1)):
+            assert format_epoch_us(to_epoch_us(moment)) == moment.isoformat()
+
+    def test_non_ascii_strings(self):
+        """Test multi-byte names and emails are stored and sliced correctly"""
+        store = CompactUserStore()
+        store.create("Zoë Ångström", "zoë@exämple.com")
+        store.create("José", "jose@example.com")
+
+        assert store.get(1)['name'] == "Zoë Ångström"
+        assert store.get(1)['email'] == "zoë@exämple.com"
+        assert store.get(2)['name'] == "José"
+
+    def test_unencodable_email_leaves_columns_aligned(self):
+        """Test a lone surrogate is rejected before any column is touched"""
+        store = CompactUserStore()
+        store.create("First", "first@example.com")
+
+        with pytest.raises(UnicodeEncodeError):
+            store.create("Broken", "b\ud800@x.com")
+
+        assert len(store) == 1
+        second = store.create("Second", "second@example.com")
+        assert second['id'] == 2
+        assert store.get(2) == second
+        assert store.find_by_email("second@example.com") == second
+
+
+def _create_shared_users(path, worker, count):
+    store = SharedFileUserStore(path)
+    for i in range(count):
+        store.create(f"Worker {worker}", f"p{worker}_{i}@example.com")
+        try:
+            store.create(f"Worker {worker}", "contended@example.com")
+        except Exception:
+            pass
+    store.close()
+
+
+@pytest.mark.unit
+class TestSharedFileUserStore:
+    """Test cases specific to the process-shared user store"""
+
+    def test_processes_share_users_and_ids(self, tmp_path):
+        """Test users written by several processes are visible to all with unique IDs"""
+        path = str(tmp_path / 'users.shm')
+        store = SharedFileUserStore(path, max_users=10000)
+
+        context = multiprocessing.get_context('fork')
+        workers = [context.Process(target=_create_shared_users, args=(path, w, 100))
+                   for w in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+            assert worker.exitcode == 0
+
+        users = list(store.iter_users())
+        assert len(store) == 401
+        assert [u['id'] for u in users] == list(range(1, 402))
+        assert sum(u['email'] == "contended@example.com" for u in users) == 1
+        store.close()
+
+    def test_load_over_capacity_keeps_store(self, tmp_path):
+        """Test a load larger than max_users fails before the live users are wiped"""
+        store = SharedFileUserStore(str(tmp_path / 'users.shm'), max_users=3)
+        store.create("Kept User", "kept@example.com")
+        users = [{'id': i, 'name': f"Loaded {i}", 'email': f"loaded{i}@example.com",
+                  'created_at': "2024-01-01T00:00:00"} for i in range(1, 5)]
+
+        with pytest.raises(StoreFullError):
+            store.load(users)
+
+        assert len(store) == 1
+        assert store.get(1)['email'] == "kept@example.com"
+        assert store.find_by_email("kept@example.com")['id'] == 1
+        store.close()
+
+    def test_reset_seen_by_other_process(self, tmp_path):
+        """Test an email freed by a reset elsewhere can be registered again"""
+        path = str(tmp_path / 'users.shm')
+        first = SharedFileUserStore(path, max_users=100)
+        second = SharedFileUserStore(path)
+        first.create("Shared User", "shared@example.com")
+        with pytest.raises(DuplicateEmailError):
+            second.create("Shared User", "shared@example.com")
+
+        first.reset()
+        assert second.get(1) is None
+        assert second.create("Shared User", "shared@example.com")['id'] == 1
+        first.close()
+        second.close()
+
+    def test_search_sees_other_process_writes(self, tmp_path):
+        """Test lookups catch up on users created through another handle"""
+        path = str(tmp_path / 'users.shm')
+        first = SharedFileUserStore(path, max_users=100)
+        second = SharedFileUserStore(path)
+        first.create("Remote User", "remote@example.com")
+
+        assert second.find_by_email("remote@example.com")['id'] == 1
+        assert [u['id'] for u in second.search_names("remote")] == [1]
+        first.close()
+        second.close()
+
+
+@pytest.mark.slow
+class TestMultiWorkerServe:
+    """Test cases for the pre-forking multi-worker server"""
+
+    def test_workers_share_one_user_store(self, tmp_path):
+        """Test every user created through the socket is visible to all workers"""
+        import requests
+
+        env = os.environ.copy()
+        env.update(USER_STORE='shared', SHARED_STORE_PATH=str(tmp_path / 'users.shm'),
+                   SHARED_STORE_MAX_USERS='10000', LOG_MODE='off', PYTHONPATH=os.getcwd())
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'src.api.serve', '--host', '127.0.0.1',
+             '--port', '0', '--workers', '2'],
+            env=env, stdout=subprocess.PIPE, text=True)
+        try:
+            line = server.stdout.readline()
+            port = int(line.split('127.0.0.1:')[1].split()[0])
+            base_url = f'http://127.0.0.1:{port}'
+
+            ids = []
+            for i in range(20):
+                # A fresh connection per request lets the kernel pick any worker
+                response = requests.post(f'{base_url}/users', timeout=5, json={
+                    "name": f"Worker User {i}", "email": f"worker{i}@example.com"})
+                assert response.status_code == 201
+                ids.append(response.json()['id'])
+            assert ids == list(range(1, 21))
+
+            for user_id in ids:
+                response = requests.get(f'{base_url}/users/{user_id}', timeout=5)
+                assert response.status_code == 200
+        finally:
+            server.terminate()
+            server.wait(timeout=10)
@@ -3,6 +3,18 @@ import json
 import time
 
 
+def create_users(api_client, count):
+    """Create ``count`` users and return their IDs in creation order"""
+    stamp = int(time.time() * 1000)
+    ids = []
+    for i in range(count):
+        response = api_client('POST', '/users', json={
+            "name": f"List User {i}", "email": f"list{i}_{stamp}@example.com"})
+        assert response.status_code == 201
+        ids.append(response.json()['id'])
+    return ids
+
+
 class TestUserCreation:
     """Test cases for POST /users endpoint"""
 
@@ -56,6 +68,14 @@ class TestUserCreation:
         assert 'error' in data
         assert 'email' in data['error'].lower()
 
+    def test_create_user_schema_violations(self, api_client, invalid_user_payloads):
+        """Test every schema rule is enforced with its documented error message"""
+        for payload, expected_error in invalid_user_payloads:
+            response = api_client('POST', '/users', json=payload)
+
+            assert response.status_code == 400, f"Accepted invalid payload: {payload}"
+            assert response.json()['error'] == expected_error
+
     def test_create_user_duplicate_email(self, api_client, unique_user_data):
         """Test user creation with duplicate email"""
         # First request should succeed
@@ -69,6 +89,28 @@ class TestUserCreation:
         assert 'error' in data
         assert 'already exists' in data['error'].lower()
 
+    def test_create_user_duplicate_email_case_insensitive(self, api_client, unique_user_data):
+        """Test duplicate detection ignores email case and surrounding whitespace"""
+        response1 = api_client('POST', '/users', json=unique_user_data)
+        assert response1.status_code == 201
+
+        user_data = unique_user_data.copy()
+        user_data['email'] = f"  {unique_user_data['email'].upper()} "
+        response2 = api_client('POST', '/users', json=user_data)
+        assert response2.status_code == 409
+        assert 'already exists' in response2.json()['error'].lower()
+
+    def test_reset_clears_email_index(self, api_client, unique_user_data):
+        """Test an email can be reused after the database is reset"""
+        response1 = api_client('POST', '/users', json=unique_user_data)
+        assert response1.status_code == 201
+
+        reset_response = api_client('POST', '/reset')
+        assert reset_response.status_code == 200
+
+        response2 = api_client('POST', '/users', json=unique_user_data)
+        assert response2.status_code == 201
+
     def test_create_user_invalid_content_type(self, api_client, unique_user_data):
         """Test user creation with invalid content type"""
         response = api_client('POST', '/users', data=unique_user_data)
@@ -98,9 +140,30 @@ class TestGetUser:
         assert data['name'] == unique_user_data['name']
         assert data['email'] == unique_user_data['email']
 
+    def test_get_user_etag_not_modified(self, api_client, unique_user_data):
+        """Test a matching If-None-Match returns 304 without a body"""
+        create_response = api_client('POST', '/users', json=unique_user_data)
+        user_id = create_response.json()['id']
+
+        response = api_client('GET', f'/users/{user_id}')
+        assert response.status_code == 200
+        etag = response.headers['ETag']
+        assert etag and not etag.startswith('W/')
+
+        cached = api_client('GET', f'/users/{user_id}', headers={'If-None-Match': etag})
+        assert cached.status_code == 304
+        assert cached.headers['ETag'] == etag
+        assert cached.text == ''
+
+        stale = api_client('GET', f'/users/{user_id}', headers={'If-None-Match': '"stale"'})
+        assert stale.status_code == 200
+        assert stale.json()['id'] == user_id
+
     def test_get_user_not_found(self, api_client):
         """Test retrieving non-existent user"""
-        response = api_client('GET', '/users/999')
+        # IDs are issued in order, so the one after the newest user does not exist yet
+        last_id = create_users(api_client, 1)[0]
+        response = api_client('GET', f'/users/{last_id + 1}')
 
         assert response.status_code == 404
         data = response.json()
@@ -114,6 +177,125 @@ class TestGetUser:
         assert response.status_code == 404  # Flask converts to 404 for non-int IDs
 
 
+class TestListUsers:
+    """Test cases for GET /users endpoint"""
+
+    def test_list_users_cursor_pagination(self, api_client):
+        """Test pages follow ID order and next_cursor resumes after the last ID"""
+        ids = create_users(api_client, 3)
+
+        response = api_client('GET', f'/users?cursor={ids[0] - 1}&limit=2')
+        assert response.status_code == 200
+        page = response.json()
+        assert [u['id'] for u in page['users']] == ids[:2]
+        assert page['next_cursor'] == ids[1]
+
+        response = api_client('GET', f"/users?cursor={page['next_cursor']}&limit=2")
+        assert response.json()['users'][0]['id'] == ids[2]
+
+    def test_list_users_last_page_has_no_cursor(self, api_client):
+        """Test the final page reports no next cursor"""
+        ids = create_users(api_client, 1)
+
+        response = api_client('GET', f'/users?cursor={ids[-1]}')
+        assert response.status_code == 200
+        assert response.json() == {"users": [], "next_cursor": None}
+
+    def test_list_users_stream_ndjson(self, api_client):
+        """Test stream mode returns every user after the cursor as NDJSON"""
+        ids = create_users(api_client, 3)
+
+        response = api_client('GET', f'/users?cursor={ids[0] - 1}&stream=true')
+        assert response.status_code == 200
+        assert 'application/x-ndjson' in response.headers['Content-Type']
+        streamed = [json.loads(line) for line in response.text.splitlines() if line]
+        assert [u['id'] for u in streamed][:3] == ids
+
+    def test_list_users_stream_lines_match_get(self, api_client):
+        """Test each streamed line is serialized exactly as GET /users/<id> sends the user"""
+        ids = create_users(api_client, 2)
+
+        response = api_client('GET', f'/users?cursor={ids[0] - 1}&stream=true')
+        lines = response.content.splitlines(keepends=True)[:2]
+        assert lines == [api_client('GET', f'/users/{user_id}').content for user_id in ids]
+
+    def test_list_users_invalid_limit(self, api_client):
+        """Test out-of-range and non-integer limits are rejected"""
+        assert api_client('GET', '/users?limit=0').status_code == 400
+        assert api_client('GET', '/users?limit=100000').status_code == 400
+        assert api_client('GET', '/users?cursor=abc').status_code == 400
+
+
+class TestMultiGetUsers:
+    """Test cases for GET /users?ids= multi-get"""
+
+    def test_multi_get_returns_users_and_missing(self, api_client):
+        """Test found users come back in request order and unknown IDs as missing"""
+        ids = create_users(api_client, 3)
+
+        unknown = ids[2] + 1
+        response = api_client('GET', f'/users?ids={ids[2]},{unknown},{ids[0]},{ids[2]}')
+
+        assert response.status_code == 200
+        body = response.json()
+        assert [u['id'] for u in body['users']] == [ids[2], ids[0]]
+        assert body['missing'] == [unknown]
+        assert body['users'][0] == api_client('GET', f'/users/{ids[2]}').json()
+
+    def test_multi_get_rejects_bad_ids(self, api_client):
+        """Test malformed, empty and oversized ID lists are rejected"""
+        assert api_client('GET', '/users?ids=1,abc').status_code == 400
+        assert api_client('GET', '/users?ids=').status_code == 400
+
+        too_many = ','.join(str(i) for i in range(1, 1002))
+        response = api_client('GET', f'/users?ids={too_many}')
+        assert response.status_code == 400
+        assert 'at most 1000' in response.json()['error']
+
+
+class TestSearchUsers:
+    """Test cases for GET /users/search endpoint"""
+
+    def test_search_by_email(self, api_client, unique_user_data):
+        """Test exact email search ignores case"""
+        created = api_client('POST', '/users', json=unique_user_data).json()
+
+        response = api_client('GET', f"/users/search?email={unique_user_data['email'].upper()}")
+
+        assert response.status_code == 200
+        assert response.json() == {"users": [created]}
+
+    def test_search_by_email_no_match(self, api_client):
+        """Test an unknown email returns an empty result, not a 404"""
+        response = api_client('GET', '/users/search?email=nobody@example.com')
+
+        assert response.status_code == 200
+        assert response.json() == {"users": []}
+
+    def test_search_by_name_prefix(self, api_client):
+        """Test name prefix search is case-insensitive and honours limit"""
+        stamp = int(time.time() * 1000)
+        ids = []
+        for i in range(3):
+            response = api_client('POST', '/users', json={
+                "name": f"Prefix{stamp} User {i}", "email": f"prefix{i}_{stamp}@example.com"})
+            ids.append(response.json()['id'])
+
+        response = api_client('GET', f'/users/search?name=prefix{stamp}')
+        assert response.status_code == 200
+        assert [u['id'] for u in response.json()['users']] == ids
+
+        response = api_client('GET', f'/users/search?name=PREFIX{stamp}&limit=2')
+        assert [u['id'] for u in response.json()['users']] == ids[:2]
+
+    def test_search_requires_one_criterion(self, api_client):
+        """Test missing, conflicting or empty criteria are rejected"""
+        assert api_client('GET', '/users/search').status_code == 400
+        assert api_client('GET', '/users/search?email=a@b.c&name=a').status_code == 400
+        assert api_client('GET', '/users/search?name=').status_code == 400
+        assert api_client('GET', '/users/search?name=a&limit=0').status_code == 400
+
+
 @pytest.mark.integration
 class TestUserIntegration:
     """Integration test cases for user workflow"""
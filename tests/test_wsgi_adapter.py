@@ -0,0 +1,114 @@
+import gzip
+import json
+
+import pytest
+import requests
+
+from utils.wsgi_adapter import CachedJSONResponse, wsgi_session
+
+BASE = 'http://testserver'
+
+
+def echo_app(environ, start_response):
+    body = json.dumps({
+        'method': environ['REQUEST_METHOD'],
+        'path': environ['PATH_INFO'],
+        'query': environ['QUERY_STRING'],
+        'host': environ['HTTP_HOST'],
+        'content_type': environ.get('CONTENT_TYPE'),
+        'token': environ.get('HTTP_X_TOKEN'),
+        'body': environ['wsgi.input'].read(int(environ.get('CONTENT_LENGTH') or 0)).decode(),
+    }).encode()
+    start_response('200 OK', [('Content-Type', 'application/json'),
+                              ('Content-Length', str(len(body)))])
+    return [body]
+
+
+@pytest.mark.unit
+class TestWSGIAdapter:
+    """Test cases for the requests transport adapter over a WSGI app"""
+
+    def test_request_reaches_app(self):
+        """Test method, decoded path, query, headers and body reach the environ"""
+        response = wsgi_session(echo_app).post(f'{BASE}/users/a%20b?limit=5', json={"n": 1},
+                                                headers={'X-Token': 'abc'})
+
+        assert isinstance(response, requests.Response)
+        assert response.status_code == 200
+        assert response.reason == 'OK'
+        assert response.url == f'{BASE}/users/a%20b?limit=5'
+        assert response.json() == {'method': 'POST', 'path': '/users/a b', 'query': 'limit=5',
+                                   'host': 'testserver', 'content_type': 'application/json',
+                                   'token': 'abc', 'body': '{"n": 1}'}
+
+    def test_repeated_headers_kept(self):
+        """Test headers sent more than once are combined as over HTTP"""
+        def vary_app(environ, start_response):
+            start_response('200 OK', [('Content-Type', 'text/plain'), ('Vary', 'Accept'),
+                                      ('Vary', 'Accept-Encoding')])
+            return [b'ok']
+
+        response = wsgi_session(vary_app).get(f'{BASE}/')
+
+        assert response.headers['Vary'] == 'Accept, Accept-Encoding'
+        assert response.raw.headers.getlist('Vary') == ['Accept', 'Accept-Encoding']
+
+    def test_json_decoded_once(self):
+        """Test json() returns the cached decode on repeat calls"""
+        response = wsgi_session(echo_app).get(f'{BASE}/')
+
+        assert isinstance(response, CachedJSONResponse)
+        assert response.json() is response.json()
+
+    def test_gzip_body_decoded(self):
+        """Test a gzip-encoded body is decoded as it would be over HTTP"""
+        def gzip_app(environ, start_response):
+            body = gzip.compress(b'{"ok": true}')
+            start_response('200 OK', [('Content-Type', 'application/json'),
+                                      ('Content-Encoding', 'gzip'),
+                                      ('Content-Length', str(len(body)))])
+            return [body]
+
+        assert wsgi_session(gzip_app).get(f'{BASE}/').json() == {'ok': True}
+
+    def test_stream_pulls_lazily_and_closes(self):
+        """Test stream=True reads the app's iterable on demand and closes it after"""
+        produced = []
+
+        def stream_app(environ, start_response):
+            start_response('200 OK', [('Content-Type', 'application/x-ndjson')])
+            try:
+                for i in range(3):
+                    produced.append(i)
+                    yield f'{{"n": {i}}}\n'.encode()
+            finally:
+                produced.append('closed')
+
+        response = wsgi_session(stream_app).get(f'{BASE}/', stream=True)
+
+        assert response.raw.read(9) == b'{"n": 0}\n'
+        assert produced == [0]
+        assert [json.loads(line)['n'] for line in response.iter_lines()] == [1, 2]
+        response.close()
+        assert produced[-1] == 'closed'
+
+    def test_empty_generator_body(self):
+        """Test an app starting the response on its first iteration with no body"""
+        def not_modified_app(environ, start_response):
+            start_response('304 NOT MODIFIED', [('ETag', '"v1"')])
+            return
+            yield
+
+        response = wsgi_session(not_modified_app).get(f'{BASE}/')
+
+        assert response.status_code == 304
+        assert response.headers['ETag'] == '"v1"'
+        assert response.content == b''
+
+    def test_os_error_becomes_connection_error(self):
+        """Test an OSError from the app surfaces like a dropped connection"""
+        def reset_app(environ, start_response):
+            raise ConnectionResetError("Injected connection reset")
+
+        with pytest.raises(requests.exceptions.ConnectionError):
+            wsgi_session(reset_app).get(f'{BASE}/')
@@ -0,0 +1,222 @@
+"""
+Asyncio HTTP/1.1 client for the API with a bounded keep-alive connection pool
+
+Built on asyncio streams so it needs no third-party packages. It speaks
+just enough HTTP/1.1 for this API: Content-Length and chunked bodies,
+keep-alive, and ``Connection: close``.
+
+    client = AsyncAPIClient('http://localhost:5000', max_connections=100, timeout=10)
+
+    async def fan_out():
+        return await asyncio.gather(*(client('GET', '/health') for _ in range(1000)))
+
+    responses = client.run(fan_out())
+
+Calls take the ``api_client`` fixture's ``(method, endpoint, **kwargs)``
+convention. Connections belong to the event loop that opened them;
+``run`` closes them before its loop ends, and a client reused under a new
+loop drops connections left over from the old one.
+"""
+import asyncio
+import json as _json
+from collections import deque
+from urllib.parse import urlencode, urlsplit
+
+from requests.structures import CaseInsensitiveDict
+
+# Responses that never carry a body, whatever their headers say
+_NO_BODY_STATUSES = frozenset([204, 304])
+
+
+class AsyncResponse:
+    """requests-like view of a response"""
+
+    def __init__(self, status_code, headers, body):
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers)
+        self.content = body
+
+    def json(self):
+        return _json.loads(self.text)
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8')
+
+
+def encode_body(json=None, data=None, headers=None):
+    """Return ``(body bytes, headers)`` for the requests-style body arguments"""
+    headers = dict(headers or {})
+    if json is not None:
+        body = _json.dumps(json).encode('utf-8')
+        headers.setdefault('Content-Type', 'application/json')
+    elif isinstance(data, dict):
+        body = urlencode(data).encode('utf-8')
+        headers.setdefault('Content-Type', 'application/x-www-form-urlencoded')
+    elif isinstance(data, str):
+        body = data.encode('utf-8')
+    else:
+        body = data or b''
+    return body, headers
+
+
+class _Connection:
+    __slots__ = ('reader', 'writer', 'reused')
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.reused = False
+
+    def usable(self):
+        return not self.writer.is_closing() and not self.reader.at_eof()
+
+    def close(self):
+        try:
+            self.writer.close()
+        except RuntimeError:  # the loop that owned it is already closed
+            pass
+
+
+class AsyncAPIClient:
+    """Send requests to ``base_url`` over at most ``max_connections`` connections
+
+    Requests beyond that wait for a free connection, so thousands can be
+    started at once. Idle connections are kept for reuse. ``timeout``
+    bounds each request, including the wait for a connection, and raises
+    asyncio.TimeoutError.
+    """
+
+    def __init__(self, base_url, max_connections=100, timeout=10):
+        url = urlsplit(base_url)
+        if url.scheme not in ('http', 'https'):
+            raise ValueError(f"Unsupported URL scheme: {base_url}")
+        self.host = url.hostname
+        self.port = url.port or (443 if url.scheme == 'https' else 80)
+        self.ssl = url.scheme == 'https'
+        self.prefix = url.path.rstrip('/')
+        self.host_header = url.netloc
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self._loop = None
+        self._idle = deque()
+        self._slots = None
+        self.connections_opened = 0
+
+    def _bind_loop(self):
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            for conn in self._idle:
+                conn.close()
+            self._idle.clear()
+            self._loop = loop
+            self._slots = asyncio.Semaphore(self.max_connections)
+
+    async def _acquire(self):
+        while self._idle:
+            conn = self._idle.pop()
+            if conn.usable():
+                conn.reused = True
+                return conn
+            conn.close()
+        reader, writer = await asyncio.open_connection(self.host, self.port, ssl=self.ssl or None)
+        self.connections_opened += 1
+        return _Connection(reader, writer)
+
+    async def __call__(self, method, endpoint, json=None, data=None, headers=None, timeout=None):
+        self._bind_loop()
+        body, headers = encode_body(json, data, headers)
+        timeout = self.timeout if timeout is None else timeout
+        return await asyncio.wait_for(self._request(method.upper(), endpoint, body, headers),
+                                      timeout)
+
+    async def _request(self, method, endpoint, body, headers):
+        request = self._encode_request(method, endpoint, body, headers)
+        async with self._slots:
+            while True:
+                conn = await self._acquire()
+                try:
+                    conn.writer.write(request)
+                    await conn.writer.drain()
+                    response, keep_alive = await self._read_response(conn.reader, method)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    conn.close()
+                    # The server may close an idle keep-alive connection just as
+                    # it is reused; retry those on a fresh connection
+                    if conn.reused:
+                        continue
+                    raise
+                except BaseException:
+                    conn.close()
+                    raise
+                if keep_alive:
+                    self._idle.append(conn)
+                else:
+                    conn.close()
+                return response
+
+    def _encode_request(self, method, endpoint, body, headers):
+        lines = [f"{method} {self.prefix}{endpoint} HTTP/1.1", f"Host: {self.host_header}"]
+        names = {name.lower() for name in headers}
+        if body or method in ('POST', 'PUT', 'PATCH'):
+            lines.append(f"Content-Length: {len(body)}")
+        if 'accept' not in names:
+            lines.append("Accept: */*")
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        return ("\r\n".join(lines) + "\r\n\r\n").encode('latin-1') + body
+
+    @staticmethod
+    async def _read_response(reader, method):
+        """Return ``(AsyncResponse, keep-alive)`` for the next response on ``reader``"""
+        status_line = await reader.readuntil(b'\r\n')
+        version, status, _ = status_line.decode('latin-1').split(' ', 2)
+        status = int(status)
+        headers = []
+        while True:
+            line = await reader.readuntil(b'\r\n')
+            if line == b'\r\n':
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers.append((name.strip(), value.strip()))
+        fields = CaseInsensitiveDict(headers)
+
+        connection = fields.get('Connection', '').lower()
+        keep_alive = connection != 'close' and (version == 'HTTP/1.1' or connection == 'keep-alive')
+        if method == 'HEAD' or status in _NO_BODY_STATUSES or 100 <= status < 200:
+            body = b''
+        elif 'chunked' in fields.get('Transfer-Encoding', '').lower():
+            chunks = []
+            while True:
+                size = int((await reader.readuntil(b'\r\n')).split(b';', 1)[0], 16)
+                if size == 0:
+                    while await reader.readuntil(b'\r\n') != b'\r\n':
+                        pass
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            body = b''.join(chunks)
+        elif 'Content-Length' in fields:
+            body = await reader.readexactly(int(fields['Content-Length']))
+        else:
+            body = await reader.read()
+            keep_alive = False
+        return AsyncResponse(status, headers, body), keep_alive
+
+    async def aclose(self):
+        """Close idle connections"""
+        while self._idle:
+            conn = self._idle.pop()
+            conn.close()
+            try:
+                await conn.writer.wait_closed()
+            except (ConnectionError, RuntimeError):
+                pass
+
+    def run(self, coro):
+        """Run ``coro`` in a new event loop, closing this client's connections after"""
+        async def main():
+            try:
+                return await coro
+            finally:
+                await self.aclose()
+        return asyncio.run(main())
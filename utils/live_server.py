@@ -0,0 +1,72 @@
+"""
+Start the API for tests and detect when it accepts connections
+"""
+import socket
+import threading
+import time
+
+
+def wait_for_port(host, port, timeout=30.0, initial_delay=0.001, max_delay=0.1):
+    """Return True once ``host:port`` accepts TCP connections, False after ``timeout``
+
+    Probes with a plain connect, retrying after ``initial_delay`` seconds
+    and doubling the wait up to ``max_delay``, so a server that is up
+    within milliseconds is noticed within milliseconds.
+    """
+    deadline = time.monotonic() + timeout
+    delay = initial_delay
+    while True:
+        remaining = deadline - time.monotonic()
+        try:
+            with socket.create_connection((host, port), timeout=max(0.01, min(1.0, remaining))):
+                return True
+        except OSError:
+            if remaining <= 0:
+                return False
+        time.sleep(min(delay, max(0.0, deadline - time.monotonic())))
+        delay = min(delay * 2, max_delay)
+
+
+class LiveServer:
+    """Serve a WSGI app on a background thread via werkzeug's ``make_server``
+
+    ``port=0`` binds an ephemeral port; ``url`` has the one chosen. The
+    socket is listening once ``start`` returns.
+    """
+
+    def __init__(self, app, host='127.0.0.1', port=0):
+        self.app = app
+        self.host = host
+        self.port = port
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def start(self, timeout=10.0):
+        from werkzeug.serving import make_server
+
+        self._server = make_server(self.host, self.port, self.app, threaded=True)
+        self.port = self._server.server_port
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,),
+                                        name='live-server', daemon=True)
+        self._thread.start()
+        if not wait_for_port(self.host, self.port, timeout):
+            self.stop()
+            raise RuntimeError(f"Server did not accept connections on {self.url}")
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
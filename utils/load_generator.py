@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Open-loop load generator for the API
+
+Requests are issued on a fixed schedule (``rate`` per second for
+``duration`` seconds) by a thread pool, regardless of how quickly earlier
+ones complete. Each request's latency is measured from the time it was
+*scheduled* to start, not the time a free worker got round to it, so a
+stalled server shows up as the queueing delay its clients would actually
+see rather than being hidden by a slowed-down generator (coordinated
+omission). Service time, measured from the actual start, is reported too.
+
+    generator = LoadGenerator(api_client, [Endpoint('GET', '/health', weight=9),
+                                           Endpoint('GET', '/users/1')])
+    result = generator.run(rate=200, duration=2)
+    assert result.latency.p99 < 0.1
+
+``request`` is any callable with the ``api_client`` fixture's signature,
+``request(method, endpoint, **kwargs)``, returning an object with a
+``status_code`` (a requests.Session's ``request`` method works too).
+"""
+import argparse
+import math
+import random
+import threading
+import time
+
+
+class Endpoint:
+    """One entry in the request mix, chosen with probability proportional to ``weight``
+
+    ``path`` and ``json`` may be callables taking the request's sequence
+    number, to vary the target or payload per request.
+    """
+
+    __slots__ = ('method', 'path', 'weight', 'json', 'name')
+
+    def __init__(self, method, path, weight=1.0, json=None, name=None):
+        if weight <= 0:
+            raise ValueError("weight must be positive")
+        self.method = method.upper()
+        self.path = path
+        self.weight = weight
+        self.json = json
+        self.name = name or f"{self.method} {path if isinstance(path, str) else path.__name__}"
+
+    def request_args(self, seq):
+        path = self.path(seq) if callable(self.path) else self.path
+        kwargs = {}
+        if self.json is not None:
+            kwargs['json'] = self.json(seq) if callable(self.json) else self.json
+        return self.method, path, kwargs
+
+
+def parse_mix(spec):
+    """Parse ``"METHOD /path=weight,..."`` into Endpoints (weight defaults to 1)"""
+    endpoints = []
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        route, sep, weight = item.rpartition('=')
+        if not sep or ' ' not in route:
+            route, weight = item, '1'
+        method, _, path = route.strip().partition(' ')
+        endpoints.append(Endpoint(method, path.strip(), float(weight)))
+    return endpoints
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class LatencyStats:
+    """Summary of a set of latencies, in seconds"""
+
+    __slots__ = ('count', 'mean', 'p50', 'p90', 'p99', 'p999', 'max')
+
+    def __init__(self, samples):
+        samples = sorted(samples)
+        self.count = len(samples)
+        self.mean = sum(samples) / len(samples) if samples else 0.0
+        self.p50 = percentile(samples, 0.50)
+        self.p90 = percentile(samples, 0.90)
+        self.p99 = percentile(samples, 0.99)
+        self.p999 = percentile(samples, 0.999)
+        self.max = samples[-1] if samples else 0.0
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __str__(self):
+        return (f"p50={self.p50 * 1000:.2f}ms p90={self.p90 * 1000:.2f}ms "
+                f"p99={self.p99 * 1000:.2f}ms p999={self.p999 * 1000:.2f}ms "
+                f"max={self.max * 1000:.2f}ms")
+
+
+class LoadResult:
+    """Outcome of one ``LoadGenerator.run``
+
+    ``latency`` is measured from each request's scheduled start and
+    ``service_time`` from its actual start; ``by_endpoint`` holds the
+    former per endpoint name. ``statuses`` counts responses by status
+    code, with requests that raised counted under ``'error'``.
+    """
+
+    def __init__(self, target_rate, elapsed, records, max_start_lag):
+        self.target_rate = target_rate
+        self.elapsed = elapsed
+        self.requests = len(records)
+        self.statuses = {}
+        for _, status, _, _ in records:
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+        self.failures = sum(count for status, count in self.statuses.items()
+                            if status == 'error' or status >= 500)
+        self.throughput = self.requests / elapsed if elapsed else 0.0
+        self.latency = LatencyStats(latency for _, _, latency, _ in records)
+        self.service_time = LatencyStats(service for _, _, _, service in records)
+        by_endpoint = {}
+        for name, _, latency, _ in records:
+            by_endpoint.setdefault(name, []).append(latency)
+        self.by_endpoint = {name: LatencyStats(samples) for name, samples in by_endpoint.items()}
+        self.max_start_lag = max_start_lag
+
+    @property
+    def error_rate(self):
+        """Fraction of requests that raised or returned a 5xx"""
+        return self.failures / self.requests if self.requests else 0.0
+
+    def to_dict(self):
+        return {
+            'target_rate': self.target_rate,
+            'throughput': self.throughput,
+            'requests': self.requests,
+            'elapsed': self.elapsed,
+            'error_rate': self.error_rate,
+            'statuses': {str(status): count for status, count in self.statuses.items()},
+            'latency': self.latency.to_dict(),
+            'service_time': self.service_time.to_dict(),
+            'by_endpoint': {name: stats.to_dict() for name, stats in self.by_endpoint.items()},
+            'max_start_lag': self.max_start_lag,
+        }
+
+    def summary(self):
+        lines = [
+            f"{self.requests} requests in {self.elapsed:.2f}s: {self.throughput:,.0f} req/s "
+            f"(target {self.target_rate:,.0f}), error rate {self.error_rate:.2%}",
+            f"  latency      {self.latency}",
+            f"  service time {self.service_time}",
+        ]
+        for name, stats in sorted(self.by_endpoint.items()):
+            lines.append(f"  {name:<28} n={stats.count:<6} {stats}")
+        return "\n".join(lines)
+
+
+class LoadGenerator:
+    """Drive ``request`` with an open-loop, weighted mix of ``endpoints``
+
+    ``concurrency`` worker threads share the schedule; it only needs to
+    exceed the expected number of requests in flight (rate x latency).
+    ``poisson`` spaces arrivals exponentially instead of evenly, as
+    independent clients would. ``seed`` fixes the mix and arrival times.
+    """
+
+    def __init__(self, request, endpoints, concurrency=8, poisson=False, seed=None):
+        if not endpoints:
+            raise ValueError("at least one endpoint is required")
+        self.request = request
+        self.endpoints = list(endpoints)
+        self.concurrency = concurrency
+        self.poisson = poisson
+        self.seed = seed
+
+    def schedule(self, rate, duration):
+        """Return ``(offset seconds, endpoint)`` for every request of a run"""
+        if rate <= 0 or duration <= 0:
+            raise ValueError("rate and duration must be positive")
+        rng = random.Random(self.seed)
+        count = int(rate * duration)
+        if self.poisson:
+            offsets, at = [], 0.0
+            while True:
+                at += rng.expovariate(rate)
+                if at >= duration:
+                    break
+                offsets.append(at)
+        else:
+            offsets = [i / rate for i in range(count)]
+        chosen = rng.choices(self.endpoints, [e.weight for e in self.endpoints], k=len(offsets))
+        return list(zip(offsets, chosen))
+
+    def run(self, rate, duration):
+        """Send ``rate`` requests per second for ``duration`` seconds; return a LoadResult"""
+        plan = self.schedule(rate, duration)
+        records = []
+        lag = [0.0]
+        next_slot = iter(range(len(plan)))
+        slot_lock = threading.Lock()
+        record_lock = threading.Lock()
+        start = time.perf_counter() + 0.01
+
+        def worker():
+            local, local_lag = [], 0.0
+            while True:
+                with slot_lock:
+                    seq = next(next_slot, None)
+                if seq is None:
+                    break
+                offset, endpoint = plan[seq]
+                intended = start + offset
+                delay = intended - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                method, path, kwargs = endpoint.request_args(seq)
+                began = time.perf_counter()
+                local_lag = max(local_lag, began - intended)
+                try:
+                    status = self.request(method, path, **kwargs).status_code
+                except Exception:
+                    status = 'error'
+                done = time.perf_counter()
+                local.append((endpoint.name, status, done - intended, done - began))
+            with record_lock:
+                records.extend(local)
+                lag[0] = max(lag[0], local_lag)
+
+        threads = [threading.Thread(target=worker, name=f'load-{i}', daemon=True)
+                   for i in range(min(self.concurrency, len(plan)))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        return LoadResult(rate, elapsed, records, lag[0])
+
+
+def main():
+    import requests
+
+    parser = argparse.ArgumentParser(description="Open-loop load generator")
+    parser.add_argument("--base-url", default="http://localhost:5000", help="API base URL")
+    parser.add_argument("--rate", type=float, default=100, help="Target requests per second")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds to run")
+    parser.add_argument("--mix", default="GET /health",
+                        help='Weighted endpoints, e.g. "GET /health=9,GET /users/1=1"')
+    parser.add_argument("--concurrency", type=int, default=32, help="Worker threads")
+    parser.add_argument("--poisson", action="store_true", help="Poisson arrivals")
+    parser.add_argument("--timeout", type=float, default=10, help="Per-request timeout")
+    args = parser.parse_args()
+
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_maxsize=args.concurrency)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    def send(method, path, **kwargs):
+        return session.request(method, f"{args.base_url}{path}", timeout=args.timeout, **kwargs)
+
+    generator = LoadGenerator(send, parse_mix(args.mix), args.concurrency, args.poisson)
+    print(generator.run(args.rate, args.duration).summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""
+requests transport adapter that hands requests straight to a WSGI app
+
+Mount it on a ``requests.Session`` and requests to that prefix never
+touch a socket:
+
+    session = wsgi_session(app, 'http://testserver')
+    session.get('http://testserver/health').json()
+
+Responses are genuine ``requests.Response`` objects, built the way
+requests' own HTTPAdapter builds them around a urllib3 response, so
+gzip/deflate decoding, ``stream=True``, redirects and ``raise_for_status``
+behave as over HTTP. An ``OSError`` from the app, such as an injected
+connection reset, surfaces as ``requests.exceptions.ConnectionError``.
+Timeouts, TLS options, proxies and cookies from the app are ignored.
+"""
+import io
+import sys
+from urllib.parse import unquote_to_bytes, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3 import HTTPResponse
+
+_UNSET = object()
+
+
+class CachedJSONResponse(requests.Response):
+    """requests.Response whose ``json()`` decodes the body once
+
+    Repeat calls return the same object, so mutating it changes what
+    later calls see.
+    """
+
+    _json = _UNSET
+
+    def json(self, **kwargs):
+        if kwargs:
+            return super().json(**kwargs)
+        if self._json is _UNSET:
+            self._json = super().json()
+        return self._json
+
+
+def _close(app_iter):
+    close = getattr(app_iter, 'close', None)
+    if close is not None:
+        close()
+
+
+class _WSGIBody(io.RawIOBase):
+    """Readable file over a WSGI response iterable, pulled one chunk at a time"""
+
+    def __init__(self, app_iter, chunks, pending):
+        self._app_iter = app_iter
+        self._chunks = chunks
+        # Chunks already taken from ``chunks``, or passed to write()
+        self._pending = pending
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self._pending:
+            try:
+                self._pending.append(next(self._chunks))
+            except StopIteration:
+                return 0
+        chunk = self._pending[0]
+        size = min(len(buffer), len(chunk))
+        buffer[:size] = chunk[:size]
+        if size == len(chunk):
+            self._pending.pop(0)
+        else:
+            self._pending[0] = chunk[size:]
+        return size
+
+    def close(self):
+        if not self.closed:
+            _close(self._app_iter)
+        super().close()
+
+
+def _request_body(body):
+    if body is None:
+        return b''
+    if isinstance(body, str):
+        return body.encode('utf-8')
+    if isinstance(body, (bytes, bytearray)):
+        return bytes(body)
+    if hasattr(body, 'read'):
+        return body.read()
+    return b''.join(chunk.encode('utf-8') if isinstance(chunk, str) else chunk
+                    for chunk in body)
+
+
+class WSGIAdapter(BaseAdapter):
+    """Send a session's requests to a WSGI ``app`` in-process"""
+
+    def __init__(self, app):
+        super().__init__()
+        self.app = app
+
+    def environ(self, request):
+        """Return the WSGI environ for a ``PreparedRequest``"""
+        url = urlsplit(request.url)
+        body = _request_body(request.body)
+        environ = {
+            'REQUEST_METHOD': request.method,
+            'SCRIPT_NAME': '',
+            'PATH_INFO': unquote_to_bytes(url.path or '/').decode('latin-1'),
+            'QUERY_STRING': url.query,
+            'REQUEST_URI': url.path + (f'?{url.query}' if url.query else ''),
+            'SERVER_NAME': url.hostname or 'localhost',
+            'SERVER_PORT': str(url.port or (443 if url.scheme == 'https' else 80)),
+            'SERVER_PROTOCOL': 'HTTP/1.1',
+            'REMOTE_ADDR': '127.0.0.1',
+            'HTTP_HOST': url.netloc,
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': url.scheme,
+            'wsgi.input': io.BytesIO(body),
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': False,
+            'wsgi.run_once': False,
+        }
+        for name, value in request.headers.items():
+            if isinstance(value, bytes):
+                value = value.decode('latin-1')
+            key = name.upper().replace('-', '_')
+            if key not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+                key = f'HTTP_{key}'
+            environ[key] = value
+        if body and 'CONTENT_LENGTH' not in environ:
+            environ['CONTENT_LENGTH'] = str(len(body))
+        return environ
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        started = []
+        written = []
+
+        def start_response(status, headers, exc_info=None):
+            if exc_info is not None and started:
+                raise exc_info[1].with_traceback(exc_info[2])
+            started[:] = [status, headers]
+            return written.append
+
+        try:
+            app_iter = self.app(self.environ(request), start_response)
+            chunks = iter(app_iter)
+            try:
+                # A generator app only calls start_response once iterated
+                while not started:
+                    chunk = next(chunks, None)
+                    if chunk is not None:
+                        written.append(chunk)
+                    elif not started:
+                        raise RuntimeError("WSGI app returned without calling start_response")
+                if not stream:
+                    written.extend(chunks)
+            except BaseException:
+                _close(app_iter)
+                raise
+        except OSError as e:
+            raise requests.exceptions.ConnectionError(e, request=request)
+        if stream:
+            body = _WSGIBody(app_iter, chunks, written)
+        else:
+            _close(app_iter)
+            body = io.BytesIO(b''.join(written))
+
+        status, headers = started
+        code, _, reason = status.partition(' ')
+        # urllib3 builds its header dict from the pairs, keeping repeated names
+        raw = HTTPResponse(body=body, headers=headers, status=int(code), version=11,
+                           reason=reason, preload_content=False, decode_content=True,
+                           request_method=request.method)
+        return self.build_response(request, raw)
+
+    def build_response(self, request, raw):
+        """Wrap a urllib3 response as HTTPAdapter.build_response does"""
+        response = CachedJSONResponse()
+        response.status_code = raw.status
+        response.headers = CaseInsensitiveDict(raw.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = raw
+        response.reason = raw.reason
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self):
+        pass
+
+
+def wsgi_session(app, base_url='http://testserver'):
+    """Return a requests.Session sending requests under ``base_url`` to ``app``
+
+    The session ignores proxy, netrc and CA bundle settings from the
+    environment: they mean nothing in-process, and requests would
+    otherwise scan the environment on every request.
+    """
+    session = requests.Session()
+    session.trust_env = False
+    session.mount(base_url, WSGIAdapter(app))
+    return session